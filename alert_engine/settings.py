@@ -8,6 +8,7 @@ supporting webhook ingestion, rule-based actions, and knowledge suggestions.
 """
 
 from pathlib import Path
+import json
 import os
 from dotenv import load_dotenv
 
@@ -116,6 +117,102 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Streaming export: rows fetched per server-side cursor round trip
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000') or 2000)
+
+# Live tail (SSE): per-client buffer, keepalive interval and max stream lifetime
+LIVE_TAIL_BUFFER = int(os.getenv('LIVE_TAIL_BUFFER', '256') or 256)
+LIVE_TAIL_HEARTBEAT = float(os.getenv('LIVE_TAIL_HEARTBEAT', '15') or 15)
+LIVE_TAIL_MAX_SECONDS = float(os.getenv('LIVE_TAIL_MAX_SECONDS', '3600') or 3600)
+
+# Top-K noisy alert tracking: sliding windows (seconds) and counters per window pane
+HEAVY_HITTER_WINDOWS = [int(w) for w in os.getenv('HEAVY_HITTER_WINDOWS', '60,300,3600').split(',') if w]
+HEAVY_HITTER_CAPACITY = int(os.getenv('HEAVY_HITTER_CAPACITY', '200') or 200)
+
+# Incident correlation: groups sharing a key (resource, service, namespace) within the window merge
+INCIDENT_WINDOW_SECONDS = int(os.getenv('INCIDENT_WINDOW_SECONDS', '300') or 300)
+INCIDENT_CORRELATION_KEYS = [k for k in os.getenv('INCIDENT_CORRELATION_KEYS', 'resource,service').split(',') if k]
+INCIDENT_MIN_GROUPS = int(os.getenv('INCIDENT_MIN_GROUPS', '2') or 2)
+INCIDENT_REFRESH_SECONDS = int(os.getenv('INCIDENT_REFRESH_SECONDS', '30') or 30)
+
+# Root cause ranking: optional JSON topology ({"edges": [[node, dependency], ...]}) and walk depth
+RCA_TOPOLOGY_FILE = os.getenv('RCA_TOPOLOGY_FILE', '')
+RCA_MAX_DEPTH = int(os.getenv('RCA_MAX_DEPTH', '3') or 3)
+# Edges learned from events are dropped after this many idle seconds (0 keeps them)
+RCA_EDGE_WINDOW_SECONDS = int(os.getenv('RCA_EDGE_WINDOW_SECONDS', '86400') or 86400)
+
+# Retention: purge_events keeps this many days; monthly alert_event partitions
+# (PostgreSQL) are created this many months ahead
+EVENT_RETENTION_DAYS = int(os.getenv('EVENT_RETENTION_DAYS', '90') or 90)
+EVENT_PARTITION_MONTHS_AHEAD = int(os.getenv('EVENT_PARTITION_MONTHS_AHEAD', '2') or 2)
+# Rollup retention (days): minute buckets serve recent charts, hour buckets long-range trends
+ROLLUP_MINUTE_RETENTION_DAYS = int(os.getenv('ROLLUP_MINUTE_RETENTION_DAYS', '7') or 7)
+ROLLUP_HOUR_RETENTION_DAYS = int(os.getenv('ROLLUP_HOUR_RETENTION_DAYS', '400') or 400)
+# Stale groups: resolve_stale_groups resolves an active group after this many seconds
+# without events, per source ("*" for any other); sources not listed never go stale
+STALE_GROUP_TTL_SECONDS = json.loads(
+    os.getenv('STALE_GROUP_TTL_SECONDS', '') or '{"grafana": 86400, "zabbix": 86400}'
+)
+
+# Interned label sets kept per process (digest -> id and id -> labels)
+LABELSET_CACHE_SIZE = int(os.getenv('LABELSET_CACHE_SIZE', '10000') or 10000)
+
+# Raw payload digests remembered per process to skip the dedupe lookup
+RAW_PAYLOAD_CACHE_SIZE = int(os.getenv('RAW_PAYLOAD_CACHE_SIZE', '10000') or 10000)
+
+# Per-source label selection/normalization for fingerprints (JSON, see core/fingerprint.py)
+FINGERPRINT_POLICIES = json.loads(os.getenv('FINGERPRINT_POLICIES', '{}') or '{}')
+
+# Fingerprint hash scheme: v1 (SHA-256 over canonical JSON) or v2 (BLAKE2b-128, "v2:" prefix)
+FINGERPRINT_SCHEME = os.getenv('FINGERPRINT_SCHEME', 'v1') or 'v1'
+
+# Recent fingerprint inputs memoized per process
+FINGERPRINT_CACHE_SIZE = int(os.getenv('FINGERPRINT_CACHE_SIZE', '10000') or 10000)
+
+# Fingerprint -> group entries kept per process so ingest can update groups by id
+GROUP_CACHE_SIZE = int(os.getenv('GROUP_CACHE_SIZE', '10000') or 10000)
+
+# Near-duplicate clustering (MinHash/LSH): similarity threshold, idle expiry, clusters kept per process
+CLUSTER_THRESHOLD = float(os.getenv('CLUSTER_THRESHOLD', '0.5') or 0.5)
+CLUSTER_WINDOW_SECONDS = int(os.getenv('CLUSTER_WINDOW_SECONDS', '3600') or 3600)
+CLUSTER_MAX = int(os.getenv('CLUSTER_MAX', '100000') or 100000)
+
+# Flap detection: percent state change to start (high) and stop (low) flapping, groups tracked per process
+FLAP_HIGH_THRESHOLD = float(os.getenv('FLAP_HIGH_THRESHOLD', '50') or 50)
+FLAP_LOW_THRESHOLD = float(os.getenv('FLAP_LOW_THRESHOLD', '25') or 25)
+FLAP_TRACKED_GROUPS = int(os.getenv('FLAP_TRACKED_GROUPS', '100000') or 100000)
+
+# Storm mode: EWMA half-life (seconds), enter/exit rates (events/s) globally and per source,
+# severity kept in full, sampling of the rest, and actions sent one summary per storm (JSON list)
+STORM_HALF_LIFE_SECONDS = float(os.getenv('STORM_HALF_LIFE_SECONDS', '10') or 10)
+STORM_ENTER_RATE = float(os.getenv('STORM_ENTER_RATE', '200') or 200)
+STORM_EXIT_RATE = float(os.getenv('STORM_EXIT_RATE', '50') or 50)
+STORM_SOURCE_ENTER_RATE = float(os.getenv('STORM_SOURCE_ENTER_RATE', '100') or 100)
+STORM_SOURCE_EXIT_RATE = float(os.getenv('STORM_SOURCE_EXIT_RATE', '25') or 25)
+STORM_KEEP_SEVERITY = os.getenv('STORM_KEEP_SEVERITY', 'high') or 'high'
+STORM_SAMPLE_EVERY = int(os.getenv('STORM_SAMPLE_EVERY', '10') or 10)
+STORM_NOTIFY_ACTIONS = json.loads(os.getenv('STORM_NOTIFY_ACTIONS', '') or '[]')
+
+# Silences: how often each process checks the silence table for changes made elsewhere (seconds)
+SILENCE_RELOAD_SECONDS = float(os.getenv('SILENCE_RELOAD_SECONDS', '5') or 5)
+
+# Inhibit rules: how often each process checks the rule table for changes (seconds)
+INHIBIT_RELOAD_SECONDS = float(os.getenv('INHIBIT_RELOAD_SECONDS', '5') or 5)
+
+# Escalation: how often each process checks the policy table for changes (seconds)
+ESCALATION_RELOAD_SECONDS = float(os.getenv('ESCALATION_RELOAD_SECONDS', '5') or 5)
+# Escalation scheduler: timing wheel tick and how often it picks up new timers (seconds)
+ESCALATION_TICK_SECONDS = float(os.getenv('ESCALATION_TICK_SECONDS', '1') or 1)
+ESCALATION_POLL_SECONDS = float(os.getenv('ESCALATION_POLL_SECONDS', '2') or 2)
+# How far each poll reaches back before the newest timer it has seen, for late commits and clock skew (seconds)
+ESCALATION_POLL_OVERLAP_SECONDS = float(os.getenv('ESCALATION_POLL_OVERLAP_SECONDS', '60') or 60)
+
+# Rule notification batching: how often pending batches are checked for a flush (seconds)
+BATCH_TICK_SECONDS = float(os.getenv('BATCH_TICK_SECONDS', '1') or 1)
+
+# Key for suppressing duplicate events from rule evaluation: fingerprint or cluster
+DEDUPE_KEY = os.getenv('DEDUPE_KEY', 'fingerprint') or 'fingerprint'
+
 # Email (use console backend by default)
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST', '')
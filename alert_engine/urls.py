@@ -7,4 +7,8 @@ urlpatterns = [
     path('api/v1/webhooks/', include('sources.urls')),
     # Basic alert browsing endpoints (optional)
     path('api/v1/alerts/', include('alerts.urls')),
+    path('api/v1/groups/', include('alerts.group_urls')),
+    path('api/v1/incidents/', include('alerts.incident_urls')),
+    path('api/v1/silences/', include('rules.silence_urls')),
+    path('api/v1/inhibit-rules/', include('rules.inhibit_urls')),
 ]
@@ -1,16 +1,37 @@
 from django.contrib import admin
-from .models import AlertEvent, AlertGroup
+from .changelist import LargeTableAdmin, SeverityFacetFilter, SourceFacetFilter, StatusFacetFilter
+from .models import AlertEvent, AlertGroup, Incident
+from .search import search_events
+
+
+@admin.register(Incident)
+class IncidentAdmin(admin.ModelAdmin):
+    list_display = ("id", "title", "status", "max_severity", "group_count", "root_cause", "first_seen", "last_seen")
+    list_filter = ("status", "max_severity")
 
 
 @admin.register(AlertGroup)
-class AlertGroupAdmin(admin.ModelAdmin):
-    list_display = ("fingerprint", "status", "count", "first_seen", "last_seen")
+class AlertGroupAdmin(LargeTableAdmin):
+    list_display = ("fingerprint", "status", "max_severity", "last_title", "count", "flapping", "first_seen", "last_seen")
+    list_filter = ("status", "max_severity", "flapping")
     search_fields = ("fingerprint",)
+    raw_id_fields = ("incident",)
+    changelist_defer = ("sources",)
 
 
 @admin.register(AlertEvent)
-class AlertEventAdmin(admin.ModelAdmin):
+class AlertEventAdmin(LargeTableAdmin):
     list_display = ("id", "source", "status", "severity", "title", "created_at")
-    list_filter = ("source", "status", "severity")
-    search_fields = ("title", "resource", "service", "metric", "fingerprint")
+    list_filter = (SourceFacetFilter, StatusFacetFilter, SeverityFacetFilter)
+    search_fields = ("title", "description", "resource", "service", "metric", "fingerprint")
+    search_help_text = "Full-text: every word must match the start of a word in these fields."
+    exclude = ("label_set", "raw_payload")
+    readonly_fields = ("labels", "raw")
+    raw_id_fields = ("group",)
+    changelist_defer = ("description", "annotations", "generator_url")
 
+    def get_search_results(self, request, queryset, search_term):
+        # Served by the full-text index instead of one LIKE '%term%' per field.
+        if not search_term:
+            return queryset, False
+        return search_events(queryset, search_term), False
@@ -1,4 +1,21 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def _install_search(using="default", **kwargs) -> None:
+    from alerts import search
+    search.restore_triggers(connections[using])
+
+
+def _ensure_partitions(using="default", **kwargs) -> None:
+    from django.conf import settings
+    from django.utils import timezone
+
+    from alerts import partitioning
+    conn = connections[using]
+    if partitioning.is_partitioned(conn):
+        partitioning.ensure_partitions(timezone.now(), settings.EVENT_PARTITION_MONTHS_AHEAD, conn)
 
 
 class AlertsConfig(AppConfig):
@@ -11,4 +28,6 @@ class AlertsConfig(AppConfig):
             import alerts.signals  # noqa: F401
         except Exception:
             pass
+        post_migrate.connect(_install_search, sender=self)
+        post_migrate.connect(_ensure_partitions, sender=self)
 
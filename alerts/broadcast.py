@@ -0,0 +1,103 @@
+"""
+In-process fan-out of committed alert events to live-tail subscribers.
+
+Ingest publishes each message once; every subscriber owns a bounded asyncio
+queue on its event loop. A subscriber whose queue fills up is dropped instead
+of slowing the publisher down or growing memory.
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Message attributes subscribers may filter on.
+FILTER_KEYS = ("severity", "service", "namespace")
+
+_CLOSED = object()
+
+
+class Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, filters: Dict[str, Iterable[str]],
+                 types: Optional[Iterable[str]] = None, maxsize: int = 256):
+        self.loop = loop
+        self.filters = {k: frozenset(v) for k, v in filters.items() if v}
+        self.types = frozenset(types) if types else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def matches(self, message: Dict[str, Any]) -> bool:
+        if self.types is not None and message["type"] not in self.types:
+            return False
+        attrs = message["attrs"]
+        for key, allowed in self.filters.items():
+            if attrs.get(key) not in allowed:
+                return False
+        return True
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        """Hand a message over from any thread."""
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message: Any) -> None:
+        # Runs on the subscriber's loop, so queue access needs no locking.
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_CLOSED)
+            logger.warning("Dropped slow live-tail subscriber (buffer of %s full)", self.queue.maxsize)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Next message, or None on timeout. Raises EOFError once the subscriber
+        has been dropped or closed.
+        """
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if message is _CLOSED:
+            raise EOFError
+        return message
+
+
+class Broadcaster:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscriber] = []
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, filters: Dict[str, Iterable[str]], types: Optional[Iterable[str]] = None,
+                  maxsize: int = 256) -> Subscriber:
+        subscriber = Subscriber(asyncio.get_running_loop(), filters, types=types, maxsize=maxsize)
+        with self._lock:
+            self._subscribers = [*self._subscribers, subscriber]
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscriber]
+
+    def publish(self, type_: str, data: Dict[str, Any], attrs: Dict[str, Any]) -> None:
+        message = {"type": type_, "data": data, "attrs": attrs}
+        # Copy-on-write list: iterate without holding the lock.
+        for subscriber in self._subscribers:
+            if subscriber.dropped or not subscriber.matches(message):
+                continue
+            try:
+                subscriber.offer(message)
+            except RuntimeError:
+                # Subscriber's event loop is gone (client went away mid-shutdown).
+                self.unsubscribe(subscriber)
+
+
+broadcaster = Broadcaster()
@@ -0,0 +1,125 @@
+"""
+Label cardinality analysis for fingerprint and group blow-ups.
+
+Only distinct (source, label set) pairs matter for how many groups labels
+can produce, and interning means there are far fewer of those than events.
+They are streamed from the database in chunks and folded into HyperLogLog
+sketches, so memory depends on the number of label keys and sources, not on
+the number of rows.
+
+Each label set is hashed as the XOR of its (key, value) item hashes and the
+source hash, so the hash of the same set *without* a key is one more XOR.
+A key's "without" sketch receives that hash for every set carrying the key
+and the unchanged hash for every set lacking it (a key first seen late
+starts from a copy of all sets so far). Its count estimates how many
+distinct label sets would remain if the key were left out of fingerprints
+(see core.fingerprint); the difference to the total is the key's
+contribution.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from algorithms.hyperloglog import HyperLogLog, hash64
+from .models import AlertEvent, LabelSet
+
+
+@dataclass
+class KeyStats:
+    key: str
+    label_sets: int  # exact: how many label sets carry the key
+    distinct_values: int
+    label_sets_without_key: int  # distinct label sets if the key were dropped
+    contribution: int  # label sets that only differ by this key
+    top_sources: List[Tuple[str, int]]  # sources with the most distinct values
+
+
+@dataclass
+class CardinalityReport:
+    pairs: int
+    label_sets: int
+    keys: List[KeyStats] = field(default_factory=list)
+    sources: List[Tuple[str, int]] = field(default_factory=list)  # distinct label sets per source
+
+
+class CardinalityAnalyzer:
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.pairs = 0
+        self.presence: Counter = Counter()
+        self.all_sets = HyperLogLog(precision)
+        self.values: Dict[str, HyperLogLog] = defaultdict(self._sketch)
+        self.without: Dict[str, HyperLogLog] = {}
+        self.source_sets: Dict[str, HyperLogLog] = defaultdict(self._sketch)
+        self.source_values: Dict[Tuple[str, str], HyperLogLog] = defaultdict(self._sketch)
+
+    def _sketch(self) -> HyperLogLog:
+        return HyperLogLog(self.precision)
+
+    def add(self, source: str, labels: Dict[str, Any]) -> None:
+        self.pairs += 1
+        items = {key: hash64(f"{key}\0{value}") for key, value in labels.items()}
+        whole = hash64(f"\0source\0{source}")
+        for item in items.values():
+            whole ^= item
+        for key in items:
+            if key not in self.without:
+                self.without[key] = self.all_sets.copy()  # every earlier set lacked it
+        position = self.all_sets.position(whole)
+        self.all_sets.add_position(*position)
+        self.source_sets[source].add_position(*position)
+        for key, sketch in self.without.items():
+            item = items.get(key)
+            if item is None:
+                sketch.add_position(*position)
+            else:
+                sketch.add_hash(whole ^ item)
+        for key, item in items.items():
+            self.presence[key] += 1
+            self.values[key].add_hash(item)
+            self.source_values[(source, key)].add_hash(item)
+
+    def report(self, top_sources: int = 3) -> CardinalityReport:
+        per_key_sources: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        for (source, key), sketch in self.source_values.items():
+            per_key_sources[key].append((source, sketch.count()))
+        total = self.all_sets.count()
+        keys = [
+            KeyStats(
+                key=key,
+                label_sets=self.presence[key],
+                distinct_values=self.values[key].count(),
+                label_sets_without_key=min(self.without[key].count(), total),
+                contribution=max(total - self.without[key].count(), 0),
+                top_sources=sorted(per_key_sources[key], key=lambda item: -item[1])[:top_sources],
+            )
+            for key in self.presence
+        ]
+        keys.sort(key=lambda k: (-k.contribution, -k.distinct_values))
+        sources = sorted(((s, h.count()) for s, h in self.source_sets.items()), key=lambda item: -item[1])
+        return CardinalityReport(pairs=self.pairs, label_sets=total, keys=keys, sources=sources)
+
+
+def iter_source_label_sets(chunk_size: int = 5000, source: Optional[str] = None,
+                           since=None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Distinct (source, labels) pairs of stored events, labels loaded a chunk at a time."""
+    events = AlertEvent.objects.exclude(label_set_id=None)
+    if source:
+        events = events.filter(source=source)
+    if since:
+        events = events.filter(created_at__gte=since)
+    pairs = events.order_by().values_list("source", "label_set_id").distinct()
+    chunk: List[Tuple[str, int]] = []
+    for pair in pairs.iterator(chunk_size=chunk_size):
+        chunk.append(pair)
+        if len(chunk) >= chunk_size:
+            yield from _with_labels(chunk)
+            chunk = []
+    yield from _with_labels(chunk)
+
+
+def _with_labels(chunk: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    chunk = list(chunk)
+    labels = dict(LabelSet.objects.filter(id__in={i for _, i in chunk}).values_list("id", "labels"))
+    for source, label_set_id in chunk:
+        yield source, labels.get(label_set_id) or {}
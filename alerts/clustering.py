@@ -0,0 +1,39 @@
+"""
+Near-duplicate clustering of incoming events (see algorithms.minhash).
+
+Every event gets a ``cluster_key`` at ingest. Events whose titles and label
+values match once numbers and ids are masked share a key, even when their
+fingerprints differ. Cluster state is per process and expires after
+CLUSTER_WINDOW_SECONDS idle. A new cluster's key derives from its first
+member, so which key a near-duplicate gets depends on what that process
+saw first: two ingest workers, or one process before and after a restart,
+may file the same alert under different keys. Keys are therefore only
+comparable within one ingest process, which is what DEDUPE_KEY=cluster
+needs; rules should not pin a particular key, and candidate_events does not
+push cluster_key conditions down to the database.
+"""
+import time
+from typing import Any, Dict, Optional, Set
+
+from django.conf import settings
+
+from algorithms.minhash import LSHClusterer, normalize, shingles
+
+clusterer = LSHClusterer(
+    threshold=settings.CLUSTER_THRESHOLD,
+    window_seconds=settings.CLUSTER_WINDOW_SECONDS,
+    max_clusters=settings.CLUSTER_MAX,
+)
+
+
+def event_shingles(title: str, labels: Dict[str, Any]) -> Set[str]:
+    """Character shingles of the title plus one token per (normalized) label."""
+    items = shingles(title)
+    for name, value in labels.items():
+        items.add(f"{name}={normalize(str(value))}")
+    return items
+
+
+def assign(title: str, labels: Dict[str, Any], now: Optional[float] = None) -> str:
+    key, _ = clusterer.assign(event_shingles(title, labels or {}), time.monotonic() if now is None else now)
+    return key
@@ -0,0 +1,64 @@
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from django.db.models import QuerySet
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import labelsets
+from .serializers import AlertEventSerializer
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def iter_ndjson(queryset: QuerySet, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                after_id: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield one JSON document per event, ordered by id.
+
+    Rows are pulled through ``.iterator()`` (a server-side cursor on
+    PostgreSQL), so memory stays flat however many rows match. ``after_id``
+    resumes an interrupted export: pass the id of the last line received.
+    """
+    if after_id is not None:
+        queryset = queryset.filter(id__gt=after_id)
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    chunk = []
+    for event in queryset.order_by("id").iterator(chunk_size=chunk_size):
+        chunk.append(event)
+        if len(chunk) >= chunk_size:
+            yield from _encode_chunk(chunk, encoder)
+            chunk = []
+    if chunk:
+        yield from _encode_chunk(chunk, encoder)
+
+
+def _encode_chunk(events, encoder: JSONEncoder) -> Iterator[bytes]:
+    labelsets.warm(e.label_set_id for e in events)
+    for event in events:
+        data = AlertEventSerializer(event).data
+        yield (encoder.encode(data) + "\n").encode("utf-8")
+
+
+def gzip_stream(chunks: Iterable[bytes], flush_every: int = 64 * 1024) -> Iterator[bytes]:
+    """Gzip-compress a byte stream incrementally, emitting roughly every ``flush_every`` input bytes."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    pending = 0
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        pending += len(chunk)
+        if pending >= flush_every:
+            out += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def parse_cursor(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError("cursor must be the id of the last exported event")
+
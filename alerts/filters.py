@@ -0,0 +1,94 @@
+from typing import Any, List, Mapping
+
+from django.db.models import QuerySet
+from django.utils.dateparse import parse_datetime
+
+from core.matchers import Matcher, parse_matchers
+from .labelindex import filter_by_labels
+from .search import search_events
+
+# Query parameters shared by the alert list and export endpoints. Each maps to
+# a model field; comma separated values become an ``__in`` lookup.
+EVENT_FILTER_FIELDS = (
+    "source",
+    "status",
+    "severity",
+    "service",
+    "namespace",
+    "resource",
+    "metric",
+    "fingerprint",
+    "cluster_key",
+)
+
+
+class FilterError(ValueError):
+    """A malformed filter parameter; ``field`` names the query parameter at fault."""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(message)
+        self.field = field
+
+
+def _datetime(params: Mapping[str, Any], field: str):
+    try:
+        return parse_datetime(params.get(field) or "")
+    except ValueError as e:  # well formed but out of range, e.g. month 13
+        raise FilterError(field, f"{field} is not a valid datetime: {e}")
+
+
+def filter_events(queryset: QuerySet, params: Mapping[str, Any]) -> QuerySet:
+    """
+    Apply list-API style filters from a query dict to an AlertEvent queryset.
+
+    Supported: the fields in EVENT_FILTER_FIELDS, ``group`` (group id),
+    ``since``/``until`` (ISO datetimes bounding ``created_at``) and repeated
+    ``label`` matchers such as ``label=team=sre&label=instance=~"db-.*"`` and
+    ``q`` (full-text search over title, description and resource fields).
+    Raises FilterError for a malformed ``group``, ``since``, ``until`` or
+    matcher.
+    """
+    for field in EVENT_FILTER_FIELDS:
+        value = params.get(field)
+        if not value:
+            continue
+        values = [v for v in str(value).split(",") if v]
+        if len(values) > 1:
+            queryset = queryset.filter(**{f"{field}__in": values})
+        else:
+            queryset = queryset.filter(**{field: values[0]})
+
+    group = params.get("group")
+    if group:
+        try:
+            queryset = queryset.filter(group_id=group)
+        except ValueError:
+            raise FilterError("group", "group must be a group id")
+
+    since = _datetime(params, "since")
+    if since:
+        queryset = queryset.filter(created_at__gte=since)
+    until = _datetime(params, "until")
+    if until:
+        queryset = queryset.filter(created_at__lt=until)
+
+    matchers = label_matchers(params)
+    if matchers:
+        queryset = filter_by_labels(queryset, matchers)
+
+    q = params.get("q")
+    if q:
+        queryset = search_events(queryset, q)
+
+    return queryset
+
+
+def label_matchers(params: Mapping[str, Any]) -> List[Matcher]:
+    """Matchers from every ``label`` parameter of a query dict; FilterError if one is malformed."""
+    values = params.getlist("label") if hasattr(params, "getlist") else params.get("label")
+    if isinstance(values, str):
+        values = [values]
+    try:
+        return parse_matchers(v for v in values or [] if v)
+    except ValueError as e:
+        raise FilterError("label", str(e))
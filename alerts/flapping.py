@@ -0,0 +1,55 @@
+"""
+Flap tracking for groups (see algorithms.flapping).
+
+Every new event is a status sample for its group, recorded when the event
+commits; the rule pass sees what the sample will do. While a group flaps, rule
+actions are skipped; the rule pass for the event that starts flapping, and
+the one that stops it, still runs with ``flapping`` set in the template
+context, so each episode notifies once at either end. AlertGroup.flapping
+mirrors the state and lets a restarted process pick it up again.
+"""
+import logging
+from functools import partial
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from algorithms.flapping import FlapDetector
+from .broadcast import FILTER_KEYS, broadcaster
+from .models import AlertEvent, AlertGroup
+
+logger = logging.getLogger(__name__)
+
+detector = FlapDetector(settings.FLAP_LOW_THRESHOLD, settings.FLAP_HIGH_THRESHOLD, settings.FLAP_TRACKED_GROUPS)
+
+
+def track(event: AlertEvent) -> Tuple[bool, Optional[str]]:
+    """(flapping, change) for the event's group, change being "started", "stopped" or None."""
+    group_id = event.group_id
+    if group_id is None:
+        return False, None
+    was_flapping = False
+    if not detector.is_tracked(group_id):
+        was_flapping = AlertGroup.objects.filter(pk=group_id, flapping=True).exists()
+    # The sample is only recorded once the event commits; rolled-back events never count.
+    transaction.on_commit(partial(_observe, group_id, event, was_flapping))
+    return detector.peek(group_id, event.status, was_flapping)
+
+
+def _observe(group_id: int, event: AlertEvent, was_flapping: bool) -> None:
+    flapping, change = detector.observe(group_id, event.status, was_flapping)
+    if change is not None:
+        _changed(group_id, flapping, change, event)
+
+
+def _changed(group_id: int, flapping: bool, change: str, event: AlertEvent) -> None:
+    AlertGroup.objects.filter(pk=group_id).update(flapping=flapping)
+    logger.info("Group %s flapping %s", group_id, change)
+    if broadcaster.has_subscribers:
+        broadcaster.publish("flapping", {
+            "group": group_id,
+            "change": change,
+            "fingerprint": event.fingerprint,
+            "title": event.title,
+        }, {key: getattr(event, key) for key in FILTER_KEYS})
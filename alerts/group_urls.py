@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import AlertGroupAckView, AlertGroupListView
+
+urlpatterns = [
+    path('', AlertGroupListView.as_view(), name='group-list'),
+    path('<int:pk>/ack/', AlertGroupAckView.as_view(), name='group-ack'),
+]
@@ -0,0 +1,44 @@
+"""
+Process-local fingerprint -> group cache for the ingest path.
+
+An entry holds what ingest needs to update the group by primary key: its id,
+last known status and sources. Entries go stale when another process changes
+or deletes the group. Ingest's UPDATE matches on the id *and* the cached
+status, so a deleted group, or one whose status was changed elsewhere (an ack,
+a stale-group sweep), shows up as an UPDATE matching no row; ingest then
+forgets the entry and takes the locking path, which reads the real status.
+The status transitions fed to incidents, escalation and inhibitions are
+therefore never derived from a stale entry. Purges also forget the groups
+they delete.
+"""
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+from django.conf import settings
+
+from core.lru import LRUCache
+from core.metrics import register_cache
+
+_groups = register_cache("alert_groups", LRUCache(settings.GROUP_CACHE_SIZE))
+
+
+class CachedGroup(NamedTuple):
+    id: int
+    status: str
+    sources: Sequence[str]
+
+
+def lookup(fingerprint: str) -> Optional[CachedGroup]:
+    return _groups.get(fingerprint)
+
+
+def remember(group_id: int, fingerprint: str, status: str, sources: Iterable[str]) -> None:
+    _groups.put(fingerprint, CachedGroup(group_id, status, tuple(sources)))
+
+
+def forget(fingerprints: Iterable[str]) -> None:
+    for fingerprint in fingerprints:
+        _groups.pop(fingerprint)
+
+
+def clear() -> None:
+    _groups.clear()
@@ -0,0 +1,167 @@
+"""
+Incident correlation: committed events feed the in-process
+IncidentCorrelator, and its components are mirrored into Incident rows.
+
+Database writes happen only when a component gains or loses members, a
+member changes status, or an incident's summary is older than
+INCIDENT_REFRESH_SECONDS, so the common event costs no queries here.
+Correlation state is per process: with several ingesting processes, events
+for the same outage must reach the same one (or incidents come out split).
+"""
+import logging
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Count, Max, Min
+
+from algorithms import rca
+from algorithms.correlation import IncidentCorrelator
+from core.lru import LRUCache
+from core.utils import utcnow
+from .broadcast import broadcaster
+from .models import SEVERITY_RANK, AlertEvent, AlertGroup, AlertStatus, Incident
+
+logger = logging.getLogger(__name__)
+
+correlator = IncidentCorrelator(settings.INCIDENT_WINDOW_SECONDS)
+_refreshed = LRUCache(4096)  # incident id -> monotonic time of the last summary refresh
+
+
+def correlation_keys(event: AlertEvent) -> List[str]:
+    keys = []
+    for dimension in settings.INCIDENT_CORRELATION_KEYS:
+        if dimension == "resource" and event.resource:
+            keys.append(f"resource:{event.resource}")
+        elif dimension == "service" and event.service:
+            keys.append(f"service:{event.namespace}/{event.service}")
+        elif dimension == "namespace" and event.namespace:
+            keys.append(f"namespace:{event.namespace}")
+    return keys
+
+
+def correlate(event: AlertEvent, group: AlertGroup, status_changed: bool = False) -> Optional[int]:
+    """Fold a committed event into incident state; returns its group's incident id, if any."""
+    observation = correlator.observe(group.id, correlation_keys(event), time.monotonic())
+    try:
+        with transaction.atomic():
+            return _apply(observation, event, group.id, status_changed)
+    except DatabaseError:
+        logger.exception("Incident correlation failed for event %s", event.id)
+        return None
+
+
+def _apply(observation, event: AlertEvent, group_id: int, status_changed: bool) -> Optional[int]:
+    incident_id = observation.incident
+    if incident_id is not None and (observation.retired or observation.moved):
+        if not Incident.objects.filter(pk=incident_id).exists():  # deleted by hand
+            incident_id = None
+    if incident_id is None:
+        if observation.size < settings.INCIDENT_MIN_GROUPS:
+            _rank(None, event)
+            return None
+        members = correlator.members(observation.root)
+        incident_id = _adopt_or_create(members)
+        correlator.set_incident(observation.root, incident_id)
+        AlertGroup.objects.filter(id__in=members).update(incident_id=incident_id)
+        _seed_root_causes(incident_id, [m for m in members if m != group_id])
+        changed = True
+    else:
+        if observation.retired:
+            AlertGroup.objects.filter(incident_id__in=observation.retired).update(incident_id=incident_id)
+            Incident.objects.filter(id__in=observation.retired).delete()
+            rca.engine.merge(incident_id, observation.retired)
+        if observation.moved:
+            AlertGroup.objects.filter(id__in=observation.moved).update(incident_id=incident_id)
+        changed = bool(observation.retired or observation.moved or status_changed)
+    _rank(incident_id, event)
+
+    last = _refreshed.get(incident_id)
+    if changed or last is None or time.monotonic() - last >= settings.INCIDENT_REFRESH_SECONDS:
+        incident = refresh_incident(incident_id)
+        if incident is not None and changed:
+            transaction.on_commit(lambda: _publish(incident))
+    return incident_id
+
+
+def _rank(incident_id: Optional[int], event: AlertEvent) -> None:
+    rca.engine.observe(incident_id, event.service, event.namespace, event.resource, event.created_at.timestamp())
+
+
+def _seed_root_causes(incident_id: int, group_ids: List[int]) -> None:
+    """Replay the other members' latest events, in first_seen order, into a new incident's ranking."""
+    first_seen = dict(
+        AlertGroup.objects.filter(id__in=group_ids, latest_event_id__isnull=False)
+        .values_list("latest_event_id", "first_seen")
+    )
+    events = AlertEvent.objects.filter(id__in=first_seen).only("id", "service", "namespace", "resource")
+    for event in sorted(events, key=lambda e: first_seen[e.id]):
+        rca.engine.observe(incident_id, event.service, event.namespace, event.resource,
+                           first_seen[event.id].timestamp())
+
+
+def _adopt_or_create(members: List[int]) -> int:
+    """An open incident some member already belongs to (e.g. from before a restart), or a new one."""
+    cutoff = utcnow() - timedelta(seconds=settings.INCIDENT_WINDOW_SECONDS)
+    existing = (
+        Incident.objects.filter(groups__id__in=members, last_seen__gte=cutoff)
+        .order_by("id").values_list("id", flat=True).first()
+    )
+    if existing is not None:
+        return existing
+    return Incident.objects.create().id
+
+
+def refresh_incident(incident_id: int) -> Optional[Incident]:
+    """Recompute an incident's summary from its groups; deletes it if none are left."""
+    groups = AlertGroup.objects.filter(incident_id=incident_id)
+    totals = groups.aggregate(n=Count("id"), first=Min("first_seen"), last=Max("last_seen"))
+    if not totals["n"]:
+        Incident.objects.filter(pk=incident_id).delete()
+        _refreshed.pop(incident_id)
+        rca.engine.forget(incident_id)
+        return None
+    statuses, severities = set(), set()
+    for status, severity in groups.values_list("status", "max_severity").distinct():
+        statuses.add(status)
+        severities.add(severity)
+    if AlertStatus.FIRING in statuses:
+        status = AlertStatus.FIRING
+    elif AlertStatus.ACKED in statuses:
+        status = AlertStatus.ACKED
+    else:
+        status = AlertStatus.RESOLVED
+    first_title = groups.order_by("first_seen", "id").values_list("last_title", flat=True).first() or ""
+    title = first_title if totals["n"] == 1 else f"{first_title} (+{totals['n'] - 1} related)"
+
+    incident = Incident(
+        id=incident_id,
+        title=title[:255],
+        status=status,
+        max_severity=max(severities, key=lambda s: SEVERITY_RANK.get(s, 0)),
+        group_count=totals["n"],
+        first_seen=totals["first"],
+        last_seen=totals["last"],
+        root_cause=next((c["node"] for c in rca.engine.ranking(incident_id, 1)), ""),
+    )
+    Incident.objects.filter(pk=incident_id).update(
+        title=incident.title, status=incident.status, max_severity=incident.max_severity,
+        group_count=incident.group_count, first_seen=incident.first_seen, last_seen=incident.last_seen,
+        root_cause=incident.root_cause,
+    )
+    _refreshed.put(incident_id, time.monotonic())
+    return incident
+
+
+def _publish(incident: Incident) -> None:
+    if broadcaster.has_subscribers:
+        broadcaster.publish("incident", {
+            "id": incident.id,
+            "title": incident.title,
+            "status": incident.status,
+            "max_severity": incident.max_severity,
+            "group_count": incident.group_count,
+            "root_cause": incident.root_cause,
+        }, {"severity": incident.max_severity})
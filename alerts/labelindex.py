@@ -0,0 +1,99 @@
+"""
+Inverted label index: (key, value) -> LabelSet postings in alert_label_entry.
+
+Postings are written once per distinct label set (when it is interned), not
+once per event. A query turns each matcher into either a posting list the
+label set must be in or one it must not be in (regexes are evaluated by the
+database), intersects the required lists, and hands the surviving label set
+ids to the event query.
+Values are indexed up to 255 characters.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db.models import Q, QuerySet
+
+from core.matchers import EQ, NEQ, RE, Matcher
+from .models import LabelSetEntry
+
+KEY_LENGTH = 128
+VALUE_LENGTH = 255
+# Above this many candidate ids, let the database intersect via subqueries.
+MAX_IN_CLAUSE = 10000
+
+
+def _index_value(value: Any) -> str:
+    return (value if isinstance(value, str) else str(value))[:VALUE_LENGTH]
+
+
+def index_label_set(label_set_id: int, labels: Dict[str, Any]) -> None:
+    LabelSetEntry.objects.bulk_create([
+        LabelSetEntry(label_set_id=label_set_id, key=key[:KEY_LENGTH], value=_index_value(value))
+        for key, value in labels.items()
+    ])
+
+
+def _postings(matcher: Matcher) -> Tuple[bool, Q]:
+    """
+    (required, filter): label sets must (required) or must not appear in the
+    postings selected by ``filter``. Matchers that accept a missing label can
+    only ever exclude.
+    """
+    required = not matcher.matches_empty
+    key = matcher.name[:KEY_LENGTH]
+    if matcher.op in (EQ, NEQ):
+        if matcher.value:
+            return required, Q(key=key, value=_index_value(matcher.value))
+        return required, Q(key=key) & ~Q(value="")
+    # Regexes run in the database, fully anchored like the matcher itself.
+    regex = Q(value__regex=rf"^(?:{matcher.value})$")
+    if (matcher.op == RE) == required:
+        return required, Q(key=key) & regex
+    return required, Q(key=key) & ~regex
+
+
+def _intersect(required: List[Q]) -> Optional[Set[int]]:
+    """
+    Label set ids present in every posting list, or None if too many to
+    inline. At most MAX_IN_CLAUSE + 1 postings are read per list; a list
+    longer than that is only intersected once a shorter one has narrowed
+    the candidates.
+    """
+    ids: Optional[Set[int]] = None
+    deferred: List[Q] = []
+    for q in required:
+        postings = LabelSetEntry.objects.filter(q)
+        if ids is not None:
+            postings = postings.filter(label_set_id__in=ids)
+        fetched = set(postings.values_list("label_set_id", flat=True)[:MAX_IN_CLAUSE + 1])
+        if len(fetched) > MAX_IN_CLAUSE:
+            deferred.append(q)
+            continue
+        ids = fetched
+        if not ids:
+            return set()
+    if ids is None:
+        return None
+    for q in deferred:
+        ids = set(LabelSetEntry.objects.filter(q, label_set_id__in=ids).values_list("label_set_id", flat=True))
+        if not ids:
+            return set()
+    return ids
+
+
+def filter_by_labels(queryset: QuerySet, matchers: Iterable[Matcher], field: str = "label_set_id") -> QuerySet:
+    """Restrict a queryset whose ``field`` references LabelSet to sets satisfying every matcher."""
+    required, excluded = [], []
+    for matcher in matchers:
+        must, q = _postings(matcher)
+        (required if must else excluded).append(q)
+
+    if required:
+        ids = _intersect(required)
+        if ids is None:
+            for q in required:
+                queryset = queryset.filter(**{f"{field}__in": LabelSetEntry.objects.filter(q).values("label_set_id")})
+        else:
+            queryset = queryset.filter(**{f"{field}__in": ids})
+    for q in excluded:
+        queryset = queryset.exclude(**{f"{field}__in": LabelSetEntry.objects.filter(q).values("label_set_id")})
+    return queryset
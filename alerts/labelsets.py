@@ -0,0 +1,75 @@
+"""
+Interning of event label dicts into LabelSet rows.
+
+Alertmanager resends identical labels over and over, so events reference a
+shared LabelSet by id. Two process-local LRUs keep the hot sets off the
+database: digest -> id for writes and id -> labels for reads. Ids are only
+cached once the transaction that looked them up commits, so a rolled-back
+insert never leaves a cached id pointing at a missing row. Sets no event
+references any more are removed by purge_events (see alerts.retention); a
+cached id is therefore claimed (checked and locked) before it is used, and
+looked up again if the set is gone.
+"""
+from functools import partial
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from core.lru import LRUCache
+from core.metrics import register_cache
+from core.utils import canonical_json, claim_row, sha256_hexdigest
+from .labelindex import index_label_set
+from .models import LabelSet
+
+_ids_by_digest = register_cache("label_set_ids", LRUCache(settings.LABELSET_CACHE_SIZE))
+_labels_by_id = register_cache("label_set_labels", LRUCache(settings.LABELSET_CACHE_SIZE))
+
+
+def labels_digest(labels: Dict[str, Any], labels_json: Optional[str] = None) -> str:
+    return sha256_hexdigest(labels_json if labels_json is not None else canonical_json(labels or {}))
+
+
+def intern_labels(labels: Dict[str, Any], labels_json: Optional[str] = None) -> int:
+    """Return the id of the LabelSet holding ``labels``, creating it on first sight."""
+    digest = labels_digest(labels, labels_json)
+    label_set_id = _ids_by_digest.get(digest)
+    if label_set_id is not None and not claim_row(LabelSet, label_set_id):
+        label_set_id = None
+    if label_set_id is None:
+        label_set, created = LabelSet.objects.get_or_create(hash=digest, defaults={"labels": labels or {}})
+        label_set_id = label_set.id
+        if created:
+            index_label_set(label_set_id, label_set.labels)
+        transaction.on_commit(partial(_remember, digest, label_set_id, label_set.labels))
+    return label_set_id
+
+
+def _remember(digest: str, label_set_id: int, labels: Dict[str, Any]) -> None:
+    _ids_by_digest.put(digest, label_set_id)
+    _labels_by_id.put(label_set_id, labels)
+
+
+def reset() -> None:
+    """Forget cached ids and labels, e.g. after rows were garbage-collected by another process."""
+    _ids_by_digest.clear()
+    _labels_by_id.clear()
+
+
+def labels_for(label_set_id: Optional[int]) -> Dict[str, Any]:
+    """Labels of one set (a private copy), loading it on a cache miss."""
+    if label_set_id is None:
+        return {}
+    labels = _labels_by_id.get(label_set_id)
+    if labels is None:
+        labels = LabelSet.objects.values_list("labels", flat=True).get(pk=label_set_id)
+        _labels_by_id.put(label_set_id, labels)
+    return dict(labels)
+
+
+def warm(label_set_ids: Iterable[Optional[int]]) -> None:
+    """Load every uncached id in one query, so rendering many events is not N+1."""
+    missing = {i for i in label_set_ids if i is not None and _labels_by_id.get(i) is None}
+    if missing:
+        for label_set_id, labels in LabelSet.objects.filter(pk__in=missing).values_list("id", "labels"):
+            _labels_by_id.put(label_set_id, labels)
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from alerts import partitioning
+
+
+class Command(BaseCommand):
+    help = "Create monthly alert_event partitions ahead of time and move rows out of the DEFAULT partition"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=settings.EVENT_PARTITION_MONTHS_AHEAD,
+                            help="Create partitions through this many months after the current one")
+
+    def handle(self, *args, **options):
+        if not partitioning.is_partitioned(connection):
+            self.stdout.write("alert_event is not partitioned (PostgreSQL only); nothing to do")
+            return
+        created = partitioning.ensure_partitions(timezone.now(), options["months_ahead"])
+        self.stdout.write(f"Created partitions: {', '.join(created) or '-'}")
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from alerts.cardinality import CardinalityAnalyzer, iter_source_label_sets
+from alerts.models import AlertGroup
+
+
+class Command(BaseCommand):
+    help = "Estimate per-label-key cardinality and which keys inflate fingerprint/group counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", help="Only analyze events from this source")
+        parser.add_argument("--since", help="ISO datetime; only events created at or after it")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Label sets loaded per query")
+        parser.add_argument("--precision", type=int, default=12,
+                            help="HyperLogLog precision (4-16); error is about 1.04/sqrt(2**p)")
+        parser.add_argument("--top", type=int, default=20, help="Number of label keys to report")
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError("--since must be an ISO datetime")
+        try:
+            analyzer = CardinalityAnalyzer(options["precision"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        started = time.monotonic()
+        for source, labels in iter_source_label_sets(options["chunk_size"], options["source"], since):
+            analyzer.add(source, labels)
+            if analyzer.pairs % 100000 == 0:
+                self.stdout.write(f"  scanned {analyzer.pairs:,} (source, label set) pairs")
+        report = analyzer.report()
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            f"{report.pairs:,} distinct (source, label set) pairs in {elapsed:.1f}s; "
+            f"~{report.label_sets:,} distinct label sets; {AlertGroup.objects.count():,} groups"
+        )
+        self.stdout.write("\nLabel sets per source:")
+        for source, count in report.sources:
+            self.stdout.write(f"  {source:<16} ~{count:,}")
+
+        self.stdout.write("\nKeys by effect on cardinality (label sets left if the key were not fingerprinted):")
+        self.stdout.write(f"  {'key':<32} {'values':>10} {'sets w/ key':>12} {'sets w/o key':>13} {'reduction':>9}  top sources")
+        for k in report.keys[:options["top"]]:
+            reduction = 1 - k.label_sets_without_key / report.label_sets if report.label_sets else 0
+            sources = ", ".join(f"{s} ~{n:,}" for s, n in k.top_sources)
+            self.stdout.write(
+                f"  {k.key[:32]:<32} {k.distinct_values:>10,} {k.label_sets:>12,} "
+                f"{k.label_sets_without_key:>13,} {reduction:>9.0%}  {sources}"
+            )
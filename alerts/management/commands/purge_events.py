@@ -0,0 +1,71 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from alerts import partitioning, retention
+from alerts.models import AlertEvent, AlertRollup, RollupGranularity
+
+
+class Command(BaseCommand):
+    help = "Apply event retention: drop expired partitions, then purge leftovers and old rollups in bounded batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.EVENT_RETENTION_DAYS,
+                            help="Keep events created within this many days")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows deleted per transaction")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be purged")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - timedelta(days=options["days"])
+        batch_size = options["batch_size"]
+        self.stdout.write(f"Retention cutoff: {cutoff.isoformat()}")
+        rollup_cutoffs = [
+            (RollupGranularity.MINUTE, now - timedelta(days=settings.ROLLUP_MINUTE_RETENTION_DAYS)),
+            (RollupGranularity.HOUR, now - timedelta(days=settings.ROLLUP_HOUR_RETENTION_DAYS)),
+        ]
+
+        partitioned = partitioning.is_partitioned(connection)
+        if options["dry_run"]:
+            if partitioned:
+                expired = [name for name, _, upper in partitioning.list_partitions() if upper <= cutoff.date()]
+                self.stdout.write(f"Would drop partitions: {', '.join(expired) or '-'}")
+            count = AlertEvent.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"Would purge {count:,} events, then the raw payloads and label sets they leave unused")
+            for granularity, rollup_cutoff in rollup_cutoffs:
+                count = AlertRollup.objects.filter(granularity=granularity, bucket__lt=rollup_cutoff).count()
+                self.stdout.write(f"Would purge {count:,} {granularity} rollups")
+            return
+
+        if partitioned:
+            created = partitioning.ensure_partitions(now, settings.EVENT_PARTITION_MONTHS_AHEAD)
+            if created:
+                self.stdout.write(f"Created partitions: {', '.join(created)}")
+            for name in retention.drop_expired_partitions(cutoff):
+                self.stdout.write(f"Dropped partition {name}")
+
+        self._drain("events", retention.purge_events(cutoff, batch_size), options["sleep"])
+        self._drain("empty groups", retention.purge_empty_groups(cutoff, batch_size), options["sleep"])
+        self._drain("raw payloads", retention.purge_orphans(retention.orphaned_payloads(), batch_size), options["sleep"])
+        self._drain("label sets", retention.purge_orphans(retention.orphaned_label_sets(), batch_size), options["sleep"])
+        for granularity, rollup_cutoff in rollup_cutoffs:
+            self._drain(f"{granularity} rollups", retention.purge_rollups(granularity, rollup_cutoff, batch_size),
+                        options["sleep"])
+        self.stdout.write(self.style.SUCCESS("Retention applied"))
+
+    def _drain(self, label, batches, sleep):
+        started = time.monotonic()
+        total = 0
+        for n in batches:
+            total += n
+            elapsed = time.monotonic() - started
+            rate = total / elapsed if elapsed > 0 else 0
+            self.stdout.write(f"  purged {total:,} {label} ({rate:,.0f}/s)")
+            if sleep:
+                time.sleep(sleep)
+        self.stdout.write(f"Purged {total:,} {label}")
@@ -0,0 +1,81 @@
+import math
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncHour, TruncMinute
+from django.utils.dateparse import parse_datetime
+
+from alerts.models import AlertEvent, AlertRollup, RollupGranularity
+from alerts.rollups import DIMENSIONS, truncate
+
+TRUNC = {
+    RollupGranularity.MINUTE: TruncMinute,
+    RollupGranularity.HOUR: TruncHour,
+}
+
+
+class Command(BaseCommand):
+    help = "Rebuild alert rollup tables from alert_event, one day at a time"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="ISO datetime; defaults to the oldest event")
+        parser.add_argument("--until", help="ISO datetime; defaults to the newest event")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rollup rows per insert")
+
+    def handle(self, *args, **options):
+        bounds = AlertEvent.objects.aggregate(first=Min("created_at"), last=Max("created_at"))
+        if bounds["first"] is None:
+            self.stdout.write("No events; nothing to rebuild")
+            return
+        since = self._parse(options["since"]) or bounds["first"]
+        until = self._parse(options["until"]) or bounds["last"] + timedelta(hours=1)
+        # Whole hours only, so no bucket is rebuilt from a partial range.
+        since = truncate(since.astimezone(dt_timezone.utc), RollupGranularity.HOUR)
+        until = truncate(until.astimezone(dt_timezone.utc), RollupGranularity.HOUR)
+        if until <= since:
+            raise CommandError("--until must be after --since")
+
+        day = since
+        total_days = math.ceil((until - since) / timedelta(days=1))
+        done = 0
+        while day < until:
+            end = min(day + timedelta(days=1), until)
+            rows = self._rebuild_window(day, end, options["batch_size"])
+            done += 1
+            self.stdout.write(f"[{done}/{total_days}] {day:%Y-%m-%d %H:%M} .. {end:%Y-%m-%d %H:%M}: {rows} rollup rows")
+            day = end
+        self.stdout.write(self.style.SUCCESS("Rollups rebuilt"))
+
+    def _parse(self, value):
+        if not value:
+            return None
+        dt = parse_datetime(value)
+        if dt is None:
+            raise CommandError(f"Invalid datetime: {value}")
+        return dt
+
+    @transaction.atomic
+    def _rebuild_window(self, start, end, batch_size: int) -> int:
+        AlertRollup.objects.filter(bucket__gte=start, bucket__lt=end).delete()
+        written = 0
+        for granularity, trunc in TRUNC.items():
+            aggregated = (
+                AlertEvent.objects.filter(created_at__gte=start, created_at__lt=end)
+                .annotate(bucket=trunc("created_at", tzinfo=dt_timezone.utc))
+                .values("bucket", *DIMENSIONS)
+                .annotate(count=Count("id"))
+                .order_by()
+            )
+            batch = []
+            for row in aggregated.iterator(chunk_size=batch_size):
+                batch.append(AlertRollup(granularity=granularity, **row))
+                if len(batch) >= batch_size:
+                    AlertRollup.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                AlertRollup.objects.bulk_create(batch)
+                written += len(batch)
+        return written
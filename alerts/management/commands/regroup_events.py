@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from alerts.regroup import refresh_group_summaries, regroup_events
+
+
+class Command(BaseCommand):
+    help = "Recompute event fingerprints under the current FINGERPRINT_POLICIES and regroup events in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", help="Only regroup events from this source")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Events scanned per transaction")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many events would move")
+
+    def handle(self, *args, **options):
+        touched = set()
+        started = time.monotonic()
+        scanned = moved = 0
+        batches = regroup_events(options["batch_size"], touched, source=options["source"], dry_run=options["dry_run"])
+        for n, m in batches:
+            scanned += n
+            moved += m
+            elapsed = time.monotonic() - started
+            rate = scanned / elapsed if elapsed > 0 else 0
+            self.stdout.write(f"  scanned {scanned:,} events, {moved:,} regrouped ({rate:,.0f}/s)")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        verb = "Would regroup" if options["dry_run"] else "Regrouped"
+        self.stdout.write(f"{verb} {moved:,} of {scanned:,} events")
+        if options["dry_run"]:
+            return
+        refreshed, deleted = refresh_group_summaries(touched)
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed:,} groups, deleted {deleted:,} empty groups"))
@@ -0,0 +1,45 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from alerts import retention
+
+
+class Command(BaseCommand):
+    help = "Resolve active groups that have had no event for longer than their source's TTL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ttl", help='JSON TTLs in seconds per source, e.g. \'{"grafana": 86400, "*": 604800}\' '
+                                          "(default: STALE_GROUP_TTL_SECONDS)")
+        parser.add_argument("--batch-size", type=int, default=500, help="Groups resolved per transaction")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches")
+        parser.add_argument("--interval", type=float, default=0.0,
+                            help="Keep running, sweeping every this many seconds (default: sweep once)")
+
+    def handle(self, *args, **options):
+        ttls = settings.STALE_GROUP_TTL_SECONDS
+        if options["ttl"]:
+            try:
+                ttls = json.loads(options["ttl"])
+            except ValueError:
+                raise CommandError("--ttl must be a JSON object")
+        if not isinstance(ttls, dict) or not all(isinstance(v, (int, float)) for v in ttls.values()):
+            raise CommandError("TTLs must map source names to seconds")
+        self.stdout.write(f"Stale group TTLs: {', '.join(f'{k}={v:g}s' for k, v in ttls.items()) or '-'}")
+        while True:
+            self._sweep(ttls, options["batch_size"], options["sleep"])
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def _sweep(self, ttls, batch_size, sleep):
+        started = time.monotonic()
+        total = 0
+        for n in retention.sweep_stale_groups(ttls, batch_size, timezone.now()):
+            total += n
+            if sleep:
+                time.sleep(sleep)
+        self.stdout.write(f"Resolved {total:,} stale groups in {time.monotonic() - started:.2f}s")
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertgroup',
+            name='last_title',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='latest_event_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='max_severity',
+            field=models.CharField(choices=[('critical', 'Critical'), ('high', 'High'), ('warning', 'Warning'), ('info', 'Info'), ('ok', 'OK')], default='ok', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='sources',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddIndex(
+            model_name='alertgroup',
+            index=models.Index(fields=['last_seen', 'id'], name='alert_group_last_se_eb7f76_idx'),
+        ),
+    ]
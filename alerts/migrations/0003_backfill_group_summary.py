@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+SEVERITY_RANK = {"ok": 0, "info": 1, "warning": 2, "high": 3, "critical": 4}
+
+
+def backfill(apps, schema_editor):
+    AlertGroup = apps.get_model("alerts", "AlertGroup")
+    AlertEvent = apps.get_model("alerts", "AlertEvent")
+
+    latest = AlertEvent.objects.filter(group=OuterRef("pk")).order_by("-id")
+    AlertGroup.objects.update(
+        latest_event_id=Subquery(latest.values("id")[:1]),
+        last_title=Subquery(latest.values("title")[:1]),
+    )
+
+    # Distinct (group, severity) and (group, source) pairs are few compared to events.
+    max_severity = {}
+    for group_id, severity in AlertEvent.objects.values_list("group_id", "severity").distinct().iterator():
+        current = max_severity.get(group_id)
+        if current is None or SEVERITY_RANK.get(severity, 0) > SEVERITY_RANK.get(current, 0):
+            max_severity[group_id] = severity
+    sources = {}
+    for group_id, source in AlertEvent.objects.values_list("group_id", "source").distinct().iterator():
+        sources.setdefault(group_id, []).append(source)
+
+    batch = []
+    for group in AlertGroup.objects.only("id").iterator(chunk_size=2000):
+        group.max_severity = max_severity.get(group.id, "ok")
+        group.sources = sorted(sources.get(group.id, []))
+        batch.append(group)
+        if len(batch) >= 2000:
+            AlertGroup.objects.bulk_update(batch, ["max_severity", "sources"])
+            batch = []
+    if batch:
+        AlertGroup.objects.bulk_update(batch, ["max_severity", "sources"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0002_group_summary"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
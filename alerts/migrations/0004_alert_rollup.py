@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0003_backfill_group_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour')], max_length=8)),
+                ('bucket', models.DateTimeField()),
+                ('source', models.CharField(max_length=32)),
+                ('severity', models.CharField(max_length=16)),
+                ('status', models.CharField(max_length=16)),
+                ('service', models.CharField(blank=True, default='', max_length=128)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'alert_rollup',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='alertrollup',
+            constraint=models.UniqueConstraint(fields=('granularity', 'bucket', 'source', 'severity', 'status', 'service'), name='alert_rollup_key'),
+        ),
+    ]
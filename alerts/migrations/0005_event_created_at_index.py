@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0004_alert_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alertevent',
+            index=models.Index(fields=['created_at'], name='alert_event_created_c7db93_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+"""
+Convert alert_event into a table range-partitioned by month on created_at.
+
+PostgreSQL only; other backends keep the plain table. The primary key becomes
+(id, created_at) because a partitioned table's unique keys must include the
+partition column, so no other table may declare a foreign key to alert_event.
+"""
+from django.db import migrations
+from django.utils import timezone
+
+from alerts import partitioning
+
+OLD_TABLE = "alert_event_unpartitioned"
+MONTHS_AHEAD = 2
+
+
+def partition_alert_event(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor != "postgresql" or partitioning.is_partitioned(conn):
+        return
+    now = timezone.now()
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = 'alert_event' AND schemaname = current_schema()"
+        )
+        indexes = [(name, sql) for name, sql in cursor.fetchall() if name != "alert_event_pkey"]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = 'alert_event'::regclass AND contype IN ('f', 'c')"
+        )
+        constraints = cursor.fetchall()
+        cursor.execute("SELECT min(created_at), max(created_at) FROM alert_event")
+        first, last = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE alert_event RENAME TO {OLD_TABLE}")
+        cursor.execute(
+            f"CREATE TABLE alert_event (LIKE {OLD_TABLE} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"
+        )
+        month = partitioning.month_start(first or now)
+        until = partitioning.add_months(partitioning.month_start(max(last or now, now)), MONTHS_AHEAD)
+        while month <= until:
+            cursor.execute(partitioning.create_partition_sql(month))
+            month = partitioning.add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {partitioning.DEFAULT_PARTITION} PARTITION OF alert_event DEFAULT")
+
+        cursor.execute(f"INSERT INTO alert_event SELECT * FROM {OLD_TABLE}")
+        cursor.execute(f"DROP TABLE {OLD_TABLE} CASCADE")
+
+        # The identity sequence went away with the old table; use a plain one.
+        cursor.execute("CREATE SEQUENCE alert_event_id_seq OWNED BY alert_event.id")
+        cursor.execute(
+            "SELECT setval('alert_event_id_seq', COALESCE((SELECT max(id) FROM alert_event), 0) + 1, false)"
+        )
+        cursor.execute("ALTER TABLE alert_event ALTER COLUMN id SET DEFAULT nextval('alert_event_id_seq')")
+        cursor.execute("ALTER TABLE alert_event ADD CONSTRAINT alert_event_pkey PRIMARY KEY (id, created_at)")
+        for _, sql in indexes:
+            cursor.execute(sql)
+        for name, definition in constraints:
+            cursor.execute(f"ALTER TABLE alert_event ADD CONSTRAINT {name} {definition}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0005_event_created_at_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_alert_event, migrations.RunPython.noop),
+    ]
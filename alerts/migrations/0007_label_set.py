@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0006_partition_alert_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LabelSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=64, unique=True)),
+                ('labels', models.JSONField(default=dict)),
+            ],
+            options={
+                'db_table': 'alert_label_set',
+            },
+        ),
+        migrations.AddField(
+            model_name='alertevent',
+            name='label_set',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='alerts.labelset'),
+        ),
+    ]
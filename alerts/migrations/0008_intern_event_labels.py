@@ -0,0 +1,54 @@
+import hashlib
+import json
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def _digest(labels):
+    # Same as core.utils.canonical_json + sha256_hexdigest, frozen for this migration.
+    payload = json.dumps(labels or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def intern_labels(apps, schema_editor):
+    AlertEvent = apps.get_model("alerts", "AlertEvent")
+    LabelSet = apps.get_model("alerts", "LabelSet")
+
+    ids_by_digest = dict(LabelSet.objects.values_list("hash", "id"))
+    last_id = 0
+    while True:
+        rows = list(
+            AlertEvent.objects.filter(id__gt=last_id, label_set__isnull=True)
+            .order_by("id")
+            .values_list("id", "labels")[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        events = []
+        for event_id, labels in rows:
+            digest = _digest(labels)
+            if digest not in ids_by_digest:
+                ids_by_digest[digest] = LabelSet.objects.create(hash=digest, labels=labels or {}).id
+            events.append(AlertEvent(id=event_id, label_set_id=ids_by_digest[digest]))
+        AlertEvent.objects.bulk_update(events, ["label_set"])
+        last_id = rows[-1][0]
+
+
+def restore_labels(apps, schema_editor):
+    AlertEvent = apps.get_model("alerts", "AlertEvent")
+    LabelSet = apps.get_model("alerts", "LabelSet")
+    for label_set in LabelSet.objects.iterator():
+        AlertEvent.objects.filter(label_set=label_set).update(labels=label_set.labels)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0007_label_set"),
+    ]
+
+    operations = [
+        migrations.RunPython(intern_labels, restore_labels),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:04
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0008_intern_event_labels'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='alertevent',
+            name='labels',
+        ),
+    ]
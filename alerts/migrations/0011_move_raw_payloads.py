@@ -0,0 +1,57 @@
+import hashlib
+import json
+import zlib
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def _encode(payload):
+    # Same as alerts.payloads.store_raw, frozen for this migration.
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest(), encoded
+
+
+def move_raw(apps, schema_editor):
+    AlertEvent = apps.get_model("alerts", "AlertEvent")
+    RawPayload = apps.get_model("alerts", "RawPayload")
+
+    last_id = 0
+    while True:
+        events = list(
+            AlertEvent.objects.filter(id__gt=last_id, annotations__has_key="raw")
+            .order_by("id")
+            .only("id", "annotations")[:BATCH_SIZE]
+        )
+        if not events:
+            break
+        for event in events:
+            raw = event.annotations.pop("raw")
+            if raw:
+                digest, encoded = _encode(raw)
+                payload, _ = RawPayload.objects.get_or_create(
+                    hash=digest, defaults={"data": zlib.compress(encoded, 6), "size": len(encoded)}
+                )
+                event.raw_payload_id = payload.id
+        AlertEvent.objects.bulk_update(events, ["annotations", "raw_payload"])
+        last_id = events[-1].id
+
+
+def restore_raw(apps, schema_editor):
+    AlertEvent = apps.get_model("alerts", "AlertEvent")
+    for event in AlertEvent.objects.filter(raw_payload__isnull=False).select_related("raw_payload").iterator():
+        event.annotations = {**event.annotations, "raw": json.loads(zlib.decompress(bytes(event.raw_payload.data)))}
+        event.raw_payload = None
+        event.save(update_fields=["annotations", "raw_payload"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0010_raw_payload"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_raw, restore_raw),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0011_move_raw_payloads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LabelSetEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=128)),
+                ('value', models.CharField(max_length=255)),
+                ('label_set', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='alerts.labelset')),
+            ],
+            options={
+                'db_table': 'alert_label_entry',
+                'indexes': [models.Index(fields=['key', 'value', 'label_set'], name='alert_label_key_225ecf_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def backfill(apps, schema_editor):
+    LabelSet = apps.get_model("alerts", "LabelSet")
+    LabelSetEntry = apps.get_model("alerts", "LabelSetEntry")
+
+    last_id = 0
+    while True:
+        batch = list(LabelSet.objects.filter(id__gt=last_id).order_by("id")[:BATCH_SIZE])
+        if not batch:
+            break
+        entries = []
+        for label_set in batch:
+            for key, value in (label_set.labels or {}).items():
+                value = value if isinstance(value, str) else str(value)
+                entries.append(LabelSetEntry(label_set_id=label_set.id, key=key[:128], value=value[:255]))
+        LabelSetEntry.objects.bulk_create(entries)
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0012_label_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
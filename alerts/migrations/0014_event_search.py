@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from alerts import search
+
+
+def install(apps, schema_editor):
+    if search.install(schema_editor.connection):
+        search.rebuild(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0013_backfill_label_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0014_event_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Incident',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(choices=[('firing', 'Firing'), ('resolved', 'Resolved'), ('acked', 'Acknowledged')], default='firing', max_length=16)),
+                ('max_severity', models.CharField(choices=[('critical', 'Critical'), ('high', 'High'), ('warning', 'Warning'), ('info', 'Info'), ('ok', 'OK')], default='ok', max_length=16)),
+                ('group_count', models.PositiveIntegerField(default=0)),
+                ('first_seen', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_seen', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'alert_incident',
+                'indexes': [models.Index(fields=['last_seen', 'id'], name='alert_incid_last_se_2b3023_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='incident',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='groups', to='alerts.incident'),
+        ),
+    ]
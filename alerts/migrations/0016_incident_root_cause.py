@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0015_incident'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='incident',
+            name='root_cause',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0016_incident_root_cause'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertevent',
+            name='cluster_key',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='alertevent',
+            index=models.Index(fields=['cluster_key', 'created_at'], name='alert_event_cluster_8fc087_idx'),
+        ),
+    ]
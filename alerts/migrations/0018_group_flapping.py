@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0017_event_cluster_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertgroup',
+            name='flapping',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0018_group_flapping'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alertgroup',
+            index=models.Index(fields=['status', 'last_seen'], name='alert_group_status_987205_idx'),
+        ),
+    ]
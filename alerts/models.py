@@ -1,3 +1,5 @@
+from typing import Any, Dict, Optional
+
 from django.db import models
 from django.utils import timezone
 from core.utils import compute_fingerprint
@@ -17,6 +19,40 @@ class Severity(models.TextChoices):
     OK = "ok", "OK"
 
 
+# Ordering used to keep AlertGroup.max_severity; unknown values rank lowest.
+SEVERITY_RANK = {
+    Severity.OK: 0,
+    Severity.INFO: 1,
+    Severity.WARNING: 2,
+    Severity.HIGH: 3,
+    Severity.CRITICAL: 4,
+}
+
+
+class Incident(models.Model):
+    """
+    Groups that fired together, correlated by alerts.incidents. Summary fields
+    are recomputed from member groups whenever membership or a member's status
+    changes; root_cause is the top candidate from algorithms.rca at that time.
+    """
+    title = models.CharField(max_length=255, blank=True, default="")
+    status = models.CharField(max_length=16, choices=AlertStatus.choices, default=AlertStatus.FIRING)
+    max_severity = models.CharField(max_length=16, choices=Severity.choices, default=Severity.OK)
+    group_count = models.PositiveIntegerField(default=0)
+    first_seen = models.DateTimeField(default=timezone.now)
+    last_seen = models.DateTimeField(default=timezone.now)
+    root_cause = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        db_table = "alert_incident"
+        indexes = [
+            models.Index(fields=["last_seen", "id"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Incident<{self.id}> {self.status} x{self.group_count}"
+
+
 class AlertGroup(models.Model):
     fingerprint = models.CharField(max_length=128, unique=True, db_index=True)
     status = models.CharField(max_length=16, choices=AlertStatus.choices, default=AlertStatus.FIRING)
@@ -24,13 +60,75 @@ class AlertGroup(models.Model):
     first_seen = models.DateTimeField(default=timezone.now)
     last_seen = models.DateTimeField(default=timezone.now)
 
+    # Denormalized summary, maintained by alerts.services at ingest time so the
+    # group API never has to scan events.
+    latest_event_id = models.BigIntegerField(null=True, blank=True)
+    max_severity = models.CharField(max_length=16, choices=Severity.choices, default=Severity.OK)
+    last_title = models.CharField(max_length=255, blank=True, default="")
+    sources = models.JSONField(default=list, blank=True)
+    incident = models.ForeignKey(Incident, on_delete=models.SET_NULL, related_name="groups", null=True, blank=True)
+    # Set by alerts.flapping while the group oscillates; rule actions are suppressed meanwhile.
+    flapping = models.BooleanField(default=False)
+
     class Meta:
         db_table = "alert_group"
+        indexes = [
+            models.Index(fields=["last_seen", "id"]),
+            # Stale active groups, oldest first (alerts.retention.resolve_stale_groups)
+            models.Index(fields=["status", "last_seen"]),
+        ]
 
     def __str__(self) -> str:
         return f"Group<{self.fingerprint[:8]}> {self.status} x{self.count}"
 
 
+class LabelSet(models.Model):
+    """
+    A distinct label dict, stored once and shared by every event carrying it.
+    ``hash`` is the SHA-256 of ``core.utils.canonical_json(labels)``.
+    """
+
+    hash = models.CharField(max_length=64, unique=True)
+    labels = models.JSONField(default=dict)
+
+    class Meta:
+        db_table = "alert_label_set"
+
+    def __str__(self) -> str:
+        return f"LabelSet<{self.hash[:8]}>"
+
+
+class LabelSetEntry(models.Model):
+    """Inverted index posting: one (key, value) pair of a LabelSet."""
+
+    label_set = models.ForeignKey(LabelSet, on_delete=models.CASCADE, related_name="entries")
+    key = models.CharField(max_length=128)
+    value = models.CharField(max_length=255)
+
+    class Meta:
+        db_table = "alert_label_entry"
+        indexes = [
+            models.Index(fields=["key", "value", "label_set"]),
+        ]
+
+
+class RawPayload(models.Model):
+    """
+    A source's original webhook body, zlib-compressed and deduplicated by the
+    SHA-256 of its canonical JSON. Loaded only when an event's details are shown.
+    """
+
+    hash = models.CharField(max_length=64, unique=True)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(default=0, help_text="Uncompressed size in bytes")
+
+    class Meta:
+        db_table = "alert_raw_payload"
+
+    def __str__(self) -> str:
+        return f"RawPayload<{self.hash[:8]}> {self.size}B"
+
+
 class AlertEvent(models.Model):
     source = models.CharField(max_length=32, db_index=True)
     external_id = models.CharField(max_length=128, blank=True, null=True)
@@ -40,10 +138,14 @@ class AlertEvent(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, default="")
 
-    labels = models.JSONField(default=dict, blank=True)
+    # Labels are interned; ``labels`` below reads and writes them transparently.
+    label_set = models.ForeignKey(LabelSet, on_delete=models.PROTECT, related_name="+", null=True, blank=True)
     annotations = models.JSONField(default=dict, blank=True)
+    raw_payload = models.ForeignKey(RawPayload, on_delete=models.PROTECT, related_name="+", null=True, blank=True)
 
     fingerprint = models.CharField(max_length=128, db_index=True)
+    # Near-duplicate cluster (alerts.clustering); spans fingerprints that differ only in ids or numbers.
+    cluster_key = models.CharField(max_length=32, blank=True, default="")
 
     starts_at = models.DateTimeField(null=True, blank=True)
     ends_at = models.DateTimeField(null=True, blank=True)
@@ -64,12 +166,67 @@ class AlertEvent(models.Model):
         indexes = [
             models.Index(fields=["fingerprint", "status"]),
             models.Index(fields=["source", "created_at"]),
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["cluster_key", "created_at"]),
         ]
 
+    @property
+    def labels(self) -> Dict[str, Any]:
+        labels = getattr(self, "_labels", None)
+        if labels is None:
+            from .labelsets import labels_for
+            labels = self._labels = labels_for(self.label_set_id)
+        return labels
+
+    @labels.setter
+    def labels(self, value: Optional[Dict[str, Any]]) -> None:
+        self._labels = dict(value or {})
+        self._labels_dirty = True
+
+    @property
+    def raw(self) -> Optional[Dict[str, Any]]:
+        """The original source payload, decompressed on first access."""
+        if self.raw_payload_id is None:
+            return None
+        from .payloads import load_raw
+        return load_raw(self.raw_payload_id)
+
     def save(self, *args, **kwargs):
+        if getattr(self, "_labels_dirty", False) or self.label_set_id is None:
+            from .labelsets import intern_labels
+            self.label_set_id = intern_labels(self.labels)
+            self._labels_dirty = False
         if not self.fingerprint:
             self.fingerprint = compute_fingerprint(
                 source=self.source, labels=self.labels or {}, metric=self.metric or None, title=self.title
             )
         super().save(*args, **kwargs)
 
+
+class RollupGranularity(models.TextChoices):
+    MINUTE = "minute", "Minute"
+    HOUR = "hour", "Hour"
+
+
+class AlertRollup(models.Model):
+    """Event counts per time bucket and dimension tuple, kept current by ingest."""
+
+    granularity = models.CharField(max_length=8, choices=RollupGranularity.choices)
+    bucket = models.DateTimeField()
+    source = models.CharField(max_length=32)
+    severity = models.CharField(max_length=16)
+    status = models.CharField(max_length=16)
+    service = models.CharField(max_length=128, blank=True, default="")
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = "alert_rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["granularity", "bucket", "source", "severity", "status", "service"],
+                name="alert_rollup_key",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Rollup<{self.granularity} {self.bucket:%Y-%m-%d %H:%M}> x{self.count}"
@@ -0,0 +1,127 @@
+"""
+Monthly range partitions of alert_event on PostgreSQL.
+
+The table is converted once by migration 0006; afterwards these helpers keep
+partitions created ahead of time and drop whole months past retention, which
+is a catalog operation instead of a row-by-row DELETE. On other databases the
+table stays a plain table and retention falls back to chunked deletes.
+
+Partitions are created by the ``ensure_partitions`` command (daily from cron),
+after every ``migrate`` and by ``purge_events``. Rows written while their
+month had no partition land in the DEFAULT partition; creating that month
+moves them into the new partition.
+"""
+import re
+from datetime import date, datetime
+from typing import List, Tuple
+
+from django.db import connection, transaction
+
+TABLE = "alert_event"
+DEFAULT_PARTITION = f"{TABLE}_default"
+_PARTITION_RE = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned(conn=connection) -> bool:
+    if conn.vendor != "postgresql":
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def create_partition_sql(month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+def list_partitions(conn=connection) -> List[Tuple[str, date, date]]:
+    """(name, first day, first day of next month) for each monthly partition, oldest first."""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    result = []
+    for name in names:
+        m = _PARTITION_RE.match(name)
+        if m:
+            lower = date(int(m.group(1)), int(m.group(2)), 1)
+            result.append((name, lower, add_months(lower, 1)))
+    return sorted(result, key=lambda p: p[1])
+
+
+def default_months(conn=connection) -> List[date]:
+    """Months that have rows in the DEFAULT partition, i.e. no partition of their own yet."""
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT DISTINCT date_trunc('month', created_at) FROM {DEFAULT_PARTITION}")
+        return sorted(month_start(row[0]) for row in cursor.fetchall())
+
+
+def move_default_rows_sql(month: date) -> List[str]:
+    """Statements that turn ``month``'s rows in the DEFAULT partition into that month's partition."""
+    name, lower, upper = partition_name(month), f"{month:%Y-%m-%d}", f"{add_months(month, 1):%Y-%m-%d}"
+    return [
+        f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= '{lower}' AND created_at < '{upper}' "
+        f"RETURNING *) INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')",
+    ]
+
+
+def ensure_partitions(now: datetime, months_ahead: int, conn=connection) -> List[str]:
+    """
+    Create partitions from the current month through ``months_ahead`` months
+    later, plus one for every month with rows in the DEFAULT partition, whose
+    rows move over. Each month is created in its own transaction.
+    """
+    created = []
+    existing = {name for name, _, _ in list_partitions(conn)}
+    stranded = set(default_months(conn))
+    current = month_start(now)
+    wanted = stranded | {add_months(current, offset) for offset in range(months_ahead + 1)}
+    for month in sorted(wanted):
+        if partition_name(month) in existing:
+            continue
+        statements = move_default_rows_sql(month) if month in stranded else [create_partition_sql(month)]
+        with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+        created.append(partition_name(month))
+    return created
+
+
+def drop_partitions_before(cutoff: datetime, conn=connection) -> List[str]:
+    """Detach and drop every monthly partition whose range ends at or before ``cutoff``."""
+    dropped = []
+    cutoff_day = cutoff.date()
+    for name, _, upper in list_partitions(conn):
+        if upper > cutoff_day:
+            break
+        with conn.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+            cursor.execute(f"DROP TABLE {name}")
+        dropped.append(name)
+    return dropped
@@ -0,0 +1,56 @@
+"""
+Out-of-line storage for raw webhook payloads.
+
+Mapped fields stay on AlertEvent; the full body goes to RawPayload,
+compressed and shared between events whose payloads are byte-identical.
+As with label sets, a digest's id is cached only once the inserting
+transaction commits; rows no event references any more are removed by
+purge_events (see alerts.retention), so a cached id is claimed before use.
+"""
+import hashlib
+import json
+import zlib
+from functools import partial
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from core.lru import LRUCache
+from core.metrics import register_cache
+from core.utils import canonical_json, claim_row
+from .models import RawPayload
+
+_ids_by_digest = register_cache("raw_payload_ids", LRUCache(settings.RAW_PAYLOAD_CACHE_SIZE))
+
+
+def store_raw(payload: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Return the RawPayload id for ``payload``, inserting it if unseen."""
+    if not payload:
+        return None
+    encoded = canonical_json(payload).encode("utf-8")
+    digest = hashlib.sha256(encoded).hexdigest()
+    raw_id = _ids_by_digest.get(digest)
+    if raw_id is not None and not claim_row(RawPayload, raw_id):
+        raw_id = None
+    if raw_id is None:
+        raw, _ = RawPayload.objects.get_or_create(
+            hash=digest,
+            defaults={"data": zlib.compress(encoded, 6), "size": len(encoded)},
+        )
+        raw_id = raw.id
+        transaction.on_commit(partial(_ids_by_digest.put, digest, raw_id))
+    return raw_id
+
+
+def reset() -> None:
+    """Forget cached ids, e.g. after rows were garbage-collected by another process."""
+    _ids_by_digest.clear()
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+
+
+def load_raw(raw_id: int) -> Dict[str, Any]:
+    return decode(RawPayload.objects.values_list("data", flat=True).get(pk=raw_id))
@@ -0,0 +1,111 @@
+"""
+Re-fingerprint stored events under the current fingerprint policies and move
+them to the matching groups, in batches, then rebuild the affected groups'
+summaries.
+"""
+from collections import defaultdict
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Max, Min
+
+from core.utils import compute_fingerprint
+from . import groupcache, labelsets
+from .models import SEVERITY_RANK, AlertEvent, AlertGroup, AlertStatus
+
+
+def regroup_events(batch_size: int, touched: Set[int], source: Optional[str] = None,
+                   dry_run: bool = False) -> Iterator[Tuple[int, int]]:
+    """
+    Walk events by id, yielding ``(scanned, moved)`` per batch. Every batch is
+    its own transaction; ids of groups that gained or lost events are added
+    to ``touched`` for refresh_group_summaries.
+    """
+    queryset = AlertEvent.objects.order_by("id").only(
+        "id", "source", "title", "metric", "label_set_id", "fingerprint", "group_id", "created_at"
+    )
+    if source:
+        queryset = queryset.filter(source=source)
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        last_id = batch[-1].id
+        labelsets.warm(e.label_set_id for e in batch)
+        moves = defaultdict(list)
+        for event in batch:
+            fingerprint = compute_fingerprint(
+                source=event.source, labels=event.labels, metric=event.metric or None, title=event.title
+            )
+            if fingerprint != event.fingerprint:
+                moves[fingerprint].append(event)
+        if moves and not dry_run:
+            with transaction.atomic():
+                for fingerprint, events in moves.items():
+                    group, _ = AlertGroup.objects.get_or_create(
+                        fingerprint=fingerprint,
+                        defaults={"count": 0, "first_seen": min(e.created_at for e in events)},
+                    )
+                    touched.add(group.id)
+                    touched.update(e.group_id for e in events if e.group_id)
+                    AlertEvent.objects.filter(id__in=[e.id for e in events]).update(
+                        fingerprint=fingerprint, group_id=group.id
+                    )
+        yield len(batch), sum(len(events) for events in moves.values())
+
+
+def refresh_group_summaries(group_ids: Iterable[int], batch_size: int = 500) -> Tuple[int, int]:
+    """
+    Recompute the denormalized summary of each group from its events and
+    delete groups left without events. Returns ``(refreshed, deleted)``.
+    """
+    ids = sorted(set(group_ids))
+    refreshed = deleted = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        with transaction.atomic():
+            groups = {g.id: g for g in AlertGroup.objects.select_for_update().filter(id__in=chunk)}
+            events = AlertEvent.objects.filter(group_id__in=chunk)
+            stats = {
+                row["group_id"]: row
+                for row in events.values("group_id").annotate(
+                    n=Count("id"), first=Min("created_at"), last=Max("created_at"), latest=Max("id")
+                )
+            }
+            severities, sources = defaultdict(set), defaultdict(set)
+            for group_id, severity, source in events.values_list("group_id", "severity", "source").distinct():
+                severities[group_id].add(severity)
+                sources[group_id].add(source)
+            latest = {
+                e.group_id: e
+                for e in AlertEvent.objects.filter(id__in=[s["latest"] for s in stats.values()])
+                .only("id", "group_id", "status", "title")
+            }
+
+            empty = [group_id for group_id in groups if group_id not in stats]
+            if empty:
+                AlertGroup.objects.filter(id__in=empty).delete()
+                deleted += len(empty)
+            changed: List[AlertGroup] = []
+            for group_id, row in stats.items():
+                group, event = groups[group_id], latest[group_id]
+                group.count = row["n"]
+                group.first_seen = row["first"]
+                group.last_seen = row["last"]
+                group.latest_event_id = event.id
+                group.last_title = (event.title or "")[:255]
+                group.max_severity = max(severities[group_id], key=lambda s: SEVERITY_RANK.get(s, 0))
+                group.sources = sorted(sources[group_id])
+                if event.status == AlertStatus.RESOLVED:
+                    group.status = AlertStatus.RESOLVED
+                elif group.status != AlertStatus.ACKED:
+                    group.status = AlertStatus.FIRING
+                changed.append(group)
+            AlertGroup.objects.bulk_update(changed, [
+                "count", "first_seen", "last_seen", "latest_event_id", "last_title", "max_severity", "sources", "status",
+            ])
+            refreshed += len(changed)
+    # Fingerprints now point at different groups.
+    groupcache.clear()
+    return refreshed, deleted
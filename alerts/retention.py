@@ -0,0 +1,150 @@
+import json
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Mapping, Optional
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Exists, OuterRef, ProtectedError, Q, QuerySet
+
+from core.utils import utcnow
+from workflows.models import Ticket
+from . import groupcache, partitioning, services
+from .models import AlertEvent, AlertGroup, AlertRollup, AlertStatus, LabelSet, RawPayload
+
+
+def drop_expired_partitions(cutoff: datetime) -> List[str]:
+    """Drop whole monthly partitions older than ``cutoff`` (PostgreSQL only)."""
+    if not partitioning.is_partitioned(connection):
+        return []
+    with transaction.atomic():
+        return partitioning.drop_partitions_before(cutoff)
+
+
+def purge_events(cutoff: datetime, batch_size: int) -> Iterator[int]:
+    """
+    Delete events created before ``cutoff`` in batches of at most
+    ``batch_size`` rows, one short transaction per batch, yielding each batch
+    size. Oldest rows go first, so an interrupted purge is simply resumed.
+    """
+    expired = AlertEvent.objects.filter(created_at__lt=cutoff).order_by("created_at")
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            AlertEvent.objects.filter(id__in=ids).delete()
+        yield len(ids)
+
+
+def purge_rollups(granularity: str, cutoff: datetime, batch_size: int) -> Iterator[int]:
+    """Delete ``granularity`` rollup buckets that start before ``cutoff``, in batches."""
+    expired = AlertRollup.objects.filter(granularity=granularity, bucket__lt=cutoff).order_by("bucket")
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            AlertRollup.objects.filter(id__in=ids).delete()
+        yield len(ids)
+
+
+def purge_empty_groups(cutoff: datetime, batch_size: int) -> Iterator[int]:
+    """
+    Delete resolved groups idle since before ``cutoff`` that no longer have
+    any events, in batches. Groups still firing or acknowledged, or with an
+    open ticket, are kept whatever their age: deleting one would cascade to
+    its tickets and escalation timer.
+    """
+    idle = (
+        AlertGroup.objects.filter(status=AlertStatus.RESOLVED, last_seen__lt=cutoff)
+        .filter(~Exists(AlertEvent.objects.filter(group=OuterRef("pk"))))
+        .filter(~Exists(Ticket.objects.filter(group=OuterRef("pk")).exclude(status=AlertStatus.RESOLVED)))
+        .order_by("last_seen")
+    )
+    while True:
+        rows = list(idle.values_list("id", "fingerprint")[:batch_size])
+        if not rows:
+            return
+        with transaction.atomic():
+            AlertGroup.objects.filter(id__in=[group_id for group_id, _ in rows]).delete()
+        groupcache.forget(fingerprint for _, fingerprint in rows)
+        yield len(rows)
+
+
+def orphaned_payloads() -> QuerySet:
+    return RawPayload.objects.filter(~Exists(AlertEvent.objects.filter(raw_payload=OuterRef("pk"))))
+
+
+def orphaned_label_sets() -> QuerySet:
+    return LabelSet.objects.filter(~Exists(AlertEvent.objects.filter(label_set=OuterRef("pk"))))
+
+
+def purge_orphans(orphaned: QuerySet, batch_size: int) -> Iterator[int]:
+    """
+    Delete raw payloads or label sets (see orphaned_*) that no event refers
+    to any more, in id order and batches of at most ``batch_size``, yielding
+    each batch size. A batch that an ingest reused in the meantime is left
+    for the next run; ingest processes claim a cached id before using it and
+    look it up again if it was deleted (see core.utils.claim_row).
+    """
+    label = orphaned.model._meta.label
+    after = 0
+    while True:
+        ids = list(orphaned.filter(id__gt=after).order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return
+        after = ids[-1]
+        try:
+            with transaction.atomic():
+                _, deleted = orphaned.filter(id__in=ids).delete()
+        except (IntegrityError, ProtectedError):
+            continue
+        yield deleted.get(label, 0)
+
+
+def stale_ttl(sources: Iterable[str], ttls: Mapping[str, float]) -> Optional[float]:
+    """Seconds after which a group of ``sources`` goes stale: the longest of theirs, None if one never does."""
+    values = [ttls.get(source, ttls.get("*")) for source in sources] or [ttls.get("*")]
+    if any(not value or value <= 0 for value in values):
+        return None
+    return max(values)
+
+
+def _has_source(source: str) -> Q:
+    if connection.features.supports_json_field_contains:
+        return Q(sources__contains=[source])
+    # The quoted name within the stored JSON text: a superset, which stale_ttl narrows.
+    return Q(sources__icontains=json.dumps(source))
+
+
+def sweep_stale_groups(ttls: Mapping[str, float], batch_size: int, now: Optional[datetime] = None) -> Iterator[int]:
+    """
+    Resolve active groups whose last event is older than their TTL (see
+    stale_ttl), yielding how many each batch resolved. Each source with a TTL
+    gets its own pass, filtered by source and by its cutoff in SQL, and a
+    ``"*"`` TTL a final pass over every source; without one, groups of other
+    sources are never read. Candidates come oldest first from the (status,
+    last_seen) index, a keyset page of at most ``batch_size`` at a time, and
+    each page is resolved in one short transaction.
+    """
+    now = now or utcnow()
+    passes = [(_has_source(source), ttl) for source, ttl in ttls.items() if source != "*" and ttl and ttl > 0]
+    if ttls.get("*") and ttls["*"] > 0:
+        passes.append((Q(), ttls["*"]))
+    for where, ttl in passes:
+        cutoff = now - timedelta(seconds=ttl)
+        for status in (AlertStatus.FIRING, AlertStatus.ACKED):
+            candidates = AlertGroup.objects.filter(where, status=status, last_seen__lt=cutoff).order_by("last_seen", "id")
+            page = candidates
+            while True:
+                rows = list(page.values_list("id", "last_seen", "sources")[:batch_size])
+                if not rows:
+                    break
+                expired = {}
+                for group_id, last_seen, sources in rows:
+                    group_ttl = stale_ttl(sources, ttls)
+                    if group_ttl is not None and last_seen < now - timedelta(seconds=group_ttl):
+                        expired[group_id] = now - timedelta(seconds=group_ttl)
+                if expired:
+                    yield services.resolve_stale_groups(expired)
+                last_id, last_seen = rows[-1][:2]
+                page = candidates.filter(Q(last_seen__gt=last_seen) | Q(last_seen=last_seen, id__gt=last_id))
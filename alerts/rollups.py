@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from .models import AlertRollup, RollupGranularity
+
+# Dimensions a rollup row is keyed on, besides its time bucket.
+DIMENSIONS = ("source", "severity", "status", "service")
+
+_WIDTH = {RollupGranularity.MINUTE: timedelta(minutes=1), RollupGranularity.HOUR: timedelta(hours=1)}
+
+
+def truncate(at: datetime, granularity: str) -> datetime:
+    if granularity == RollupGranularity.MINUTE:
+        return at.replace(second=0, microsecond=0)
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil(at: datetime, granularity: str) -> datetime:
+    start = truncate(at, granularity)
+    return start if start == at else start + _WIDTH[granularity]
+
+
+def record(*, source: str, severity: str, status: str, service: str, at: datetime) -> None:
+    """
+    Count one event into its minute and hour buckets. Ingest calls this once
+    the event has committed, so each bucket's row lock is held only for its
+    own UPDATE, not for the rest of the ingest transaction.
+    """
+    for granularity in (RollupGranularity.MINUTE, RollupGranularity.HOUR):
+        key = {
+            "granularity": granularity,
+            "bucket": truncate(at, granularity),
+            "source": source,
+            "severity": severity,
+            "status": status,
+            "service": (service or "")[:128],
+        }
+        if AlertRollup.objects.filter(**key).update(count=F("count") + 1):
+            continue
+        try:
+            with transaction.atomic():
+                AlertRollup.objects.create(count=1, **key)
+        except IntegrityError:
+            # Another writer created the bucket first.
+            AlertRollup.objects.filter(**key).update(count=F("count") + 1)
+
+
+def _spans(granularity: str, since: Optional[datetime],
+           until: Optional[datetime]) -> List[Tuple[str, Optional[datetime], Optional[datetime]]]:
+    """(granularity, from, to) bucket ranges covering [since, until): whole hours plus minutes at either end."""
+    if granularity == RollupGranularity.MINUTE:
+        return [(granularity, since and _ceil(since, granularity), until)]
+    start = since and _ceil(since, granularity)
+    end = until and truncate(until, granularity)
+    if start is not None and end is not None and start > end:  # within a single hour
+        return [(RollupGranularity.MINUTE, _ceil(since, RollupGranularity.MINUTE), until)]
+    spans = [(granularity, start, end)]
+    if since is not None and start > since:
+        spans.append((RollupGranularity.MINUTE, _ceil(since, RollupGranularity.MINUTE), start))
+    if until is not None and end < until:
+        spans.append((RollupGranularity.MINUTE, end, until))
+    return spans
+
+
+def query(*, granularity: str = RollupGranularity.HOUR, group_by: Sequence[str] = (),
+          since: Optional[datetime] = None, until: Optional[datetime] = None,
+          filters: Optional[Dict[str, Iterable[str]]] = None) -> List[Dict[str, Any]]:
+    """
+    Sum rollup counts over [since, until), grouped by any of DIMENSIONS and/or
+    ``bucket``. A bucket counts when it starts within the range. For hourly
+    sums, partial hours at either end are made up from their minute buckets,
+    so "the last hour" does not reach back to the top of the previous hour;
+    their counts are reported under the hour's bucket. Cost is proportional
+    to the number of buckets in range.
+    """
+    queryset = AlertRollup.objects.order_by()
+    for dim, values in (filters or {}).items():
+        values = list(values)
+        if values:
+            queryset = queryset.filter(**{f"{dim}__in": values})
+    parts = []
+    for span_granularity, start, end in _spans(granularity, since, until):
+        part = queryset.filter(granularity=span_granularity)
+        if start is not None:
+            part = part.filter(bucket__gte=start)
+        if end is not None:
+            part = part.filter(bucket__lt=end)
+        parts.append(part)
+    if not group_by:
+        return [{"count": sum(part.aggregate(count=Sum("count"))["count"] or 0 for part in parts)}]
+    merged: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for part in parts:
+        for row in part.values(*group_by).annotate(count=Sum("count")):
+            if "bucket" in row:
+                row["bucket"] = truncate(row["bucket"], granularity)
+            key = tuple(row[g] for g in group_by)
+            if key in merged:
+                merged[key]["count"] += row["count"]
+            else:
+                merged[key] = row
+    return [merged[key] for key in sorted(merged)]
+
+
+def totals_by(dimension: str, since: Optional[datetime] = None) -> List[Tuple[str, int]]:
+    """(value, count) pairs for one dimension, largest first."""
+    rows = query(group_by=[dimension], since=since)
+    return sorted(((r[dimension], r["count"]) for r in rows), key=lambda item: -item[1])
@@ -0,0 +1,172 @@
+"""
+Full-text search over alert event text fields.
+
+SQLite keeps an FTS5 external-content table (``alert_event_fts``) in sync with
+alert_event through triggers; PostgreSQL uses a GIN expression index over the
+same ``to_tsvector`` the queries build, so it works on the partitioned table
+without an extra column. Any other backend, or SQLite built without FTS5,
+falls back to ``icontains``.
+
+Queries are reduced to words; every word must match, as a prefix.
+"""
+import re
+from typing import Dict, List
+
+from django.db import OperationalError, connections
+from django.db.models import BooleanField, FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+SEARCH_FIELDS = ("title", "description", "resource", "service", "metric", "fingerprint")
+FTS_TABLE = "alert_event_fts"
+PG_INDEX = "alert_event_search_idx"
+MAX_TERMS = 8
+
+# Database alias -> "sqlite", "postgresql" or "" (icontains fallback).
+_backends: Dict[str, str] = {}
+
+
+def _document(table: str = "") -> str:
+    prefix = f'"{table}".' if table else ""
+    columns = " || ' ' || ".join(f"coalesce({prefix}{field}, '')" for field in SEARCH_FIELDS)
+    return f"to_tsvector('simple', {columns})"
+
+
+def _sqlite_install_sql() -> List[str]:
+    columns = ", ".join(SEARCH_FIELDS)
+    new = ", ".join(f"new.{f}" for f in SEARCH_FIELDS)
+    old = ", ".join(f"old.{f}" for f in SEARCH_FIELDS)
+    delete_old = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old});"
+    insert_new = f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, content='alert_event', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON alert_event BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON alert_event BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON alert_event "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def install(connection) -> bool:
+    """
+    Create the index and its sync triggers if missing. Idempotent. Returns
+    whether the backend has a full-text index.
+    """
+    _backends.pop(connection.alias, None)
+    if connection.vendor == "sqlite":
+        try:
+            with connection.cursor() as cursor:
+                for sql in _sqlite_install_sql():
+                    cursor.execute(sql)
+        except OperationalError:  # SQLite compiled without FTS5
+            return False
+        return True
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON alert_event USING gin (({_document()}))")
+        return True
+    return False
+
+
+def restore_triggers(connection) -> None:
+    """
+    SQLite drops a table's triggers when Django's schema editor rebuilds it,
+    so this runs after every migrate to put them back if the index exists.
+    """
+    _backends[connection.alias] = _detect(connection)
+    if _backends[connection.alias] == "sqlite":
+        install(connection)
+
+
+def rebuild(connection) -> None:
+    """Re-index every existing event (SQLite; PostgreSQL indexes on creation)."""
+    if connection.vendor == "sqlite" and _has_fts(connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall(connection) -> None:
+    _backends.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        elif connection.vendor == "postgresql":
+            cursor.execute(f"DROP INDEX IF EXISTS {PG_INDEX}")
+
+
+def _has_fts(connection) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def terms(query: str) -> List[str]:
+    return re.findall(r"\w+", (query or "").lower())[:MAX_TERMS]
+
+
+def _detect(connection) -> str:
+    if connection.vendor == "sqlite":
+        return "sqlite" if _has_fts(connection) else ""
+    return "postgresql" if connection.vendor == "postgresql" else ""
+
+
+def _backend(queryset: QuerySet) -> str:
+    # Detected once per database alias (after migrate, or on first use), not per query.
+    backend = _backends.get(queryset.db)
+    if backend is None:
+        backend = _backends[queryset.db] = _detect(connections[queryset.db])
+    return backend
+
+
+def _fts5_query(words: List[str]) -> str:
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _tsquery(words: List[str]) -> str:
+    return " & ".join(f"'{w}':*" for w in words)
+
+
+def search_events(queryset: QuerySet, query: str) -> QuerySet:
+    """Events whose text fields contain every word of ``query``."""
+    words = terms(query)
+    if not words:
+        return queryset.none()
+    backend = _backend(queryset)
+    if backend == "sqlite":
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [_fts5_query(words)])
+        )
+    if backend == "postgresql":
+        return queryset.filter(RawSQL(
+            f"{_document('alert_event')} @@ to_tsquery('simple', %s)", [_tsquery(words)], output_field=BooleanField()
+        ))
+    for word in words:
+        matches = Q()
+        for field in SEARCH_FIELDS:
+            matches |= Q(**{f"{field}__icontains": word})
+        queryset = queryset.filter(matches)
+    return queryset
+
+
+def ranked(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Annotate ``search_rank`` (higher is better) and order by it, newest first
+    among ties. Expects a queryset already narrowed by ``search_events``.
+    """
+    words = terms(query)
+    backend = _backend(queryset) if words else ""
+    if backend == "sqlite":
+        rank = RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = \"alert_event\".\"id\")",
+            [_fts5_query(words)], output_field=FloatField(),
+        )
+    elif backend == "postgresql":
+        rank = RawSQL(
+            f"ts_rank({_document('alert_event')}, to_tsquery('simple', %s))", [_tsquery(words)],
+            output_field=FloatField(),
+        )
+    else:
+        return queryset
+    return queryset.annotate(search_rank=rank).order_by("-search_rank", "-created_at")
@@ -1,9 +1,64 @@
 from rest_framework import serializers
-from .models import AlertEvent
+
+from algorithms import rca
+from .models import AlertEvent, AlertGroup, Incident
 
 
 class AlertEventSerializer(serializers.ModelSerializer):
+    # Interned through LabelSet; read and written via the AlertEvent.labels property.
+    labels = serializers.DictField(required=False)
+
     class Meta:
         model = AlertEvent
-        fields = '__all__'
+        exclude = ('label_set',)
+
+
+class AlertEventDetailSerializer(AlertEventSerializer):
+    # Decompressed from RawPayload only on the detail endpoint.
+    raw = serializers.JSONField(read_only=True)
+
+
+class AlertEventSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AlertEvent
+        fields = ('id', 'source', 'status', 'severity', 'title', 'resource', 'service', 'created_at')
+
+
+class AlertGroupSerializer(serializers.ModelSerializer):
+    events = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AlertGroup
+        fields = (
+            'id', 'fingerprint', 'status', 'count', 'first_seen', 'last_seen',
+            'latest_event_id', 'max_severity', 'last_title', 'sources', 'incident', 'flapping', 'events',
+        )
+
+    def get_events(self, obj: AlertGroup):
+        # Populated by the view from one batched query; absent unless requested.
+        latest = self.context.get('latest_events')
+        if latest is None:
+            return None
+        return AlertEventSummarySerializer(latest.get(obj.id, []), many=True).data
+
+
+class IncidentSerializer(serializers.ModelSerializer):
+    groups = serializers.SerializerMethodField()
+    root_causes = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Incident
+        fields = ('id', 'title', 'status', 'max_severity', 'group_count', 'first_seen', 'last_seen',
+                  'root_cause', 'root_causes', 'groups')
+
+    def get_groups(self, obj: Incident):
+        # Only the detail view embeds member groups.
+        if not self.context.get('embed_groups'):
+            return None
+        return AlertGroupSerializer(obj.groups.order_by('first_seen', 'id'), many=True).data
 
+    def get_root_causes(self, obj: Incident):
+        # Ranked candidates live in the correlating process; elsewhere the list is empty.
+        if not self.context.get('embed_groups'):
+            return None
+        return rca.engine.ranking(obj.id)
@@ -1,12 +1,21 @@
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional
 
 from django.db import transaction
+from django.db.models import Case, F, Q, Value, When, Window
+from django.db.models.functions import RowNumber
 from django.utils.dateparse import parse_datetime
 
-from core.utils import compute_fingerprint, utcnow
-from .models import AlertEvent, AlertGroup, AlertStatus
+from algorithms import heavy_hitters
+from core.utils import canonical_json, compute_fingerprint, utcnow
+from rules import inhibitions
+from workflows import escalation
+from . import clustering, flapping, groupcache, incidents, labelsets, payloads, rollups, storm
+from .broadcast import FILTER_KEYS, broadcaster
+from .models import SEVERITY_RANK, AlertEvent, AlertGroup, AlertStatus
+from .serializers import AlertEventSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +29,7 @@ logger = logging.getLogger(__name__)
 #   description: str,
 #   labels: dict,
 #   annotations: dict,
+#   raw: dict|None (original webhook body, stored out of line),
 #   starts_at: str|datetime|None,
 #   ends_at: str|datetime|None,
 #   resource, service, metric, namespace, generator_url
@@ -35,42 +45,254 @@ def _parse_dt(value: Any) -> Optional[datetime]:
     return dt or utcnow()
 
 
+def _next_status(current: str, event_status: str) -> str:
+    # Group status follows the latest event; an ack survives repeated firing.
+    if event_status == AlertStatus.RESOLVED:
+        return AlertStatus.RESOLVED
+    if current == AlertStatus.RESOLVED:
+        return AlertStatus.FIRING
+    return current
+
+
+def _update_group_summary(group: AlertGroup, event: AlertEvent, created: bool) -> None:
+    """Fold a freshly stored event into its (row-locked) group's denormalized summary."""
+    if created:
+        group.count = 1
+        group.max_severity = event.severity
+    else:
+        group.last_seen = utcnow()
+        group.count = group.count + 1
+        if SEVERITY_RANK.get(event.severity, 0) > SEVERITY_RANK.get(group.max_severity, 0):
+            group.max_severity = event.severity
+        group.status = _next_status(group.status, event.status)
+    group.latest_event_id = event.id
+    group.last_title = (event.title or "")[:255]
+    if event.source not in group.sources:
+        group.sources = sorted([*group.sources, event.source])
+    group.save(update_fields=[
+        "last_seen", "count", "status", "max_severity", "latest_event_id", "last_title", "sources",
+    ])
+    groupcache.remember(group.id, group.fingerprint, group.status, group.sources)
+
+
+def _bump_cached_group(cached: groupcache.CachedGroup, fingerprint: str, event: AlertEvent) -> Optional[AlertGroup]:
+    """
+    Fold ``event`` into a cached group with a single UPDATE by primary key, the
+    same summary _update_group_summary maintains but computed by the database.
+    The UPDATE only matches while the group still has the cached status, so
+    the status transition it reports is the one actually written. Returns a
+    partial group (id, fingerprint, status), or None if the group no longer
+    exists or its status was changed elsewhere (an ack, a stale-group sweep);
+    the caller then takes the locking path, which reads the real status.
+    """
+    new_status = _next_status(cached.status, event.status)
+    rank = SEVERITY_RANK.get(event.severity, 0)
+    if rank:
+        # Unranked values count as 0, as in _update_group_summary.
+        at_least = [severity for severity, r in SEVERITY_RANK.items() if r >= rank]
+        max_severity = Case(When(~Q(max_severity__in=at_least), then=Value(event.severity)), default=F("max_severity"))
+    else:
+        max_severity = F("max_severity")
+    summary = dict(
+        last_seen=utcnow(),
+        count=F("count") + 1,
+        status=new_status,
+        max_severity=max_severity,
+        last_title=(event.title or "")[:255],
+    )
+    if event.id is not None:  # storm mode folds in events that are never stored
+        summary["latest_event_id"] = event.id
+    updated = AlertGroup.objects.filter(pk=cached.id, status=cached.status).update(**summary)
+    if not updated:
+        groupcache.forget([fingerprint])
+        return None
+    groupcache.remember(cached.id, fingerprint, new_status, cached.sources)
+    return AlertGroup(id=cached.id, fingerprint=fingerprint, status=new_status)
+
+
+def _after_commit(event: AlertEvent, group: AlertGroup, previous_status: Optional[str]) -> None:
+    """Feed a committed event to its consumers: top-K tracker, inhibitions, incidents, escalation and live tail."""
+    _count_top_k(event)
+    inhibitions.track(event, group.status)
+    incidents.correlate(event, group, status_changed=previous_status is not None and previous_status != group.status)
+    if previous_status != group.status:
+        if group.status == AlertStatus.FIRING:
+            escalation.start(event, group)
+        elif previous_status is not None:
+            escalation.stop(group.id)
+    if not broadcaster.has_subscribers:
+        return
+    attrs = {key: getattr(event, key) for key in FILTER_KEYS}
+    broadcaster.publish("event", AlertEventSerializer(event).data, attrs)
+    if previous_status != group.status:
+        group.refresh_from_db(fields=["count", "max_severity", "last_title"])
+        broadcaster.publish("group", _group_message(group, previous_status), attrs)
+
+
+def _count_top_k(event: AlertEvent) -> None:
+    heavy_hitters.tracker.observe({
+        "fingerprint": event.fingerprint,
+        "service": event.service,
+        "resource": event.resource,
+    })
+
+
+def _group_message(group: AlertGroup, previous_status: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": group.id,
+        "fingerprint": group.fingerprint,
+        "status": group.status,
+        "previous_status": previous_status,
+        "count": group.count,
+        "max_severity": group.max_severity,
+        "last_title": group.last_title,
+    }
+
+
+@transaction.atomic
+def acknowledge_group(group_id: int, assignee: str = "") -> Optional[AlertGroup]:
+    """
+    Acknowledge a firing group, which cancels its pending escalation. An
+    ``assignee`` takes over the group's open tickets nobody owns yet.
+    Returns None if the group does not exist.
+    """
+    group = AlertGroup.objects.select_for_update().filter(pk=group_id).first()
+    if group is None:
+        return None
+    if group.status == AlertStatus.FIRING:
+        group.status = AlertStatus.ACKED
+        group.save(update_fields=["status"])
+        groupcache.remember(group.id, group.fingerprint, group.status, group.sources)
+        escalation.stop(group.id)
+        transaction.on_commit(partial(_acknowledged, group))
+    if assignee:
+        group.tickets.exclude(status=AlertStatus.RESOLVED).filter(assignee="").update(assignee=assignee)
+    return group
+
+
+def _acknowledged(group: AlertGroup) -> None:
+    if group.incident_id is not None:
+        incidents.refresh_incident(group.incident_id)
+    if broadcaster.has_subscribers:
+        broadcaster.publish("group", _group_message(group, AlertStatus.FIRING), {})
+
+
+@transaction.atomic
+def resolve_stale_groups(cutoffs: Dict[int, datetime]) -> int:
+    """
+    Resolve the given active groups that have had no event since their cutoff
+    (group id -> datetime). Each gets a synthetic resolved event copied from
+    its latest one, so rules, inhibitions, incidents, escalation and caches
+    see an ordinary resolution; the groups are updated in one statement and
+    stop flapping.
+    Groups locked by ingest or seen again meanwhile are left alone. Returns
+    how many were resolved.
+    """
+    active = (AlertStatus.FIRING, AlertStatus.ACKED)
+    locked = AlertGroup.objects.select_for_update(skip_locked=True).filter(id__in=list(cutoffs), status__in=active)
+    groups = [group for group in locked if group.last_seen < cutoffs[group.id]]
+    if not groups:
+        return 0
+    latest = AlertEvent.objects.defer("description", "annotations", "generator_url").in_bulk(
+        [group.latest_event_id for group in groups if group.latest_event_id]
+    )
+    now = utcnow()
+    resolved = []
+    for group in groups:
+        template = latest.get(group.latest_event_id)
+        event = AlertEvent.objects.create(
+            group=group,
+            source=template.source if template else (group.sources or ["custom"])[0],
+            status=AlertStatus.RESOLVED,
+            severity=template.severity if template else group.max_severity,
+            title=group.last_title,
+            description=f"Resolved automatically: no event since {group.last_seen.isoformat()}",
+            labels=template.labels if template else {},
+            annotations={"auto_resolved": "stale"},
+            fingerprint=group.fingerprint,
+            cluster_key=template.cluster_key if template else "",
+            ends_at=now,
+            resource=template.resource if template else "",
+            service=template.service if template else "",
+            metric=template.metric if template else "",
+            namespace=template.namespace if template else "",
+        )
+        resolved.append((group, event))
+    AlertGroup.objects.filter(id__in=[group.id for group, _ in resolved]).update(
+        status=AlertStatus.RESOLVED,
+        count=F("count") + 1,
+        flapping=False,
+        latest_event_id=Case(*[When(id=group.id, then=Value(event.id)) for group, event in resolved]),
+    )
+    for group, event in resolved:
+        previous_status = group.status
+        group.status = AlertStatus.RESOLVED
+        group.latest_event_id = event.id
+        groupcache.remember(group.id, group.fingerprint, group.status, group.sources)
+        flapping.detector.forget(group.id)
+        _record_and_notify(event, group, previous_status)
+    return len(resolved)
+
+
+def latest_events_for_groups(group_ids: List[int], limit: int) -> Dict[int, List[AlertEvent]]:
+    """
+    Fetch the newest ``limit`` events of each group in a single query, using a
+    ROW_NUMBER() window partitioned by group.
+    """
+    if not group_ids or limit <= 0:
+        return {}
+    rows = (
+        AlertEvent.objects.filter(group_id__in=group_ids)
+        .annotate(rank=Window(RowNumber(), partition_by=[F("group_id")], order_by=F("id").desc()))
+        .filter(rank__lte=limit)
+        .order_by("group_id", "-id")
+    )
+    result: Dict[int, List[AlertEvent]] = {}
+    for event in rows:
+        result.setdefault(event.group_id, []).append(event)
+    return result
+
+
 @transaction.atomic
-def ingest_standard_alert(data: Dict[str, Any]) -> AlertEvent:
+def ingest_standard_alert(data: Dict[str, Any]) -> Optional[AlertEvent]:
+    """
+    Store one normalized alert and fold it into its group. In storm mode an
+    event that is neither severe, a status change nor sampled only updates
+    its (cached) group and the rollups, and None is returned.
+    """
+    source = data.get("source", "custom")
+    status = data.get("status", AlertStatus.FIRING)
     labels = data.get("labels") or {}
+    labels_json = canonical_json(labels)
     fingerprint = compute_fingerprint(
-        source=data.get("source", "custom"),
+        source=source,
         labels=labels,
         metric=data.get("metric"),
         title=data.get("title"),
+        labels_json=labels_json,
     )
+    # During a storm, routine events of a known group skip the event row.
+    cached = groupcache.lookup(fingerprint)
+    storms = storm.observe(source)
+    if storms:
+        if cached is not None and source in cached.sources and not _stored_in_storm(cached, data, status):
+            if _fold_into_group(cached, fingerprint, data, source, status):
+                storm.detector.tally(storms, stored=False)
+                return None
+        storm.detector.tally(storms, stored=True)
 
-    group, created = AlertGroup.objects.select_for_update().get_or_create(
-        fingerprint=fingerprint,
-        defaults={"status": data.get("status", AlertStatus.FIRING), "count": 0},
-    )
-
-    if not created:
-        group.last_seen = utcnow()
-        group.count = group.count + 1
-        # if any event is resolved, let group reflect resolution
-        if data.get("status") == AlertStatus.RESOLVED:
-            group.status = AlertStatus.RESOLVED
-        group.save(update_fields=["last_seen", "count", "status"])
-    else:
-        group.count = 1
-        group.save(update_fields=["count"])
-
-    event = AlertEvent.objects.create(
-        source=data.get("source", "custom"),
+    event_fields = dict(
+        source=source,
         external_id=data.get("external_id"),
-        status=data.get("status", AlertStatus.FIRING),
+        status=status,
         severity=data.get("severity", "warning"),
         title=data.get("title", ""),
         description=data.get("description", ""),
-        labels=labels,
+        label_set_id=labelsets.intern_labels(labels, labels_json),
         annotations=data.get("annotations") or {},
+        raw_payload_id=payloads.store_raw(data.get("raw")),
         fingerprint=fingerprint,
+        cluster_key=clustering.assign(data.get("title", ""), labels),
         starts_at=_parse_dt(data.get("starts_at")),
         ends_at=_parse_dt(data.get("ends_at")),
         resource=data.get("resource", ""),
@@ -78,10 +300,66 @@ def ingest_standard_alert(data: Dict[str, Any]) -> AlertEvent:
         metric=data.get("metric", ""),
         namespace=data.get("namespace", ""),
         generator_url=data.get("generator_url", ""),
-        group=group,
     )
 
-    logger.info("Ingested event %s in group %s", event.id, group.fingerprint[:8])
+    # Known group: no lookup, one UPDATE by id. A new source changes the
+    # sources list, which only the locking path maintains.
+    event = None
+    if cached is not None and source in cached.sources:
+        event = AlertEvent.objects.create(group_id=cached.id, **event_fields)
+        group = _bump_cached_group(cached, fingerprint, event)
+        if group is not None:
+            _record_and_notify(event, group, cached.status)
+            return event
 
+    group, created = AlertGroup.objects.select_for_update().get_or_create(
+        fingerprint=fingerprint,
+        defaults={"status": status, "count": 0},
+    )
+    previous_status = None if created else group.status
+    if event is None:
+        event = AlertEvent.objects.create(group=group, **event_fields)
+    else:
+        # The cached group was deleted or changed under us; the FK check is deferred to commit.
+        event.group = group
+        event.save(update_fields=["group"])
+        # Its flap samples missed that change; start over from the group row.
+        flapping.detector.forget(cached.id)
+    _update_group_summary(group, event, created)
+    _record_and_notify(event, group, previous_status)
     return event
 
+
+def _stored_in_storm(cached: groupcache.CachedGroup, data: Dict[str, Any], status: str) -> bool:
+    if _next_status(cached.status, status) != cached.status:
+        return True
+    return storm.keep(data.get("severity", "warning"))
+
+
+def _fold_into_group(
+    cached: groupcache.CachedGroup, fingerprint: str, data: Dict[str, Any], source: str, status: str
+) -> bool:
+    """Count an unstored event into its group, rollups and top-K; False if the cached group is gone or stale."""
+    event = AlertEvent(source=source, status=status, severity=data.get("severity", "warning"),
+                       title=data.get("title", ""), service=data.get("service", ""),
+                       resource=data.get("resource", ""), fingerprint=fingerprint)
+    if _bump_cached_group(cached, fingerprint, event) is None:
+        return False
+    transaction.on_commit(partial(
+        rollups.record, source=event.source, severity=event.severity, status=event.status,
+        service=event.service, at=utcnow(),
+    ))
+    transaction.on_commit(partial(_count_top_k, event))
+    return True
+
+
+def _record_and_notify(event: AlertEvent, group: AlertGroup, previous_status: Optional[str]) -> None:
+    # After commit, so concurrent ingests do not queue on the shared bucket rows' locks.
+    transaction.on_commit(partial(
+        rollups.record, source=event.source, severity=event.severity, status=event.status,
+        service=event.service, at=event.created_at,
+    ))
+    transaction.on_commit(partial(_after_commit, event, group, previous_status))
+
+    logger.info("Ingested event %s in group %s", event.id, group.fingerprint[:8])
+
@@ -1,17 +1,37 @@
+from functools import partial
+
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from .models import AlertEvent
+from . import flapping, storm
+from .models import AlertEvent, AlertStatus
+from rules.batching import batcher
 from rules.engine import evaluate_rules_on_event
+from rules.inhibitions import inhibited_by
+from rules.silences import silenced_by
 from algorithms.dedupe import should_deduplicate
 
 
 @receiver(post_save, sender=AlertEvent)
 def on_event_created(sender, instance: AlertEvent, created: bool, **kwargs):
     if created:
+        # Batched rule notifications report a resolution however the event is handled below
+        if instance.status == AlertStatus.RESOLVED:
+            transaction.on_commit(partial(batcher.resolve, instance.fingerprint))
+        # Silenced events (maintenance windows etc.) never reach the rules
+        if silenced_by(instance) is not None:
+            return
+        # So are dependents of a firing source alert (e.g. CPU alerts of a host that is down)
+        if inhibited_by(instance) is not None:
+            return
+        # Flapping groups notify once when flapping starts and once when it stops
+        is_flapping, change = flapping.track(instance)
+        if is_flapping and change is None:
+            return
         # Drop noisy duplicates from rule evaluation within a short window
-        if should_deduplicate(instance):
+        if change is None and should_deduplicate(instance):
             return
-        # Evaluate rule engine synchronously for now
-        evaluate_rules_on_event(instance)
+        # Evaluate rule engine synchronously for now; storms skip the KB lookup
+        evaluate_rules_on_event(instance, flapping=change, suggest_kb=not storm.active(instance.source))
 
@@ -0,0 +1,133 @@
+"""
+Storm mode for ingest (see algorithms.storm).
+
+While the global rate or a source's rate is above its threshold, events of
+that source are degraded: severe ones and status changes are stored as
+usual, others are sampled and the rest only bump their group's counters and
+the rollups, without an event row. Rule evaluation skips the knowledge base
+lookup. Each storm logs and publishes an SSE "storm" message when it starts
+and ends, and sends one summary through STORM_NOTIFY_ACTIONS when it ends.
+Ends are reported by a daemon thread, outside any ingest transaction; it
+also polls the detector every second so storms end when traffic stops.
+State is per process.
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from actions.handlers import run_action
+from algorithms.storm import GLOBAL, Episode, StormDetector
+from .broadcast import broadcaster
+from .models import SEVERITY_RANK, AlertEvent, Severity
+
+logger = logging.getLogger(__name__)
+
+detector = StormDetector(
+    half_life=settings.STORM_HALF_LIFE_SECONDS,
+    enter=settings.STORM_ENTER_RATE,
+    exit=settings.STORM_EXIT_RATE,
+    key_enter=settings.STORM_SOURCE_ENTER_RATE,
+    key_exit=settings.STORM_SOURCE_EXIT_RATE,
+)
+_samples = itertools.count()
+_POLL_SECONDS = 1.0
+_ended_queue: "queue.SimpleQueue[List[Episode]]" = queue.SimpleQueue()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def observe(source: str) -> List[Episode]:
+    """Count an incoming event; returns the storm episodes it falls in (empty outside storms)."""
+    episodes, ended = detector.observe(source, time.monotonic(), time.time())
+    for episode in episodes:
+        if episode.events == 1:
+            _started(episode)
+            _start_worker()
+    if ended:
+        _ended_queue.put(ended)
+    return episodes
+
+
+def keep(severity: str) -> bool:
+    """Whether a storm-time event is stored in full: severe ones always, others one in STORM_SAMPLE_EVERY."""
+    if SEVERITY_RANK.get(severity, 0) >= SEVERITY_RANK.get(settings.STORM_KEEP_SEVERITY, 0):
+        return True
+    return next(_samples) % settings.STORM_SAMPLE_EVERY == 0
+
+
+def active(source: str) -> bool:
+    return detector.active(source)
+
+
+def stats() -> Dict[str, Any]:
+    return detector.snapshot(time.monotonic())
+
+
+def _start_worker() -> None:
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name="storm-notifier", daemon=True)
+            _worker.start()
+
+
+def _run() -> None:
+    while True:
+        try:
+            ended = _ended_queue.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            ended = detector.poll(time.monotonic(), time.time())
+        if not ended:
+            continue
+        try:
+            close_old_connections()
+            _ended(ended)
+        except Exception:
+            logger.exception("Reporting the end of an alert storm failed")
+
+
+def _scope(episode: Episode) -> str:
+    return "all sources" if episode.key == GLOBAL else f"source {episode.key}"
+
+
+def _started(episode: Episode) -> None:
+    logger.warning("Alert storm started (%s) at %.0f events/s", _scope(episode), episode.peak_rate)
+    if broadcaster.has_subscribers:
+        broadcaster.publish("storm", {"state": "started", **episode.as_dict()}, {})
+
+
+def _ended(episodes: List[Episode]) -> None:
+    """Log and publish each ended episode; a global storm and its sources' share one notification."""
+    for episode in episodes:
+        summary = episode.as_dict()
+        logger.warning(
+            "Alert storm ended (%s): %d events in %.0fs, %d stored, %d aggregated, peak %.0f events/s",
+            _scope(episode), episode.events, summary["duration"], episode.stored, episode.aggregated,
+            episode.peak_rate,
+        )
+        if broadcaster.has_subscribers:
+            broadcaster.publish("storm", {"state": "ended", **summary}, {})
+    if not settings.STORM_NOTIFY_ACTIONS:
+        return
+    main = max(episodes, key=lambda e: e.events)
+    duration = main.as_dict()["duration"]
+    notice = AlertEvent(
+        source="alert_engine",
+        severity=Severity.WARNING,
+        title=f"Alert storm over ({_scope(main)}): {main.events} events in {duration:.0f}s",
+        description="\n".join(
+            f"{_scope(e)}: peak {e.peak_rate:.0f} events/s, {e.stored} events stored, "
+            f"{e.aggregated} folded into group counters only"
+            for e in episodes
+        ),
+    )
+    for action in settings.STORM_NOTIFY_ACTIONS:
+        run_action(action, notice)
@@ -0,0 +1,72 @@
+import asyncio
+
+from django.test import SimpleTestCase, override_settings
+
+from alerts.broadcast import Broadcaster, broadcaster
+from alerts.views import _sse_messages
+
+
+def message(type_="event", severity="critical", service="api", namespace="prod"):
+    return type_, {"title": f"{type_} {severity}"}, {"severity": severity, "service": service, "namespace": namespace}
+
+
+async def drain(subscriber):
+    await asyncio.sleep(0)  # let call_soon_threadsafe deliver
+    received = []
+    while (item := await subscriber.get(timeout=0.01)) is not None:
+        received.append(item["data"]["title"])
+    return received
+
+
+class BroadcasterTests(SimpleTestCase):
+    async def test_subscribers_see_only_matching_messages(self):
+        hub = Broadcaster()
+        critical_api = hub.subscribe({"severity": ["critical"], "service": ["api"], "namespace": []})
+        groups_in_prod = hub.subscribe({"namespace": ["prod"]}, types=["group"])
+        everything = hub.subscribe({})
+        hub.publish(*message())
+        hub.publish(*message(severity="warning"))
+        hub.publish(*message(service="db"))
+        hub.publish(*message("group", namespace="staging"))
+        hub.publish(*message("group"))
+        self.assertEqual(await drain(critical_api), ["event critical", "group critical", "group critical"])
+        self.assertEqual(await drain(groups_in_prod), ["group critical"])
+        self.assertEqual(len(await drain(everything)), 5)
+
+    async def test_slow_subscriber_is_dropped(self):
+        hub = Broadcaster()
+        slow = hub.subscribe({}, maxsize=2)
+        for _ in range(3):
+            hub.publish(*message())
+        await asyncio.sleep(0)
+        self.assertTrue(slow.dropped)
+        with self.assertRaises(EOFError):
+            await slow.get(timeout=0.01)
+        hub.publish(*message())  # skipped without touching the queue
+        await asyncio.sleep(0)
+        self.assertTrue(slow.queue.empty())
+
+
+class SseMessagesTests(SimpleTestCase):
+    async def test_stream_heartbeats_delivers_and_reports_a_drop(self):
+        with override_settings(LIVE_TAIL_HEARTBEAT=0.01, LIVE_TAIL_BUFFER=2, LIVE_TAIL_MAX_SECONDS=5):
+            stream = _sse_messages({"severity": ["critical"]}, ["event"])
+            self.assertEqual(await stream.__anext__(), b"retry: 3000\n\n")
+            self.assertEqual(await stream.__anext__(), b": keepalive\n\n")
+            broadcaster.publish(*message())
+            self.assertEqual(await stream.__anext__(), b'event: event\ndata: {"title":"event critical"}\n\n')
+            for _ in range(3):
+                broadcaster.publish(*message())
+            await asyncio.sleep(0)
+            self.assertEqual(await stream.__anext__(), b"event: dropped\ndata: {}\n\n")
+            with self.assertRaises(StopAsyncIteration):
+                await stream.__anext__()
+        self.assertFalse(broadcaster.has_subscribers)
+
+    async def test_closing_the_stream_unsubscribes(self):
+        with override_settings(LIVE_TAIL_HEARTBEAT=0.01):
+            stream = _sse_messages({}, None)
+            await stream.__anext__()
+            self.assertTrue(broadcaster.has_subscribers)
+            await stream.aclose()
+        self.assertFalse(broadcaster.has_subscribers)
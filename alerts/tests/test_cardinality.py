@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase
+
+from alerts.cardinality import CardinalityAnalyzer
+
+
+class CardinalityAnalyzerTests(SimpleTestCase):
+    def test_rare_key_has_no_contribution(self):
+        analyzer = CardinalityAnalyzer(12)
+        for i in range(1000):
+            labels = {"alertname": f"alert_{i % 10}", "instance": f"host{i}:9100", "job": "node"}
+            if i == 500:
+                labels["rare"] = "x"
+            analyzer.add("prometheus", labels)
+        report = analyzer.report()
+        by_key = {k.key: k for k in report.keys}
+
+        self.assertEqual(report.keys[0].key, "instance")
+        self.assertLess(by_key["instance"].label_sets_without_key, 20)
+        self.assertLess(by_key["rare"].contribution, 30)
+        self.assertGreater(by_key["rare"].label_sets_without_key, 950)
+        self.assertEqual(by_key["rare"].label_sets, 1)
+        self.assertLess(by_key["job"].contribution, 30)
+
+    def test_key_seen_late_counts_earlier_sets(self):
+        analyzer = CardinalityAnalyzer(12)
+        for i in range(200):
+            analyzer.add("grafana", {"alertname": f"a{i}"})
+        for i in range(200):
+            analyzer.add("grafana", {"alertname": f"a{i}", "pod": f"p{i}"})
+        pod = next(k for k in analyzer.report().keys if k.key == "pod")
+        # Dropping pod folds each second-half set onto its first-half twin.
+        self.assertAlmostEqual(pod.label_sets_without_key, 200, delta=10)
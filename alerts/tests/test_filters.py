@@ -0,0 +1,26 @@
+from django.test import TestCase
+
+from alerts.filters import FilterError, filter_events
+from alerts.models import AlertEvent
+
+
+class FilterErrorTests(TestCase):
+    def assertFieldError(self, params, field):
+        with self.assertRaises(FilterError) as caught:
+            filter_events(AlertEvent.objects.all(), params)
+        self.assertEqual(caught.exception.field, field)
+
+    def test_errors_name_the_parameter_at_fault(self):
+        self.assertFieldError({"group": "abc"}, "group")
+        self.assertFieldError({"since": "2024-13-01T00:00:00"}, "since")
+        self.assertFieldError({"until": "2024-01-01T25:00:00"}, "until")
+        self.assertFieldError({"label": 'instance=~"("'}, "label")
+
+    def test_list_api_reports_the_field(self):
+        response = self.client.get("/api/v1/alerts/", {"since": "2024-13-01T00:00:00"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()), ["since"])
+
+        response = self.client.get("/api/v1/groups/", {"label": "team"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()), ["label"])
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.test import TestCase
+
+from alerts import flapping
+from alerts.models import AlertEvent, AlertGroup, AlertStatus
+
+
+class TrackTests(TestCase):
+    def setUp(self):
+        self.group = AlertGroup.objects.create(fingerprint="g", status=AlertStatus.FIRING)
+        flapping.detector.forget(self.group.id)
+        self.addCleanup(flapping.detector.forget, self.group.id)
+
+    def event(self, status):
+        return AlertEvent(group=self.group, status=status, title="t")
+
+    def test_persisted_flapping_survives_restart(self):
+        AlertGroup.objects.filter(pk=self.group.id).update(flapping=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(flapping.track(self.event(AlertStatus.FIRING)), (True, None))
+        self.assertTrue(AlertGroup.objects.get(pk=self.group.id).flapping)
+
+    def test_rolled_back_samples_do_not_count(self):
+        for _ in range(10):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                for status in (AlertStatus.FIRING, AlertStatus.RESOLVED):
+                    flapping.track(self.event(status))
+                raise RuntimeError
+        self.assertFalse(flapping.detector.is_tracked(self.group.id))
+
+    def test_committed_samples_start_flapping(self):
+        changes = []
+        for status in [AlertStatus.FIRING, AlertStatus.RESOLVED] * 10:
+            with self.captureOnCommitCallbacks(execute=True):
+                changes.append(flapping.track(self.event(status))[1])
+        self.assertEqual([c for c in changes if c], ["started"])
+        self.assertTrue(AlertGroup.objects.get(pk=self.group.id).flapping)
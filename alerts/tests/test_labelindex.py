@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from alerts import labelindex, labelsets
+from alerts.labelindex import filter_by_labels
+from alerts.models import AlertEvent
+from core.matchers import parse_matchers
+
+
+class FilterByLabelsTests(TestCase):
+    def setUp(self):
+        labelsets.reset()
+        self.addCleanup(labelsets.reset)
+        self.events = {
+            name: AlertEvent.objects.create(source="test", title=name, labels=labels)
+            for name, labels in {
+                "sre-db": {"team": "sre", "instance": "db-1"},
+                "sre-web": {"team": "sre", "instance": "web-1"},
+                "dba-db": {"team": "dba", "instance": "db-2"},
+                "no-team": {"instance": "db-3"},
+                "empty-team": {"team": "", "instance": "web-2"},
+            }.items()
+        }
+
+    def select(self, *matchers):
+        events = filter_by_labels(AlertEvent.objects.all(), parse_matchers(matchers))
+        return set(events.values_list("title", flat=True))
+
+    def test_equality(self):
+        self.assertEqual(self.select("team=sre"), {"sre-db", "sre-web"})
+        self.assertEqual(self.select("team=sre", "instance=db-1"), {"sre-db"})
+        self.assertEqual(self.select("team="), {"no-team", "empty-team"})
+
+    def test_inequality_keeps_missing_labels(self):
+        self.assertEqual(self.select("team!=sre"), {"dba-db", "no-team", "empty-team"})
+        self.assertEqual(self.select("team!="), {"sre-db", "sre-web", "dba-db"})
+
+    def test_regex_is_anchored(self):
+        self.assertEqual(self.select('instance=~"db-.*"'), {"sre-db", "dba-db", "no-team"})
+        self.assertEqual(self.select('instance=~"db"'), set())
+        self.assertEqual(self.select('team=~"sre|"'), {"sre-db", "sre-web", "no-team", "empty-team"})
+
+    def test_negated_regex(self):
+        self.assertEqual(self.select('instance!~"db-.*"'), {"sre-web", "empty-team"})
+        self.assertEqual(self.select('team!~".+"'), {"no-team", "empty-team"})
+
+    def test_long_posting_lists_are_intersected_after_short_ones(self):
+        with mock.patch.object(labelindex, "MAX_IN_CLAUSE", 2):
+            self.assertEqual(self.select('instance=~".+"', "team=sre", "instance=db-1"), {"sre-db"})
+            self.assertEqual(self.select('instance=~".+"'), {"sre-db", "sre-web", "dba-db", "no-team", "empty-team"})
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.test import TestCase
+
+from alerts import labelsets
+from alerts.models import LabelSet
+
+
+class InternLabelsTests(TestCase):
+    def setUp(self):
+        labelsets._ids_by_digest.clear()
+        labelsets._labels_by_id.clear()
+
+    def test_repeated_labels_share_one_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = labelsets.intern_labels({"job": "node", "instance": "a:9100"})
+        with self.assertNumQueries(1):  # only the claim of the cached row
+            again = labelsets.intern_labels({"instance": "a:9100", "job": "node"})
+        self.assertEqual(first, again)
+        self.assertEqual(labelsets.labels_for(first), {"job": "node", "instance": "a:9100"})
+
+    def test_rolled_back_insert_is_not_cached(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                labelsets.intern_labels({"job": "node"})
+                raise RuntimeError
+        label_set_id = labelsets.intern_labels({"job": "node"})
+        self.assertTrue(LabelSet.objects.filter(pk=label_set_id).exists())
+
+    def test_collected_set_is_looked_up_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = labelsets.intern_labels({"job": "node"})
+        LabelSet.objects.filter(pk=first).delete()  # e.g. purge_events in another process
+        again = labelsets.intern_labels({"job": "node"})
+        self.assertNotEqual(first, again)
+        self.assertTrue(LabelSet.objects.filter(pk=again).exists())
@@ -0,0 +1,80 @@
+from django.test import TestCase, override_settings
+
+from alerts import groupcache, labelsets, payloads
+from alerts.models import AlertEvent, AlertGroup, AlertStatus
+from alerts.regroup import refresh_group_summaries, regroup_events
+from alerts.services import ingest_standard_alert
+from core.fingerprint import reset_policies
+
+WITHOUT_INSTANCE = {"grafana": {"exclude_labels": ["instance"]}}
+
+
+def alert(instance, title="disk full", status=AlertStatus.FIRING):
+    return {"source": "grafana", "status": status, "title": title, "labels": {"instance": instance}}
+
+
+class RegroupTests(TestCase):
+    def setUp(self):
+        groupcache.clear()
+        labelsets.reset()
+        payloads.reset()
+        reset_policies()
+        self.addCleanup(labelsets.reset)
+        self.addCleanup(payloads.reset)
+        self.addCleanup(groupcache.clear)
+        self.addCleanup(reset_policies)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first = ingest_standard_alert(alert("h1"))
+            self.second = ingest_standard_alert(alert("h2"))
+            ingest_standard_alert(alert("h3", title="cpu high"))
+            self.cpu_resolved = ingest_standard_alert(alert("h3", title="cpu high", status=AlertStatus.RESOLVED))
+        self.old_groups = {self.first.group_id, self.second.group_id, self.cpu_resolved.group_id}
+        with override_settings(FINGERPRINT_POLICIES=WITHOUT_INSTANCE):
+            reset_policies()
+            groupcache.clear()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.existing = ingest_standard_alert(alert("h9"))
+        reset_policies()
+        AlertGroup.objects.filter(id=self.existing.group_id).update(status=AlertStatus.ACKED)
+
+    def regroup(self, dry_run=False):
+        touched = set()
+        with override_settings(FINGERPRINT_POLICIES=WITHOUT_INSTANCE):
+            reset_policies()
+            batches = list(regroup_events(2, touched, dry_run=dry_run))
+        reset_policies()
+        return batches, touched
+
+    def test_events_move_to_existing_and_new_groups(self):
+        batches, touched = self.regroup()
+        self.assertEqual(sum(m for _, m in batches), 4)
+        self.assertEqual(sum(n for n, _ in batches), 5)
+        self.assertEqual(refresh_group_summaries(touched), (2, 3))
+
+        self.assertFalse(AlertGroup.objects.filter(id__in=self.old_groups).exists())
+        existing = AlertGroup.objects.get(id=self.existing.group_id)
+        self.assertEqual(
+            set(AlertEvent.objects.filter(group=existing).values_list("id", flat=True)),
+            {self.first.id, self.second.id, self.existing.id},
+        )
+        self.assertEqual(existing.count, 3)
+        self.assertEqual(existing.first_seen, self.first.created_at)
+        self.assertEqual(existing.last_seen, self.existing.created_at)
+        self.assertEqual(existing.latest_event_id, self.existing.id)
+        self.assertEqual(existing.status, AlertStatus.ACKED)
+
+        cpu = AlertGroup.objects.get(fingerprint=AlertEvent.objects.get(id=self.cpu_resolved.id).fingerprint)
+        self.assertEqual(cpu.count, 2)
+        self.assertEqual(cpu.latest_event_id, self.cpu_resolved.id)
+        self.assertEqual(cpu.status, AlertStatus.RESOLVED)
+        self.assertEqual(cpu.last_title, "cpu high")
+
+    def test_dry_run_changes_nothing(self):
+        before = list(AlertEvent.objects.order_by("id").values_list("id", "fingerprint", "group_id"))
+        groups = AlertGroup.objects.count()
+        batches, touched = self.regroup(dry_run=True)
+        self.assertEqual(sum(m for _, m in batches), 4)
+        self.assertEqual(touched, set())
+        self.assertEqual(list(AlertEvent.objects.order_by("id").values_list("id", "fingerprint", "group_id")), before)
+        self.assertEqual(AlertGroup.objects.count(), groups)
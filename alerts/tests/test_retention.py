@@ -0,0 +1,137 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from alerts import groupcache, labelsets, partitioning, payloads, retention
+from alerts.models import AlertEvent, AlertGroup, AlertRollup, AlertStatus, LabelSet, RawPayload, RollupGranularity
+from alerts.services import ingest_standard_alert
+from core.utils import utcnow
+from workflows.models import Ticket
+
+
+def alert(i, **extra):
+    return {"source": "grafana", "title": f"disk {i}", "labels": {"instance": f"h{i}"},
+            "raw": {"instance": f"h{i}", "ts": i}, **extra}
+
+
+class OrphanPurgeTests(TestCase):
+    def setUp(self):
+        labelsets.reset()
+        payloads.reset()
+        groupcache.clear()
+
+    def test_purge_removes_only_unreferenced_payloads_and_label_sets(self):
+        for i in range(4):
+            ingest_standard_alert(alert(i))
+        AlertEvent.objects.filter(title__in=["disk 0", "disk 1"]).update(created_at=utcnow() - timedelta(days=100))
+        ingest_standard_alert(alert(1, title="disk 1 again"))  # keeps h1's label set and payload in use
+
+        list(retention.purge_events(utcnow() - timedelta(days=90), 100))
+        self.assertEqual(sum(retention.purge_orphans(retention.orphaned_payloads(), 1)), 1)
+        self.assertEqual(sum(retention.purge_orphans(retention.orphaned_label_sets(), 1)), 1)
+
+        events = AlertEvent.objects.all()
+        self.assertEqual(RawPayload.objects.count(), events.values("raw_payload").distinct().count())
+        self.assertEqual(LabelSet.objects.count(), events.values("label_set").distinct().count())
+        self.assertFalse(LabelSet.objects.filter(labels={"instance": "h0"}).exists())
+
+    def test_rolled_back_payload_is_not_cached(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                payloads.store_raw({"body": 1})
+                raise RuntimeError
+        raw_id = payloads.store_raw({"body": 1})
+        self.assertTrue(RawPayload.objects.filter(pk=raw_id).exists())
+
+
+class CollectedIdRetryTests(TransactionTestCase):
+    def test_ingest_recovers_when_a_cached_id_was_collected_elsewhere(self):
+        labelsets.reset()
+        payloads.reset()
+        groupcache.clear()
+        ingest_standard_alert(alert(1))
+        # Another process purges the only event, then collects its label set and payload.
+        AlertEvent.objects.all().delete()
+        list(retention.purge_orphans(retention.orphaned_payloads(), 100))
+        list(retention.purge_orphans(retention.orphaned_label_sets(), 100))
+
+        event = ingest_standard_alert(alert(1, title="disk 1 again"))
+        self.assertEqual(event.labels, {"instance": "h1"})
+        self.assertEqual(event.raw, {"instance": "h1", "ts": 1})
+
+
+class EmptyGroupPurgeTests(TestCase):
+    def test_only_resolved_groups_without_open_tickets_are_purged(self):
+        old = utcnow() - timedelta(days=100)
+        groups = {
+            status: AlertGroup.objects.create(fingerprint=status, status=status, last_seen=old)
+            for status in (AlertStatus.FIRING, AlertStatus.ACKED, AlertStatus.RESOLVED)
+        }
+        ticketed = AlertGroup.objects.create(fingerprint="ticketed", status=AlertStatus.RESOLVED, last_seen=old)
+        Ticket.objects.create(group=ticketed, title="follow up")
+        closed = AlertGroup.objects.create(fingerprint="closed", status=AlertStatus.RESOLVED, last_seen=old)
+        Ticket.objects.create(group=closed, title="done", status=AlertStatus.RESOLVED)
+        AlertGroup.objects.create(fingerprint="recent", status=AlertStatus.RESOLVED, last_seen=utcnow())
+
+        self.assertEqual(sum(retention.purge_empty_groups(utcnow() - timedelta(days=90), 1)), 2)
+        self.assertEqual(
+            set(AlertGroup.objects.values_list("fingerprint", flat=True)),
+            {AlertStatus.FIRING, AlertStatus.ACKED, "ticketed", "recent"},
+        )
+        self.assertNotIn(groups[AlertStatus.RESOLVED].id, AlertGroup.objects.values_list("id", flat=True))
+
+
+class StaleSweepTests(TestCase):
+    def setUp(self):
+        groupcache.clear()
+        old = utcnow() - timedelta(days=2)
+        for source in ("grafana", "prometheus"):
+            AlertGroup.objects.create(fingerprint=source, status=AlertStatus.FIRING, sources=[source], last_seen=old)
+        AlertGroup.objects.create(fingerprint="recent", status=AlertStatus.ACKED, sources=["grafana"],
+                                  last_seen=utcnow())
+
+    def sweep(self, ttls):
+        with mock.patch("alerts.retention.stale_ttl", wraps=retention.stale_ttl) as checked:
+            resolved = sum(retention.sweep_stale_groups(ttls, 10))
+        return resolved, [call.args[0] for call in checked.call_args_list]
+
+    def status(self, fingerprint):
+        return AlertGroup.objects.get(fingerprint=fingerprint).status
+
+    def test_sources_without_a_ttl_are_never_read(self):
+        resolved, checked = self.sweep({"grafana": 86400, "zabbix": 86400})
+        self.assertEqual((resolved, checked), (1, [["grafana"]]))
+        self.assertEqual(self.status("grafana"), AlertStatus.RESOLVED)
+        self.assertEqual(self.status("prometheus"), AlertStatus.FIRING)
+        self.assertEqual(self.status("recent"), AlertStatus.ACKED)
+
+    def test_wildcard_ttl_covers_other_sources(self):
+        resolved, _ = self.sweep({"grafana": 86400, "*": 3600})
+        self.assertEqual(resolved, 2)
+        self.assertEqual(self.status("prometheus"), AlertStatus.RESOLVED)
+        self.assertEqual(self.status("recent"), AlertStatus.ACKED)
+
+
+class RollupPurgeTests(TestCase):
+    def test_purges_only_expired_buckets_of_one_granularity(self):
+        now = utcnow().replace(minute=0, second=0, microsecond=0)
+        for granularity in (RollupGranularity.MINUTE, RollupGranularity.HOUR):
+            for days in (1, 10):
+                AlertRollup.objects.create(granularity=granularity, bucket=now - timedelta(days=days),
+                                           source="grafana", severity="warning", status="firing", count=3)
+        purged = sum(retention.purge_rollups(RollupGranularity.MINUTE, now - timedelta(days=7), 1))
+        self.assertEqual(purged, 1)
+        self.assertEqual(AlertRollup.objects.filter(granularity=RollupGranularity.MINUTE).count(), 1)
+        self.assertEqual(AlertRollup.objects.filter(granularity=RollupGranularity.HOUR).count(), 2)
+
+
+class PartitionSqlTests(SimpleTestCase):
+    def test_stranded_rows_move_into_the_new_partition_before_it_is_attached(self):
+        create, move, attach = partitioning.move_default_rows_sql(date(2024, 12, 1))
+        self.assertIn("CREATE TABLE alert_event_p202412 (LIKE alert_event", create)
+        self.assertIn("DELETE FROM alert_event_default WHERE created_at >= '2024-12-01' AND created_at < '2025-01-01'",
+                      move)
+        self.assertEqual(attach, "ALTER TABLE alert_event ATTACH PARTITION alert_event_p202412 "
+                                 "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')")
@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+from django.test import TestCase
+
+from alerts import groupcache, labelsets, payloads, rollups
+from alerts.models import AlertRollup, RollupGranularity
+from alerts.services import ingest_standard_alert
+
+
+def at(hour, minute, second=0):
+    return datetime(2024, 1, 1, hour, minute, second, tzinfo=timezone.utc)
+
+
+class QueryTests(TestCase):
+    def setUp(self):
+        for when in (at(9, 10), at(9, 40), at(10, 5), at(10, 35), at(10, 50)):
+            rollups.record(source="prometheus", severity="warning", status="firing", service="api", at=when)
+
+    def test_hourly_since_does_not_reach_back_to_the_hour(self):
+        self.assertEqual(rollups.query(since=at(9, 30))[0]["count"], 4)
+        self.assertEqual(rollups.query(since=at(9, 30), until=at(10, 0))[0]["count"], 1)
+        self.assertEqual(rollups.query(since=at(10, 0))[0]["count"], 3)
+
+    def test_hourly_until_does_not_reach_to_the_end_of_the_hour(self):
+        self.assertEqual(rollups.query(until=at(10, 30))[0]["count"], 3)
+        self.assertEqual(rollups.query(since=at(9, 30), until=at(10, 40))[0]["count"], 3)
+        self.assertEqual(rollups.query(since=at(10, 1), until=at(10, 40))[0]["count"], 2)
+        rows = rollups.query(group_by=["bucket"], until=at(10, 30))
+        self.assertEqual([(r["bucket"], r["count"]) for r in rows], [(at(9, 0), 2), (at(10, 0), 1)])
+
+    def test_partial_hour_is_reported_under_its_bucket(self):
+        rows = rollups.query(group_by=["bucket"], since=at(9, 30))
+        self.assertEqual([(r["bucket"], r["count"]) for r in rows], [(at(9, 0), 1), (at(10, 0), 3)])
+
+    def test_minute_since_starts_at_the_next_whole_minute(self):
+        count = rollups.query(granularity=RollupGranularity.MINUTE, since=at(10, 35, 30))[0]["count"]
+        self.assertEqual(count, 1)
+
+
+class IngestRecordTests(TestCase):
+    def setUp(self):
+        groupcache.clear()
+        labelsets.reset()
+        payloads.reset()
+        self.addCleanup(labelsets.reset)
+        self.addCleanup(payloads.reset)
+
+    def test_counted_once_the_event_commits(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            ingest_standard_alert({"source": "grafana", "title": "disk", "labels": {"instance": "h1"}})
+            self.assertFalse(AlertRollup.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(rollups.query()[0]["count"], 1)
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from alerts import labelsets, search
+from alerts.models import AlertEvent
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        labelsets.reset()
+        self.addCleanup(labelsets.reset)
+        for title, description in (
+            ("Disk usage high", "disk /var almost full on db-1"),
+            ("CPU usage high", "load on web-1"),
+            ("Disk latency", "slow writes"),
+        ):
+            AlertEvent.objects.create(source="test", title=title, description=description)
+
+    def found(self, query):
+        return list(search.ranked(search.search_events(AlertEvent.objects.all(), query), query)
+                    .values_list("title", flat=True))
+
+    def test_every_word_must_match_as_a_prefix(self):
+        self.assertEqual(set(self.found("dis")), {"Disk usage high", "Disk latency"})
+        self.assertEqual(self.found("disk usa"), ["Disk usage high"])
+        self.assertEqual(self.found("memory"), [])
+        self.assertEqual(self.found("  "), [])
+
+    def test_more_occurrences_rank_first(self):
+        if search._backend(AlertEvent.objects.all()) != "sqlite":
+            self.skipTest("SQLite built without FTS5")
+        self.assertEqual(self.found("disk"), ["Disk usage high", "Disk latency"])
+
+    def test_backend_is_not_looked_up_per_query(self):
+        search._backend(AlertEvent.objects.all())
+        with CaptureQueriesContext(connection) as queries:
+            self.found("disk")
+        self.assertFalse([q for q in queries.captured_queries if "sqlite_master" in q["sql"]])
+
+    def test_fallback_without_a_full_text_index(self):
+        with mock.patch.dict(search._backends, {"default": ""}):
+            self.assertEqual(set(self.found("dis")), {"Disk usage high", "Disk latency"})
+            self.assertEqual(self.found("disk usa"), ["Disk usage high"])
+            self.assertEqual(self.found("web-1"), ["CPU usage high"])
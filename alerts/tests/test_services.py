@@ -0,0 +1,119 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from alerts import groupcache, labelsets, payloads
+from alerts.models import AlertEvent, AlertGroup, AlertStatus, LabelSet, RawPayload
+from alerts.services import ingest_standard_alert, resolve_stale_groups
+from core.utils import utcnow
+from rules import inhibitions
+from rules.models import InhibitRule
+
+
+def alert(status=AlertStatus.FIRING):
+    return {"source": "grafana", "status": status, "title": "disk full", "labels": {"instance": "h1"}}
+
+
+class CachedGroupStatusTests(TestCase):
+    def setUp(self):
+        groupcache.clear()
+        labelsets.reset()
+        payloads.reset()
+        self.addCleanup(labelsets.reset)
+        self.addCleanup(payloads.reset)
+
+    def ingest(self, data):
+        with mock.patch("alerts.services._after_commit") as after_commit:
+            with self.captureOnCommitCallbacks(execute=True):
+                event = ingest_standard_alert(data)
+        _, group, previous_status = after_commit.call_args.args
+        return event, group, previous_status
+
+    def test_cached_path_reports_transition(self):
+        self.ingest(alert())
+        _, group, previous = self.ingest(alert(AlertStatus.RESOLVED))
+        self.assertEqual((previous, group.status), (AlertStatus.FIRING, AlertStatus.RESOLVED))
+
+    def test_status_changed_elsewhere_is_read_back(self):
+        event, _, _ = self.ingest(alert())
+        # e.g. a stale-group sweep in another process
+        AlertGroup.objects.filter(pk=event.group_id).update(status=AlertStatus.RESOLVED)
+        _, group, previous = self.ingest(alert())
+        self.assertEqual((previous, group.status), (AlertStatus.RESOLVED, AlertStatus.FIRING))
+        self.assertEqual(AlertGroup.objects.get(pk=group.id).count, 2)
+
+    def test_ack_elsewhere_survives_firing(self):
+        event, _, _ = self.ingest(alert())
+        AlertGroup.objects.filter(pk=event.group_id).update(status=AlertStatus.ACKED)
+        _, group, previous = self.ingest(alert())
+        self.assertEqual((previous, group.status), (AlertStatus.ACKED, AlertStatus.ACKED))
+        self.assertEqual(groupcache.lookup(event.fingerprint).status, AlertStatus.ACKED)
+
+
+class SweptElsewhereTests(TestCase):
+    """A stale-group sweep in another process: its on-commit callbacks never run here."""
+
+    def setUp(self):
+        groupcache.clear()
+        labelsets.reset()
+        payloads.reset()
+        self.addCleanup(labelsets.reset)
+        self.addCleanup(payloads.reset)
+        inhibitions.invalidate()
+
+    def ingest(self, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ingest_standard_alert(data)
+
+    def sweep(self, group_id):
+        cached = AlertGroup.objects.get(pk=group_id)
+        resolve_stale_groups({group_id: utcnow() + timedelta(hours=1)})
+        # the ingest worker still holds what it saw last
+        groupcache.remember(cached.id, cached.fingerprint, cached.status, cached.sources)
+
+    def test_refire_reports_transition(self):
+        event = self.ingest(alert())
+        self.sweep(event.group_id)
+        with mock.patch("alerts.services.escalation.start") as start:
+            self.ingest(alert())
+        start.assert_called_once()
+        self.assertEqual(AlertGroup.objects.get(pk=event.group_id).status, AlertStatus.FIRING)
+
+    def test_swept_source_stops_inhibiting(self):
+        InhibitRule.objects.create(name="host down", source_matchers=["alertname=HostDown"],
+                                   target_matchers=["alertname=HighCPU"], equal=["instance"])
+        source = self.ingest({**alert(), "labels": {"alertname": "HostDown", "instance": "h1"}})
+        target = {**alert(), "title": "cpu", "labels": {"alertname": "HighCPU", "instance": "h1"}}
+        with mock.patch("alerts.signals.evaluate_rules_on_event") as evaluate:
+            self.ingest(target)
+            evaluate.assert_not_called()
+            self.sweep(source.group_id)
+            evaluate.reset_mock()
+            with override_settings(INHIBIT_RELOAD_SECONDS=0):  # the next periodic check
+                self.ingest({**target, "title": "cpu again"})  # not a duplicate of the first
+            evaluate.assert_called_once()
+
+
+class CollectedCacheTests(TestCase):
+    def setUp(self):
+        groupcache.clear()
+        labelsets.reset()
+        payloads.reset()
+        self.addCleanup(labelsets.reset)
+        self.addCleanup(payloads.reset)
+
+    def test_collected_label_set_and_payload_do_not_rerun_ingest(self):
+        data = {**alert(), "raw": {"alert": "disk full"}}
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_standard_alert(data)
+        # purge_events in another process collects both rows once nothing refers to them
+        AlertEvent.objects.all().delete()
+        LabelSet.objects.all().delete()
+        RawPayload.objects.all().delete()
+        with mock.patch("alerts.signals.evaluate_rules_on_event") as evaluate:
+            with self.captureOnCommitCallbacks(execute=True):
+                event = ingest_standard_alert(data)
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertTrue(LabelSet.objects.filter(pk=event.label_set_id).exists())
+        self.assertTrue(RawPayload.objects.filter(pk=event.raw_payload_id).exists())
@@ -0,0 +1,44 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from algorithms.heavy_hitters import HeavyHitterTracker
+from algorithms.storm import StormDetector
+from alerts import groupcache, labelsets, payloads, storm
+from alerts.models import AlertEvent, AlertGroup
+from alerts.services import ingest_standard_alert
+
+
+class StormIngestTests(TestCase):
+    def setUp(self):
+        groupcache.clear()
+        labelsets.reset()
+        payloads.reset()
+        self.addCleanup(labelsets.reset)
+        self.addCleanup(payloads.reset)
+        detector = StormDetector(half_life=60, enter=1e-6, exit=0, key_enter=1e-6, key_exit=0)
+        self.tracker = HeavyHitterTracker(("fingerprint", "service"), (300,), capacity=10)
+        patchers = (
+            mock.patch("alerts.storm.detector", detector),
+            mock.patch("alerts.storm.keep", return_value=False),
+            mock.patch("alerts.storm._start_worker"),
+            mock.patch("alerts.services.heavy_hitters.tracker", self.tracker),
+        )
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_folded_events_count_in_top_k(self):
+        for _ in range(5):
+            with self.captureOnCommitCallbacks(execute=True):
+                ingest_standard_alert({"source": "grafana", "title": "disk", "service": "db", "labels": {"h": "1"}})
+        self.assertEqual(AlertEvent.objects.count(), 1)
+        self.assertEqual(AlertGroup.objects.get().count, 5)
+        [(service, count, _)] = self.tracker.top("service", 300)
+        self.assertEqual((service, count), ("db", 5))
+
+    def test_stats_has_no_side_effects(self):
+        with mock.patch.object(storm.detector, "poll") as poll, mock.patch("alerts.storm._ended") as ended:
+            storm.stats()
+        poll.assert_not_called()
+        ended.assert_not_called()
@@ -1,7 +1,22 @@
 from django.urls import path
-from .views import AlertEventListCreateView
+from .views import (
+    AlertEventDetailView,
+    AlertEventExportView,
+    AlertEventListCreateView,
+    AlertStatsView,
+    CacheStatsView,
+    StormStatsView,
+    TopAlertsView,
+    alert_stream,
+)
 
 urlpatterns = [
     path('', AlertEventListCreateView.as_view(), name='alert-list-create'),
+    path('<int:pk>/', AlertEventDetailView.as_view(), name='alert-detail'),
+    path('export/', AlertEventExportView.as_view(), name='alert-export'),
+    path('stream/', alert_stream, name='alert-stream'),
+    path('stats/', AlertStatsView.as_view(), name='alert-stats'),
+    path('top/', TopAlertsView.as_view(), name='alert-top'),
+    path('cache-stats/', CacheStatsView.as_view(), name='alert-cache-stats'),
+    path('storm/', StormStatsView.as_view(), name='alert-storm'),
 ]
-
@@ -1,9 +1,276 @@
-from rest_framework import generics
-from .models import AlertEvent
-from .serializers import AlertEventSerializer
+import asyncio
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.views import APIView
+
+from . import labelsets, rollups, search, storm
+from algorithms import heavy_hitters
+from core.metrics import cache_stats
+from .broadcast import FILTER_KEYS, broadcaster
+from .export import gzip_stream, iter_ndjson, parse_cursor
+from .filters import FilterError, filter_events, label_matchers
+from .labelindex import filter_by_labels
+from .models import AlertEvent, AlertGroup, Incident, RollupGranularity
+from .serializers import AlertEventDetailSerializer, AlertEventSerializer, AlertGroupSerializer, IncidentSerializer
+from .services import acknowledge_group, latest_events_for_groups
+
+MAX_EMBEDDED_EVENTS = 50
 
 
 class AlertEventListCreateView(generics.ListCreateAPIView):
-    queryset = AlertEvent.objects.order_by('-created_at')
     serializer_class = AlertEventSerializer
 
+    def get_queryset(self):
+        params = self.request.query_params
+        try:
+            queryset = filter_events(AlertEvent.objects.order_by('-created_at'), params)
+        except FilterError as e:
+            raise ValidationError({e.field: str(e)})
+        if params.get('q'):
+            queryset = search.ranked(queryset, params['q'])
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many') and args:
+            events = list(args[0])  # also fills a queryset's result cache
+            labelsets.warm(e.label_set_id for e in events)
+        return super().get_serializer(*args, **kwargs)
+
+
+class AlertEventDetailView(generics.RetrieveAPIView):
+    """One event including its raw source payload."""
+    queryset = AlertEvent.objects.all()
+    serializer_class = AlertEventDetailSerializer
+
+
+class AlertEventExportView(APIView):
+    """
+    Stream matching events as NDJSON, oldest first.
+
+    Accepts the list API filters plus ``cursor`` (id of the last line already
+    received, to resume a dropped download) and ``compress=gzip``.
+    """
+
+    def get(self, request: Request):
+        try:
+            after_id = parse_cursor(request.query_params.get('cursor'))
+            queryset = filter_events(AlertEvent.objects.all(), request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        stream = iter_ndjson(queryset, chunk_size=settings.EXPORT_CHUNK_SIZE, after_id=after_id)
+
+        compress = request.query_params.get('compress') == 'gzip'
+        if compress:
+            stream = gzip_stream(stream)
+        response = StreamingHttpResponse(stream, content_type='application/x-ndjson')
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        response['Content-Disposition'] = 'attachment; filename="alert_events.ndjson"'
+        return response
+
+
+class AlertStatsView(APIView):
+    """
+    Event counts served from the rollup tables.
+
+    ``granularity`` (minute|hour), ``since``/``until``, ``group_by`` (any of
+    bucket, source, severity, status, service) and per-dimension filters.
+    """
+
+    def get(self, request: Request):
+        params = request.query_params
+        granularity = params.get('granularity', RollupGranularity.HOUR)
+        if granularity not in RollupGranularity.values:
+            return Response({"detail": "granularity must be minute or hour"}, status=status.HTTP_400_BAD_REQUEST)
+        group_by = [g for g in params.get('group_by', '').split(',') if g]
+        unknown = set(group_by) - {'bucket', *rollups.DIMENSIONS}
+        if unknown:
+            return Response({"detail": f"cannot group by {', '.join(sorted(unknown))}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        filters = {dim: [v for v in params.get(dim, '').split(',') if v] for dim in rollups.DIMENSIONS}
+        results = rollups.query(
+            granularity=granularity,
+            group_by=group_by,
+            since=parse_datetime(params.get('since') or ''),
+            until=parse_datetime(params.get('until') or ''),
+            filters=filters,
+        )
+        return Response({"granularity": granularity, "results": results})
+
+
+class TopAlertsView(APIView):
+    """
+    Noisiest fingerprints, services or resources over a sliding window, from
+    the in-memory heavy-hitters sketch (no database scan).
+
+    ``dimension`` (fingerprint|service|resource), ``window`` (seconds, one of
+    HEAVY_HITTER_WINDOWS) and ``limit``. ``count`` may over-estimate by up to
+    ``error``; ``count - error`` is a guaranteed lower bound.
+    """
+
+    def get(self, request: Request):
+        tracker = heavy_hitters.tracker
+        params = request.query_params
+        dimension = params.get('dimension', 'fingerprint')
+        try:
+            window = int(params.get('window') or tracker.windows[0])
+            limit = min(int(params.get('limit') or 10), 100)
+        except ValueError:
+            return Response({"detail": "window and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if dimension not in tracker.dimensions or window not in tracker.windows:
+            return Response({"detail": f"dimension must be one of {', '.join(tracker.dimensions)} and "
+                                       f"window one of {', '.join(map(str, tracker.windows))}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        top = tracker.top(dimension, window, limit)
+        results = [{"key": key, "count": count, "error": error} for key, count, error in top]
+        if dimension == 'fingerprint' and results:
+            groups = AlertGroup.objects.filter(fingerprint__in=[r["key"] for r in results]).only(
+                'id', 'fingerprint', 'last_title', 'status')
+            by_fp = {g.fingerprint: g for g in groups}
+            for r in results:
+                group = by_fp.get(r["key"])
+                r["group"] = {"id": group.id, "title": group.last_title, "status": group.status} if group else None
+        return Response({"dimension": dimension, "window": window, "results": results})
+
+
+class CacheStatsView(APIView):
+    """Hit rates of this process's in-memory caches (group, label set, raw payload)."""
+
+    def get(self, request: Request):
+        return Response({"caches": cache_stats()})
+
+
+class StormStatsView(APIView):
+    """Storm mode state of this process: EWMA rates, active storms and how many started or ended."""
+
+    def get(self, request: Request):
+        return Response(storm.stats())
+
+
+class GroupCursorPagination(CursorPagination):
+    # Keyset pagination on last_seen: no COUNT(*) and no OFFSET scans.
+    ordering = ('-last_seen', '-id')
+    page_size = 100
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
+
+class AlertGroupListView(generics.ListAPIView):
+    """
+    List groups with their precomputed summaries, newest activity first.
+
+    ``?events=K`` embeds each group's latest K events, fetched in one query;
+    ``?label=`` matchers keep groups with at least one matching event.
+    """
+    serializer_class = AlertGroupSerializer
+    pagination_class = GroupCursorPagination
+
+    def get_queryset(self):
+        queryset = AlertGroup.objects.all()
+        params = self.request.query_params
+        for field in ('status', 'max_severity', 'fingerprint'):
+            if params.get(field):
+                queryset = queryset.filter(**{f'{field}__in': params[field].split(',')})
+        try:
+            matchers = label_matchers(params)
+        except FilterError as e:
+            raise ValidationError({e.field: str(e)})
+        if matchers:
+            events = filter_by_labels(AlertEvent.objects.all(), matchers)
+            queryset = queryset.filter(id__in=events.values('group_id'))
+        return queryset
+
+    def list(self, request: Request, *args, **kwargs):
+        try:
+            embed = min(int(request.query_params.get('events') or 0), MAX_EMBEDDED_EVENTS)
+        except ValueError:
+            return Response({"detail": "events must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        if embed > 0:
+            context['latest_events'] = latest_events_for_groups([g.id for g in page], embed)
+        serializer = self.get_serializer_class()(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
+
+
+class AlertGroupAckView(APIView):
+    """Acknowledge a firing group, stopping its escalation; body ``{"assignee": ...}`` is optional."""
+
+    def post(self, request: Request, pk: int):
+        assignee = request.data.get('assignee') or ''
+        if not isinstance(assignee, str) or len(assignee) > 128:
+            return Response({"assignee": "Expected a name of at most 128 characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        group = acknowledge_group(pk, assignee)
+        if group is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(AlertGroupSerializer(group).data)
+
+
+class IncidentListView(generics.ListAPIView):
+    """Correlated incidents, newest activity first; ``?status=`` filters."""
+    serializer_class = IncidentSerializer
+    pagination_class = GroupCursorPagination
+
+    def get_queryset(self):
+        queryset = Incident.objects.all()
+        if self.request.query_params.get('status'):
+            queryset = queryset.filter(status__in=self.request.query_params['status'].split(','))
+        return queryset
+
+
+class IncidentDetailView(generics.RetrieveAPIView):
+    """One incident with its member groups."""
+    queryset = Incident.objects.all()
+    serializer_class = IncidentSerializer
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'embed_groups': True}
+
+
+async def _sse_messages(filters, types):
+    subscriber = broadcaster.subscribe(filters, types=types, maxsize=settings.LIVE_TAIL_BUFFER)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.LIVE_TAIL_MAX_SECONDS
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    try:
+        yield b'retry: 3000\n\n'
+        while loop.time() < deadline:
+            try:
+                message = await subscriber.get(timeout=settings.LIVE_TAIL_HEARTBEAT)
+            except EOFError:
+                yield b'event: dropped\ndata: {}\n\n'
+                return
+            if message is None:
+                yield b': keepalive\n\n'
+                continue
+            yield f"event: {message['type']}\ndata: {encoder.encode(message['data'])}\n\n".encode('utf-8')
+    finally:
+        broadcaster.unsubscribe(subscriber)
+
+
+async def alert_stream(request):
+    """
+    Server-Sent Events tail of newly committed events and group status changes.
+
+    Filters: ``severity``, ``service``, ``namespace`` (comma separated) and
+    ``types`` (``event``, ``group``, ``incident``, ``flapping``, ``storm``). Needs the ASGI app; streams are closed
+    after LIVE_TAIL_MAX_SECONDS and EventSource clients reconnect on their own.
+    """
+    params = request.GET
+    filters = {key: [v for v in params.get(key, '').split(',') if v] for key in FILTER_KEYS}
+    types = [t for t in params.get('types', '').split(',') if t] or None
+    response = StreamingHttpResponse(_sse_messages(filters, types), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
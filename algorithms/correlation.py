@@ -0,0 +1,116 @@
+"""
+Streaming correlation of alert groups into incidents.
+
+Groups whose events share a correlation key (a resource, a service, ...)
+within a sliding window are merged into one component with a union-find
+(union by size, path compression). Each key remembers only the group that
+last touched it, so an event costs O(number of keys) plus amortized
+near-constant union-find work. State expires with the window: keys and whole
+components idle for longer than it are dropped, so memory is bounded by
+the traffic of one window.
+
+The correlator knows nothing about the database; each component carries an
+opaque incident id that the caller assigns and merges.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class Observation:
+    root: int
+    size: int
+    # Incident the component now belongs to (None if it has none yet).
+    incident: Optional[int]
+    # Incidents folded into ``incident`` by this event.
+    retired: List[int] = field(default_factory=list)
+    # Groups that must be (re)assigned to ``incident``.
+    moved: List[int] = field(default_factory=list)
+
+
+class IncidentCorrelator:
+    def __init__(self, window_seconds: float):
+        self.window = window_seconds
+        self._parent: Dict[int, int] = {}
+        self._members: Dict[int, List[int]] = {}  # root -> member groups
+        self._incident: Dict[int, Optional[int]] = {}  # root -> incident id
+        self._active: "OrderedDict[int, float]" = OrderedDict()  # root -> last activity, oldest first
+        self._keys: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()  # key -> (group, seen), oldest first
+        self._lock = threading.Lock()
+
+    def _find(self, group: int) -> int:
+        root = group
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[group] != root:
+            self._parent[group], group = root, self._parent[group]
+        return root
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._keys:
+            key, (_, seen) = next(iter(self._keys.items()))
+            if seen >= cutoff:
+                break
+            self._keys.popitem(last=False)
+        while self._active:
+            root, seen = next(iter(self._active.items()))
+            if seen >= cutoff:
+                break
+            self._active.popitem(last=False)
+            for member in self._members.pop(root):
+                del self._parent[member]
+            self._incident.pop(root, None)
+
+    def observe(self, group: int, keys: Iterable[str], now: float) -> Observation:
+        """Record that ``group`` had an event carrying ``keys`` at ``now``."""
+        with self._lock:
+            self._expire(now)
+            if group not in self._parent:
+                self._parent[group] = group
+                self._members[group] = [group]
+                self._incident[group] = None
+            touched = {self._find(group)}
+            for key in keys:
+                previous = self._keys.pop(key, None)
+                if previous is not None and previous[0] in self._parent:
+                    touched.add(self._find(previous[0]))
+                self._keys[key] = (group, now)
+            incidents = sorted({self._incident[r] for r in touched if self._incident[r] is not None})
+            incident = incidents[0] if incidents else None
+            moved: List[int] = []
+            if incident is not None and len(touched) > 1:
+                for r in touched:
+                    if self._incident[r] != incident:
+                        moved.extend(self._members[r])
+
+            root = touched.pop()
+            for other in touched:
+                root = self._union(root, other)
+            self._incident[root] = incident
+            self._active.pop(root, None)
+            self._active[root] = now
+            return Observation(root, len(self._members[root]), incident, incidents[1:], moved)
+
+    def _union(self, a: int, b: int) -> int:
+        if len(self._members[a]) < len(self._members[b]):
+            a, b = b, a
+        self._parent[b] = a
+        self._members[a].extend(self._members.pop(b))
+        self._incident.pop(b, None)
+        self._active.pop(b, None)
+        return a
+
+    def set_incident(self, root: int, incident: int) -> None:
+        with self._lock:
+            if root in self._parent:
+                self._incident[self._find(root)] = incident
+
+    def members(self, root: int) -> List[int]:
+        with self._lock:
+            return list(self._members.get(root, ()))
+
+    def __len__(self) -> int:
+        return len(self._parent)
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from typing import Optional
 
+from django.conf import settings
 from django.utils import timezone
 
 from alerts.models import AlertEvent
@@ -9,14 +10,22 @@ from alerts.models import AlertEvent
 DEFAULT_WINDOW_SECONDS = 60
 
 
-def should_deduplicate(event: AlertEvent, window_seconds: int = DEFAULT_WINDOW_SECONDS) -> Optional[AlertEvent]:
+def should_deduplicate(
+    event: AlertEvent, window_seconds: int = DEFAULT_WINDOW_SECONDS, key: Optional[str] = None
+) -> Optional[AlertEvent]:
     """
-    Return an existing recent event with the same fingerprint inside the time window
+    Return an existing recent event with the same fingerprint (or, with
+    ``key="cluster"``, the same near-duplicate cluster) inside the time window
     if we should treat the new event as duplicate; otherwise return None.
     """
+    key = key or settings.DEDUPE_KEY
+    if key == "cluster" and event.cluster_key:
+        same = {"cluster_key": event.cluster_key}
+    else:
+        same = {"fingerprint": event.fingerprint}
     window_start = timezone.now() - timedelta(seconds=window_seconds)
     existing = (
-        AlertEvent.objects.filter(fingerprint=event.fingerprint, created_at__gte=window_start)
+        AlertEvent.objects.filter(created_at__gte=window_start, **same)
         .exclude(pk=event.pk)
         .order_by("-created_at")
         .first()
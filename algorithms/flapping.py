@@ -0,0 +1,102 @@
+"""
+Flap detection in the style of Nagios.
+
+Each tracked group keeps its last status and a bit ring of whether each of
+its last ``WINDOW`` status samples was a change. The flap score is the
+weighted share of changes, the newest weighing 1.2 and the oldest 0.8 as in
+Nagios. A group starts flapping at or above ``high`` percent and stops only
+below ``low``, so it does not chatter at the threshold. Updates touch a
+fixed number of bits, and a group's state is three small fields, whatever
+its event volume.
+"""
+import threading
+from typing import Optional, Tuple
+
+from core.lru import LRUCache
+
+WINDOW = 20  # transitions between the last 21 samples, as in Nagios
+_FULL = (1 << WINDOW) - 1
+# Bit i is the i-th most recent transition; newest weighs 1.2, oldest 0.8.
+_WEIGHTS = [1.2 - 0.4 * i / (WINDOW - 1) for i in range(WINDOW)]
+
+STARTED = "started"
+STOPPED = "stopped"
+
+
+class FlapState:
+    __slots__ = ("last", "history", "flapping")
+
+    def __init__(self, last: str, flapping: bool = False):
+        self.last = last
+        self.history = 0
+        self.flapping = flapping
+
+    @property
+    def score(self) -> float:
+        """Percent state change over the window, 0-100."""
+        return _score(self.history)
+
+
+def _score(history: int) -> float:
+    total, i = 0.0, 0
+    while history:
+        if history & 1:
+            total += _WEIGHTS[i]
+        history >>= 1
+        i += 1
+    return 100.0 * total / WINDOW
+
+
+class FlapDetector:
+    def __init__(self, low: float = 25.0, high: float = 50.0, max_tracked: int = 100000):
+        if not 0 <= low <= high <= 100:
+            raise ValueError("flap thresholds must satisfy 0 <= low <= high <= 100")
+        self.low = low
+        self.high = high
+        self._states = LRUCache(max_tracked)
+        self._lock = threading.Lock()
+        # A key seeded as flapping starts with its newest samples changing, just
+        # enough to score ``high``, and calms down like one that just started.
+        self._seed = 0
+        while _score(self._seed) < high and self._seed != _FULL:
+            self._seed = (self._seed << 1) | 1
+
+    def is_tracked(self, key) -> bool:
+        return self._states.get(key) is not None
+
+    def forget(self, key) -> None:
+        self._states.pop(key)
+
+    def observe(self, key, status: str, was_flapping: bool = False) -> Tuple[bool, Optional[str]]:
+        """
+        Record one status sample; returns (flapping, change) where change is
+        STARTED, STOPPED or None. ``was_flapping`` seeds an untracked key,
+        e.g. from state persisted before a restart.
+        """
+        return self._sample(key, status, was_flapping, record=True)
+
+    def peek(self, key, status: str, was_flapping: bool = False) -> Tuple[bool, Optional[str]]:
+        """What ``observe`` would return, without recording the sample."""
+        return self._sample(key, status, was_flapping, record=False)
+
+    def _sample(self, key, status: str, was_flapping: bool, record: bool) -> Tuple[bool, Optional[str]]:
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = FlapState(status, was_flapping)
+                if was_flapping:
+                    state.history = self._seed
+                if record:
+                    self._states.put(key, state)
+                history = state.history
+            else:
+                history = ((state.history << 1) | (status != state.last)) & _FULL
+            flapping, change = state.flapping, None
+            score = _score(history)
+            if not flapping and score >= self.high:
+                flapping, change = True, STARTED
+            elif flapping and score < self.low:
+                flapping, change = False, STOPPED
+            if record:
+                state.history, state.last, state.flapping = history, status, flapping
+            return flapping, change
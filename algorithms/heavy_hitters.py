@@ -0,0 +1,127 @@
+"""
+Streaming top-K ("heavy hitters") over sliding time windows.
+
+Each window is split into panes, and every pane holds a Space-Saving summary
+(Metwally et al.) with a fixed number of counters. Memory therefore depends
+only on capacity and pane count, never on how many distinct keys flow past.
+A reported count over-estimates the true count by at most ``error``.
+"""
+import heapq
+import threading
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+
+class SpaceSaving:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counters: Dict[Hashable, List[int]] = {}  # item -> [count, error]
+        self._heap: List[Tuple[int, Hashable]] = []  # lazy min-heap of (count, item)
+
+    def add(self, item: Hashable, weight: int = 1) -> None:
+        counter = self.counters.get(item)
+        if counter is None:
+            if len(self.counters) < self.capacity:
+                counter = self.counters[item] = [0, 0]
+            else:
+                # Evict the smallest counter; the newcomer inherits its count as error.
+                floor = self._pop_min()
+                counter = self.counters[item] = [floor, floor]
+        counter[0] += weight
+        heapq.heappush(self._heap, (counter[0], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c[0], i) for i, c in self.counters.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> int:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            counter = self.counters.get(item)
+            if counter is not None and counter[0] == count:
+                del self.counters[item]
+                return count
+
+    @property
+    def floor(self) -> int:
+        """Upper bound on the count of any item not currently tracked."""
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(c[0] for c in self.counters.values())
+
+
+class WindowedTopK:
+    """Space-Saving panes in a ring, merged at query time."""
+
+    def __init__(self, window_seconds: int, capacity: int, panes: int = 12):
+        self.window_seconds = window_seconds
+        self.pane_seconds = window_seconds / panes
+        self.capacity = capacity
+        self._panes: Dict[int, SpaceSaving] = {}
+        self._n_panes = panes
+
+    def add(self, item: Hashable, now: float) -> None:
+        slot = int(now // self.pane_seconds)
+        pane = self._panes.get(slot)
+        if pane is None:
+            pane = self._panes[slot] = SpaceSaving(self.capacity)
+            for old in [s for s in self._panes if s <= slot - self._n_panes]:
+                del self._panes[old]
+        pane.add(item)
+
+    def top(self, n: int, now: float) -> List[Tuple[Hashable, int, int]]:
+        """(item, estimated count, max over-estimate), largest first."""
+        oldest = int(now // self.pane_seconds) - self._n_panes + 1
+        live = [p for s, p in self._panes.items() if s >= oldest]
+        merged: Dict[Hashable, List[int]] = {}
+        for pane in live:
+            for item, (count, error) in pane.counters.items():
+                entry = merged.setdefault(item, [0, 0])
+                entry[0] += count
+                entry[1] += error
+        floors = [pane.floor for pane in live]
+        total_floor = sum(floors)
+        for item, entry in merged.items():
+            # A pane that evicted (or never saw) the item may still hide up to its floor.
+            missing = total_floor - sum(f for f, p in zip(floors, live) if item in p.counters)
+            entry[0] += missing
+            entry[1] += missing
+        ranked = heapq.nlargest(n, merged.items(), key=lambda kv: kv[1][0])
+        return [(item, count, error) for item, (count, error) in ranked]
+
+
+class HeavyHitterTracker:
+    """Top-K per dimension and window, safe to feed from concurrent ingest threads."""
+
+    def __init__(self, dimensions: Sequence[str], windows: Iterable[int], capacity: int):
+        self.dimensions = tuple(dimensions)
+        self.windows = tuple(sorted(windows))
+        self._lock = threading.Lock()
+        self._sketches = {
+            (dim, window): WindowedTopK(window, capacity)
+            for dim in self.dimensions for window in self.windows
+        }
+
+    def observe(self, values: Dict[str, str], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            for dim in self.dimensions:
+                value = values.get(dim)
+                if not value:
+                    continue
+                for window in self.windows:
+                    self._sketches[(dim, window)].add(value, now)
+
+    def top(self, dimension: str, window: int, n: int = 10,
+            now: Optional[float] = None) -> List[Tuple[Hashable, int, int]]:
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._sketches[(dimension, window)].top(n, now)
+
+
+tracker = HeavyHitterTracker(
+    dimensions=("fingerprint", "service", "resource"),
+    windows=settings.HEAVY_HITTER_WINDOWS,
+    capacity=settings.HEAVY_HITTER_CAPACITY,
+)
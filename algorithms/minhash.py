@@ -0,0 +1,179 @@
+"""
+Near-duplicate clustering with MinHash signatures and an LSH index.
+
+Text is normalized (case, separators, digit runs, hex ids, uuids) and cut
+into character shingles. Signatures use one-permutation hashing with
+rotation densification (Shrivastava, 2017): each shingle is hashed once and
+keeps the minimum within one of ``permutations`` bins, and empty bins borrow
+from their right neighbour. Two signatures agree in a position with
+probability close to the Jaccard similarity of the shingle sets, at the cost
+of one hash per shingle instead of one per shingle and permutation.
+Signatures are split into ``bands`` of ``rows``; items colliding in any band are
+candidates, which are confirmed against the cluster's representative
+signature. With 64 permutations in 16 bands of 4, pairs above ~0.5 Jaccard
+almost always collide and pairs below ~0.2 rarely do.
+
+Clusters idle for ``window_seconds`` expire, along with their buckets, so
+memory follows the recent alert mix rather than all history.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .hyperloglog import hash64
+
+_MAX_BUCKETS_PER_CLUSTER = 64
+_ROTATION = 1 << 58  # added per bin a borrowed value travelled, to keep it distinct
+
+_VOLATILE = [
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"), "<uuid>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b(?=[0-9a-f]*\d)[0-9a-f]{6,}\b"), "<hex>"),
+    (re.compile(r"#*\d+"), "#"),
+    (re.compile(r"[^a-z#<>]+"), " "),
+]
+
+
+def normalize(text: str) -> str:
+    text = (text or "").lower()
+    for pattern, replacement in _VOLATILE:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def shingles(text: str, k: int = 4) -> Set[str]:
+    """Character k-grams of the normalized text (the whole text if shorter)."""
+    text = normalize(text)
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+class MinHasher:
+    def __init__(self, permutations: int = 64):
+        self.permutations = permutations
+
+    def signature(self, items: Iterable[str]) -> Tuple[int, ...]:
+        k = self.permutations
+        bins: List[Optional[int]] = [None] * k
+        for item in items:
+            value, i = divmod(hash64(item), k)
+            if bins[i] is None or value < bins[i]:
+                bins[i] = value
+        filled = [i for i, v in enumerate(bins) if v is not None]
+        if not filled:
+            return (0,) * k
+        # Walk right to left so every empty bin sees its nearest filled neighbour.
+        nearest, distance = bins[filled[0]], k - filled[-1]
+        for i in range(k - 1, -1, -1):
+            if bins[i] is None:
+                bins[i] = nearest + distance * _ROTATION
+                distance += 1
+            else:
+                nearest, distance = bins[i], 1
+        return tuple(bins)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class _Cluster:
+    __slots__ = ("key", "signature", "buckets", "size", "last_seen")
+
+    def __init__(self, key: str, signature: Tuple[int, ...], now: float):
+        self.key = key
+        self.signature = signature
+        self.buckets: Set[Tuple[int, int]] = set()
+        self.size = 0
+        self.last_seen = now
+
+
+class LSHClusterer:
+    """Assigns items to clusters of near-duplicates; safe to call from concurrent threads."""
+
+    def __init__(
+        self,
+        permutations: int = 64,
+        bands: int = 16,
+        threshold: float = 0.5,
+        window_seconds: float = 3600,
+        max_clusters: int = 100000,
+    ):
+        if permutations % bands:
+            raise ValueError("permutations must be a multiple of bands")
+        self.hasher = MinHasher(permutations)
+        self.bands = bands
+        self.rows = permutations // bands
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.max_clusters = max_clusters
+        self._clusters: "OrderedDict[str, _Cluster]" = OrderedDict()  # least recently seen first
+        self._buckets: Dict[Tuple[int, int], str] = {}  # (band, band hash) -> cluster key
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+        rows = self.rows
+        return [(band, hash(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def assign(self, items: Iterable[str], now: float) -> Tuple[str, int]:
+        """(cluster key, cluster size including this item) for one item's shingles."""
+        signature = self.hasher.signature(items)
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            self._expire(now)
+            best, best_score = None, self.threshold
+            for key in {self._buckets.get(b) for b in band_keys} - {None}:
+                cluster = self._clusters[key]
+                score = similarity(signature, cluster.signature)
+                if score >= best_score:
+                    best, best_score = cluster, score
+            if best is None:
+                best = self._clusters.get(_cluster_key(signature))
+            if best is None:
+                best = _Cluster(_cluster_key(signature), signature, now)
+                self._clusters[best.key] = best
+                if len(self._clusters) > self.max_clusters:
+                    self._drop(next(iter(self._clusters.values())))
+            best.size += 1
+            best.last_seen = now
+            self._clusters.move_to_end(best.key)
+            # Members index their own bands too, so a cluster follows slow drift.
+            for band_key in band_keys:
+                if len(best.buckets) >= _MAX_BUCKETS_PER_CLUSTER:
+                    break
+                if band_key not in self._buckets:
+                    self._buckets[band_key] = best.key
+                    best.buckets.add(band_key)
+            return best.key, best.size
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._clusters:
+            oldest = next(iter(self._clusters.values()))
+            if oldest.last_seen >= cutoff:
+                return
+            self._drop(oldest)
+
+    def _drop(self, cluster: _Cluster) -> None:
+        del self._clusters[cluster.key]
+        for band_key in cluster.buckets:
+            if self._buckets.get(band_key) == cluster.key:
+                del self._buckets[band_key]
+
+    def size(self, key: str) -> int:
+        with self._lock:
+            cluster = self._clusters.get(key)
+            return cluster.size if cluster is not None else 0
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+
+def _cluster_key(signature: Tuple[int, ...]) -> str:
+    # Derived from the founding signature: a cluster keeps the key of whichever
+    # member arrived first, so keys depend on arrival order.
+    data = b"".join(v.to_bytes(9, "big") for v in signature)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
@@ -1,6 +1,36 @@
-from typing import Optional
+"""
+Root cause analysis.
+
+``simple_root_cause`` guesses from a single event. ``RootCauseEngine`` ranks
+candidates for a whole incident over a dependency graph learned from event
+labels (service -> resource -> namespace), optionally seeded with a
+topology file of extra edges. Learned edges expire once no event has
+carried them for ``RCA_EDGE_WINDOW_SECONDS``; topology edges are kept. Node ids match the incident correlation keys:
+``service:<namespace>/<name>``, ``resource:<name>``, ``namespace:<name>``.
+An edge ``a -> b`` means ``a`` depends on ``b``, so failures propagate from
+``b`` to ``a``.
+
+Each incident keeps an ``IncidentRanker``. When a node starts alarming, a
+depth- and size-bounded walk of its neighbourhood updates how many other
+alarming nodes it (transitively) supports, so an event costs the same
+whether the incident has ten nodes or ten thousand. Candidates score on:
+
+* coverage: share of the other alarming nodes that depend on it;
+* earliness: order in which it started alarming (causes usually fire first);
+* centrality: its number of dependents in the whole graph, normalized.
+"""
+import heapq
+import json
+import threading
+from collections import Counter, OrderedDict, defaultdict, deque
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from django.conf import settings
 
 from alerts.models import AlertEvent
+from core.lru import LRUCache
+
+WEIGHTS = {"coverage": 0.5, "earliness": 0.3, "centrality": 0.2}
 
 
 def simple_root_cause(event: AlertEvent) -> Optional[str]:
@@ -14,3 +44,221 @@ def simple_root_cause(event: AlertEvent) -> Optional[str]:
         return f"Host/Instance related: {event.resource}"
     return None
 
+
+def event_nodes(service: str, namespace: str, resource: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """(candidate nodes, dependency edges) described by one event's attributes."""
+    svc = f"service:{namespace}/{service}" if service else None
+    res = f"resource:{resource}" if resource else None
+    ns = f"namespace:{namespace}" if namespace else None
+    edges = []
+    if svc and res:
+        edges.append((svc, res))
+    if ns:
+        edges.extend((node, ns) for node in (res or svc,) if node)
+    # A namespace is only a candidate when nothing more specific is known;
+    # otherwise it would explain every incident in it.
+    candidates = [n for n in (res, svc) if n] or ([ns] if ns else [])
+    return candidates, edges
+
+
+class DependencyGraph:
+    """
+    Edges added without a time (topology file, manual) are pinned. Edges
+    learned from events carry the time they were last seen and expire once
+    idle for ``window_seconds``, oldest first, like the correlator's keys.
+    """
+
+    def __init__(self, window_seconds: Optional[float] = None):
+        self.window = window_seconds
+        self.depends_on: Dict[str, Set[str]] = defaultdict(set)
+        self.dependents: Dict[str, Set[str]] = defaultdict(set)
+        self.max_dependents = 1
+        self._pinned: Set[Tuple[str, str]] = set()
+        self._learned: "OrderedDict[Tuple[str, str], float]" = OrderedDict()  # edge -> seen, oldest first
+        self._max_stale = False  # an edge left the node with the most dependents
+        self._lock = threading.Lock()
+
+    def add_edge(self, node: str, dependency: str, at: Optional[float] = None) -> None:
+        if node == dependency:
+            return
+        edge = (node, dependency)
+        if at is None and edge in self._pinned:
+            return
+        with self._lock:
+            if at is None:
+                self._pinned.add(edge)
+                self._learned.pop(edge, None)
+            elif edge not in self._pinned:
+                self._learned.pop(edge, None)
+                self._learned[edge] = at
+                self._expire(at)
+            if dependency in self.depends_on.get(node, ()):
+                return
+            self.depends_on[node].add(dependency)
+            dependents = self.dependents[dependency]
+            dependents.add(node)
+            if len(dependents) > self.max_dependents:
+                self.max_dependents = len(dependents)
+
+    def _expire(self, now: float) -> None:
+        if self.window is None:
+            return
+        cutoff = now - self.window
+        while self._learned:
+            (node, dependency), seen = next(iter(self._learned.items()))
+            if seen >= cutoff:
+                break
+            self._learned.popitem(last=False)
+            self._remove(self.depends_on, node, dependency)
+            if len(self.dependents[dependency]) == self.max_dependents:
+                self._max_stale = True
+            self._remove(self.dependents, dependency, node)
+
+    @staticmethod
+    def _remove(adjacency: Dict[str, Set[str]], node: str, neighbour: str) -> None:
+        neighbours = adjacency[node]
+        neighbours.discard(neighbour)
+        if not neighbours:
+            del adjacency[node]
+
+    def add_edges(self, edges: Iterable[Tuple[str, str]], at: Optional[float] = None) -> None:
+        for node, dependency in edges:
+            self.add_edge(node, dependency, at)
+
+    def load(self, path: str) -> None:
+        """Add edges from a JSON file: ``{"edges": [["service:prod/api", "service:prod/db"], ...]}``."""
+        with open(path, encoding="utf-8") as f:
+            self.add_edges(tuple(edge) for edge in json.load(f).get("edges", []))
+
+    def centrality(self, node: str) -> float:
+        if self._max_stale:
+            with self._lock:
+                self.max_dependents = max(map(len, self.dependents.values()), default=1)
+                self._max_stale = False
+        return len(self.dependents.get(node, ())) / self.max_dependents
+
+    def within(self, node: str, direction: str, depth: int, limit: int) -> Iterator[str]:
+        """Nodes reachable from ``node`` along ``depends_on`` or ``dependents``, breadth first."""
+        adjacency = self.depends_on if direction == "depends_on" else self.dependents
+        seen = {node}
+        queue = deque([(node, 0)])
+        while queue:
+            current, level = queue.popleft()
+            if level == depth:
+                continue
+            for neighbour in tuple(adjacency.get(current, ())):
+                if neighbour in seen:
+                    continue
+                if len(seen) > limit:
+                    return
+                seen.add(neighbour)
+                yield neighbour
+                queue.append((neighbour, level + 1))
+
+    def __len__(self) -> int:
+        return len(set(self.depends_on) | set(self.dependents))
+
+
+class IncidentRanker:
+    def __init__(self, graph: DependencyGraph, max_depth: int = 3, max_visit: int = 256):
+        self.graph = graph
+        self.max_depth = max_depth
+        self.max_visit = max_visit
+        self.order: Dict[str, int] = {}  # node -> position in alarm order
+        self.first_seen: Dict[str, float] = {}
+        self.events: Counter = Counter()
+        self.explains: Counter = Counter()  # node -> alarming nodes depending on it
+        self._scores: Optional[Dict[str, Dict[str, float]]] = None  # until a new node alarms
+
+    def observe(self, nodes: Sequence[str], at: float) -> None:
+        for node in nodes:
+            self.events[node] += 1
+            if node in self.order:
+                continue
+            self.order[node] = len(self.order)
+            self.first_seen[node] = at
+            self._scores = None
+            for dependent in self.graph.within(node, "dependents", self.max_depth, self.max_visit):
+                if dependent in self.order:
+                    self.explains[node] += 1
+            for dependency in self.graph.within(node, "depends_on", self.max_depth, self.max_visit):
+                if dependency in self.order:
+                    self.explains[dependency] += 1
+
+    def absorb(self, other: "IncidentRanker") -> None:
+        for node in sorted(other.order, key=other.order.get):
+            self.observe([node], other.first_seen[node])
+            self.events[node] += other.events[node] - 1
+
+    def _score_all(self) -> Dict[str, Dict[str, float]]:
+        alarming = len(self.order)
+        others = max(alarming - 1, 1)
+        scores = {}
+        for node, position in self.order.items():
+            parts = {
+                "coverage": self.explains[node] / others,
+                "earliness": 1 - position / alarming,
+                "centrality": self.graph.centrality(node),
+            }
+            parts["score"] = sum(WEIGHTS[k] * v for k, v in parts.items())
+            scores[node] = parts
+        return scores
+
+    def ranking(self, limit: int = 5) -> List[Dict[str, float]]:
+        """Top candidates. Scores are recomputed only after a new node starts alarming."""
+        if self._scores is None:
+            self._scores = self._score_all()
+        top = heapq.nlargest(limit, self._scores.items(), key=lambda item: item[1]["score"])
+        return [
+            {"node": node, "events": self.events[node], **{k: round(v, 4) for k, v in parts.items()}}
+            for node, parts in top
+        ]
+
+
+class RootCauseEngine:
+    def __init__(self, graph: DependencyGraph, max_incidents: int = 1000, max_depth: int = 3):
+        self.graph = graph
+        self.max_depth = max_depth
+        self._rankers = LRUCache(max_incidents)
+        self._lock = threading.Lock()
+
+    def _ranker(self, incident_id: int) -> IncidentRanker:
+        ranker = self._rankers.get(incident_id)
+        if ranker is None:
+            ranker = IncidentRanker(self.graph, self.max_depth)
+            self._rankers.put(incident_id, ranker)
+        return ranker
+
+    def observe(self, incident_id: Optional[int], service: str, namespace: str, resource: str, at: float) -> None:
+        """Learn edges from an event and, if it belongs to an incident, rank it in."""
+        candidates, edges = event_nodes(service, namespace, resource)
+        with self._lock:
+            self.graph.add_edges(edges, at)
+            if incident_id is not None and candidates:
+                self._ranker(incident_id).observe(candidates, at)
+
+    def merge(self, incident_id: int, retired: Iterable[int]) -> None:
+        with self._lock:
+            ranker = self._ranker(incident_id)
+            for other_id in retired:
+                other = self._rankers.pop(other_id)
+                if other is not None:
+                    ranker.absorb(other)
+
+    def forget(self, incident_id: int) -> None:
+        self._rankers.pop(incident_id)
+
+    def ranking(self, incident_id: int, limit: int = 5) -> List[Dict[str, float]]:
+        with self._lock:
+            ranker = self._rankers.get(incident_id)
+            return ranker.ranking(limit) if ranker is not None else []
+
+
+def _build_engine() -> RootCauseEngine:
+    graph = DependencyGraph(window_seconds=settings.RCA_EDGE_WINDOW_SECONDS or None)
+    if settings.RCA_TOPOLOGY_FILE:
+        graph.load(settings.RCA_TOPOLOGY_FILE)
+    return RootCauseEngine(graph, max_depth=settings.RCA_MAX_DEPTH)
+
+
+engine = _build_engine()
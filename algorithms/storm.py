@@ -0,0 +1,171 @@
+"""
+Alert storm detection from exponentially weighted event rates.
+
+``EWMARate`` keeps one decayed counter: each event adds 1 and the counter
+decays with the configured half-life, so at a steady rate ``r`` it settles
+at ``r * tau`` and ``value / tau`` estimates events per second. Updates are
+O(1) and need no buckets or timestamps beyond the last one.
+
+``StormDetector`` tracks a global rate and one per key (source), and enters
+storm mode for a key when its rate reaches ``enter`` and leaves it only once
+the rate falls below ``exit``. Episodes count what happened during them, for
+the summary sent when they end.
+"""
+import math
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+GLOBAL = "*"
+
+
+class EWMARate:
+    __slots__ = ("tau", "value", "last")
+
+    def __init__(self, half_life: float):
+        self.tau = half_life / math.log(2)
+        self.value = 0.0
+        self.last: Optional[float] = None
+
+    def _decay(self, now: float) -> None:
+        if self.last is not None and now > self.last:
+            self.value *= math.exp((self.last - now) / self.tau)
+        if self.last is None or now > self.last:
+            self.last = now
+
+    def add(self, now: float, n: float = 1.0) -> None:
+        self._decay(now)
+        self.value += n
+
+    def rate(self, now: float) -> float:
+        """Events per second."""
+        self._decay(now)
+        return self.value / self.tau
+
+
+class Episode:
+    __slots__ = ("key", "started", "ended", "peak_rate", "events", "stored", "aggregated")
+
+    def __init__(self, key: Hashable, started: float, rate: float):
+        self.key = key
+        self.started = started
+        self.ended: Optional[float] = None
+        self.peak_rate = rate
+        self.events = 0
+        self.stored = 0
+        self.aggregated = 0
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "key": self.key,
+            "started": self.started,
+            "ended": self.ended,
+            "duration": round((self.ended or time.time()) - self.started, 1),
+            "peak_rate": round(self.peak_rate, 1),
+            "events": self.events,
+            "stored": self.stored,
+            "aggregated": self.aggregated,
+        }
+
+
+class _Tracked:
+    __slots__ = ("rate", "episode")
+
+    def __init__(self, half_life: float):
+        self.rate = EWMARate(half_life)
+        self.episode: Optional[Episode] = None
+
+
+class StormDetector:
+    """Global and per-key storm state; safe to feed from concurrent ingest threads."""
+
+    def __init__(
+        self,
+        half_life: float = 10.0,
+        enter: float = 200.0,
+        exit: float = 50.0,
+        key_enter: float = 100.0,
+        key_exit: float = 25.0,
+    ):
+        if exit > enter or key_exit > key_enter:
+            raise ValueError("storm exit rates must not exceed enter rates")
+        self.half_life = half_life
+        self.thresholds = {GLOBAL: (enter, exit)}
+        self.key_thresholds = (key_enter, key_exit)
+        self.entered = 0
+        self.exited = 0
+        self._tracked: Dict[Hashable, _Tracked] = {GLOBAL: _Tracked(half_life)}
+        self._lock = threading.Lock()
+
+    def _update(self, key: Hashable, tracked: _Tracked, now: float, wall: float) -> Optional[Episode]:
+        """Apply hysteresis to one key; returns an episode that just ended."""
+        enter, exit = self.thresholds.get(key, self.key_thresholds)
+        rate = tracked.rate.rate(now)
+        episode = tracked.episode
+        if episode is None:
+            if rate >= enter:
+                tracked.episode = Episode(key, wall, rate)
+                self.entered += 1
+            return None
+        if rate < exit:
+            episode.ended = wall
+            tracked.episode = None
+            self.exited += 1
+            return episode
+        episode.peak_rate = max(episode.peak_rate, rate)
+        return None
+
+    def observe(self, key: Hashable, now: float, wall: float) -> Tuple[List[Episode], List[Episode]]:
+        """
+        Count one event for ``key`` (``now`` monotonic, ``wall`` epoch seconds).
+        Returns (episodes the event belongs to, episodes that just ended).
+        """
+        ended = []
+        with self._lock:
+            tracked = self._tracked.get(key)
+            if tracked is None:
+                tracked = self._tracked[key] = _Tracked(self.half_life)
+            current = []
+            for k, t in ((GLOBAL, self._tracked[GLOBAL]), (key, tracked)):
+                t.rate.add(now)
+                done = self._update(k, t, now, wall)
+                if done is not None:
+                    ended.append(done)
+                if t.episode is not None:
+                    t.episode.events += 1
+                    current.append(t.episode)
+            return current, ended
+
+    def tally(self, episodes: List[Episode], stored: bool) -> None:
+        with self._lock:
+            for episode in episodes:
+                if stored:
+                    episode.stored += 1
+                else:
+                    episode.aggregated += 1
+
+    def active(self, key: Hashable) -> bool:
+        tracked = self._tracked.get(key)
+        return self._tracked[GLOBAL].episode is not None or (tracked is not None and tracked.episode is not None)
+
+    def poll(self, now: float, wall: float) -> List[Episode]:
+        """Re-evaluate every key without an event, so storms end even when traffic stops."""
+        with self._lock:
+            return [e for e in (self._update(k, t, now, wall) for k, t in self._tracked.items()) if e is not None]
+
+    def snapshot(self, now: float) -> Dict[str, object]:
+        with self._lock:
+            keys = {}
+            for key, tracked in self._tracked.items():
+                episode = tracked.episode
+                keys[key] = {
+                    "rate": round(tracked.rate.rate(now), 2),
+                    "storm": episode is not None,
+                    "episode": episode.as_dict() if episode is not None else None,
+                }
+            return {
+                "entered": self.entered,
+                "exited": self.exited,
+                "thresholds": {"global": self.thresholds[GLOBAL], "per_key": self.key_thresholds},
+                "keys": keys,
+            }
@@ -0,0 +1,39 @@
+from django.test import SimpleTestCase
+
+from algorithms.correlation import IncidentCorrelator
+
+
+class IncidentCorrelatorTests(SimpleTestCase):
+    def test_groups_sharing_a_key_merge(self):
+        correlator = IncidentCorrelator(window_seconds=60)
+        first = correlator.observe(1, ["resource:db-1"], now=0)
+        self.assertEqual((first.size, first.incident), (1, None))
+        correlator.observe(2, ["service:api"], now=1)
+        joined = correlator.observe(3, ["resource:db-1", "service:api"], now=2)
+        self.assertEqual(joined.size, 3)
+        self.assertEqual(sorted(correlator.members(joined.root)), [1, 2, 3])
+
+    def test_joining_group_moves_into_the_incident(self):
+        correlator = IncidentCorrelator(window_seconds=60)
+        root = correlator.observe(1, ["resource:db-1"], now=0).root
+        correlator.set_incident(root, 7)
+        joined = correlator.observe(2, ["resource:db-1"], now=1)
+        self.assertEqual((joined.incident, joined.retired, joined.moved), (7, [], [2]))
+
+    def test_merging_incidents_keeps_the_oldest(self):
+        correlator = IncidentCorrelator(window_seconds=60)
+        correlator.set_incident(correlator.observe(1, ["resource:a"], now=0).root, 5)
+        correlator.set_incident(correlator.observe(2, ["resource:b"], now=0).root, 9)
+        correlator.observe(3, ["resource:b"], now=1)
+        merged = correlator.observe(4, ["resource:a", "resource:b"], now=2)
+        self.assertEqual(merged.incident, 5)
+        self.assertEqual(merged.retired, [9])
+        self.assertEqual(sorted(merged.moved), [2, 3, 4])
+        self.assertEqual(merged.size, 4)
+
+    def test_idle_keys_and_components_expire(self):
+        correlator = IncidentCorrelator(window_seconds=60)
+        correlator.set_incident(correlator.observe(1, ["resource:db-1"], now=0).root, 5)
+        later = correlator.observe(2, ["resource:db-1"], now=100)
+        self.assertEqual((later.size, later.incident, later.moved), (1, None, []))
+        self.assertEqual(len(correlator), 1)
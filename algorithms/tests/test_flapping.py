@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+
+from algorithms.flapping import STARTED, STOPPED, WINDOW, FlapDetector
+
+
+def feed(detector, key, statuses):
+    return [detector.observe(key, status) for status in statuses]
+
+
+class FlapDetectorTests(SimpleTestCase):
+    def test_steady_status_never_flaps(self):
+        detector = FlapDetector(25, 50)
+        self.assertEqual({r for r in feed(detector, "g", ["firing"] * 50)}, {(False, None)})
+
+    def test_starts_once_and_stops_below_low(self):
+        detector = FlapDetector(25, 50)
+        results = feed(detector, "g", ["firing", "resolved"] * 10)
+        self.assertEqual([change for _, change in results if change], [STARTED])
+        results = feed(detector, "g", ["firing"] * WINDOW)
+        self.assertEqual([change for _, change in results if change], [STOPPED])
+        self.assertFalse(results[-1][0])
+
+    def test_hysteresis_between_thresholds(self):
+        detector = FlapDetector(25, 50)
+        feed(detector, "g", ["firing", "resolved"] * 10)
+        # a few quiet samples pull the score below high but not below low
+        results = feed(detector, "g", ["resolved"] * 3)
+        self.assertEqual(results, [(True, None)] * 3)
+
+    def test_seeded_flapping_does_not_stop_on_first_sample(self):
+        detector = FlapDetector(25, 50)
+        self.assertEqual(detector.observe("g", "firing", was_flapping=True), (True, None))
+        results = feed(detector, "g", ["firing"] * WINDOW)
+        self.assertEqual([change for _, change in results if change], [STOPPED])
+        self.assertEqual(results[0], (True, None))
+
+    def test_peek_does_not_record(self):
+        detector = FlapDetector(25, 50)
+        feed(detector, "g", ["firing", "resolved"] * 5)
+        for _ in range(5):
+            peeked = detector.peek("g", "firing")
+        self.assertEqual(detector.observe("g", "firing"), peeked)
+        self.assertEqual(detector.peek("other", "firing", was_flapping=True), (True, None))
+        self.assertFalse(detector.is_tracked("other"))
+
+    def test_forget_drops_state(self):
+        detector = FlapDetector(25, 50)
+        feed(detector, "g", ["firing", "resolved"] * 10)
+        detector.forget("g")
+        self.assertEqual(detector.observe("g", "firing"), (False, None))
+
+    def test_rejects_bad_thresholds(self):
+        with self.assertRaises(ValueError):
+            FlapDetector(60, 50)
@@ -0,0 +1,65 @@
+import random
+from collections import Counter
+
+from django.test import SimpleTestCase
+
+from algorithms.heavy_hitters import HeavyHitterTracker, SpaceSaving, WindowedTopK
+
+
+class SpaceSavingTests(SimpleTestCase):
+    def test_exact_below_capacity(self):
+        sketch = SpaceSaving(10)
+        for item in "aababcabcd":
+            sketch.add(item)
+        self.assertEqual({k: c for k, (c, _) in sketch.counters.items()}, {"a": 4, "b": 3, "c": 2, "d": 1})
+        self.assertEqual(sketch.floor, 0)
+
+    def test_counts_bound_true_counts(self):
+        rng = random.Random(7)
+        stream = [f"hot{rng.randrange(5)}" if rng.random() < 0.5 else f"cold{rng.randrange(2000)}"
+                  for _ in range(20000)]
+        truth = Counter(stream)
+        sketch = SpaceSaving(50)
+        for item in stream:
+            sketch.add(item)
+        self.assertEqual(len(sketch.counters), 50)
+        for item, (count, error) in sketch.counters.items():
+            self.assertLessEqual(count - error, truth[item])
+            self.assertGreaterEqual(count, truth[item])
+        for i in range(5):
+            self.assertIn(f"hot{i}", sketch.counters)
+        untracked = max(n for item, n in truth.items() if item not in sketch.counters)
+        self.assertLessEqual(untracked, sketch.floor)
+
+
+class WindowedTopKTests(SimpleTestCase):
+    def test_old_panes_leave_the_window(self):
+        topk = WindowedTopK(window_seconds=60, capacity=10, panes=6)
+        for _ in range(5):
+            topk.add("old", now=0)
+        for _ in range(3):
+            topk.add("new", now=55)
+        self.assertEqual(topk.top(2, now=59), [("old", 5, 0), ("new", 3, 0)])
+        self.assertEqual(topk.top(2, now=65), [("new", 3, 0)])
+
+    def test_merged_panes_over_estimate_by_at_most_error(self):
+        topk = WindowedTopK(window_seconds=60, capacity=2, panes=2)
+        for item in "aaab":
+            topk.add(item, now=0)
+        for item in "cca":
+            topk.add(item, now=30)
+        counts = {item: (count, error) for item, count, error in topk.top(3, now=30)}
+        truth = {"a": 4, "b": 1, "c": 2}
+        for item, (count, error) in counts.items():
+            self.assertGreaterEqual(count, truth[item])
+            self.assertLessEqual(count - error, truth[item])
+
+
+class HeavyHitterTrackerTests(SimpleTestCase):
+    def test_tracks_each_dimension_and_window(self):
+        tracker = HeavyHitterTracker(dimensions=("service", "resource"), windows=(60, 3600), capacity=10)
+        tracker.observe({"service": "api", "resource": "db-1"}, now=0)
+        tracker.observe({"service": "api", "resource": ""}, now=100)
+        self.assertEqual(tracker.top("service", 3600, now=100), [("api", 2, 0)])
+        self.assertEqual(tracker.top("service", 60, now=100), [("api", 1, 0)])
+        self.assertEqual(tracker.top("resource", 3600, now=100), [("db-1", 1, 0)])
@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase
+
+from algorithms.hyperloglog import HyperLogLog
+
+
+class HyperLogLogTests(SimpleTestCase):
+    def test_estimates_within_error(self):
+        for n in (10, 1000, 50000):
+            sketch = HyperLogLog(12)
+            sketch.update(f"item-{i}" for i in range(n))
+            sketch.update(f"item-{i}" for i in range(n))  # duplicates do not count
+            self.assertAlmostEqual(sketch.count(), n, delta=max(2, n * 0.05))
+
+    def test_merge_is_union(self):
+        a, b = HyperLogLog(12), HyperLogLog(12)
+        a.update(f"x{i}" for i in range(3000))
+        b.update(f"x{i}" for i in range(2000, 5000))
+        a.merge(b)
+        self.assertAlmostEqual(a.count(), 5000, delta=250)
+
+    def test_copy_is_independent(self):
+        a = HyperLogLog(10)
+        a.update(["a", "b"])
+        b = a.copy()
+        b.update(f"y{i}" for i in range(100))
+        self.assertEqual(a.count(), 2)
+
+    def test_rejects_bad_precision(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(3)
+        with self.assertRaises(ValueError):
+            HyperLogLog(12).merge(HyperLogLog(10))
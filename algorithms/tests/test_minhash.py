@@ -0,0 +1,66 @@
+import random
+
+from django.test import SimpleTestCase
+
+from algorithms.minhash import LSHClusterer, MinHasher, normalize, shingles, similarity
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_masks_numbers_and_ids(self):
+        self.assertEqual(normalize("CPU High - Event #123"), normalize("cpu_high_event_4567"))
+        self.assertEqual(normalize("pod 5f3c2a9b restarted"), normalize("pod 0e1d77aa restarted"))
+        self.assertEqual(normalize("job 123e4567-e89b-12d3-a456-426614174000 failed"), "job <uuid> failed")
+
+
+class MinHasherTests(SimpleTestCase):
+    def test_estimates_jaccard(self):
+        rng = random.Random(3)
+        hasher = MinHasher(256)
+        universe = [f"s{i}" for i in range(400)]
+        for _ in range(20):
+            a, b = set(rng.sample(universe, 200)), set(rng.sample(universe, 200))
+            estimate = similarity(hasher.signature(a), hasher.signature(b))
+            self.assertAlmostEqual(estimate, jaccard(a, b), delta=0.12)
+
+    def test_identical_sets_agree_everywhere(self):
+        hasher = MinHasher()
+        items = shingles("Disk usage above 90% on /var")
+        self.assertEqual(hasher.signature(items), hasher.signature(set(items)))
+
+
+class LSHClustererTests(SimpleTestCase):
+    def test_near_duplicates_share_a_cluster(self):
+        clusterer = LSHClusterer()
+        first, _ = clusterer.assign(shingles("CPU Usage High on server 12 - Event #123"), now=0)
+        second, size = clusterer.assign(shingles("cpu usage high on server 977 - event #4567"), now=1)
+        other, _ = clusterer.assign(shingles("Kafka consumer lag growing for orders topic"), now=2)
+        self.assertEqual((first, size), (second, 2))
+        self.assertNotEqual(first, other)
+
+    def test_key_is_stable_as_members_join(self):
+        founder = shingles("Memory pressure on node-7 exceeds threshold")
+        key, _ = LSHClusterer().assign(founder, now=0)
+        clusterer = LSHClusterer()
+        self.assertEqual(clusterer.assign(founder, now=0)[0], key)  # same founder, same key in any process
+        for i in range(20):
+            joined, _ = clusterer.assign(shingles(f"Memory pressure on node-{i} exceeds threshold!"), now=i)
+            self.assertEqual(joined, key)
+        self.assertEqual(clusterer.size(key), 21)
+
+    def test_idle_clusters_expire(self):
+        clusterer = LSHClusterer(window_seconds=60)
+        key, _ = clusterer.assign(shingles("Replica lag on db-3"), now=0)
+        clusterer.assign(shingles("Certificate expires soon"), now=100)
+        self.assertEqual(clusterer.size(key), 0)
+        self.assertEqual(len(clusterer), 1)
+
+    def test_max_clusters_drops_least_recent(self):
+        clusterer = LSHClusterer(max_clusters=2)
+        keys = [clusterer.assign(shingles(text), now=i)[0]
+                for i, text in enumerate(["Disk full", "Kafka lag growing", "TLS handshake errors"])]
+        self.assertEqual(len(clusterer), 2)
+        self.assertEqual(clusterer.size(keys[0]), 0)
@@ -0,0 +1,89 @@
+from django.test import SimpleTestCase
+
+from algorithms.rca import DependencyGraph, IncidentRanker, RootCauseEngine
+
+
+def chain_graph():
+    # api and web depend on db, db depends on disk
+    graph = DependencyGraph()
+    graph.add_edges([("api", "db"), ("web", "db"), ("db", "disk")])
+    return graph
+
+
+class IncidentRankerTests(SimpleTestCase):
+    def test_coverage_ranks_the_shared_dependency_first(self):
+        ranker = IncidentRanker(chain_graph())
+        ranker.observe(["api"], at=0)
+        ranker.observe(["web"], at=1)
+        ranker.observe(["db"], at=2)
+        ranking = ranker.ranking()
+        self.assertEqual(ranking[0]["node"], "db")
+        self.assertEqual(ranking[0]["coverage"], 1.0)
+        self.assertEqual({r["node"]: r["coverage"] for r in ranking[1:]}, {"api": 0.0, "web": 0.0})
+
+    def test_earliness_breaks_ties(self):
+        ranker = IncidentRanker(chain_graph())
+        ranker.observe(["web"], at=0)
+        ranker.observe(["api"], at=1)
+        self.assertEqual([r["node"] for r in ranker.ranking()], ["web", "api"])
+        self.assertEqual([r["earliness"] for r in ranker.ranking()], [1.0, 0.5])
+
+    def test_repeated_events_keep_the_first_position(self):
+        ranker = IncidentRanker(chain_graph())
+        ranker.observe(["db"], at=0)
+        ranker.observe(["api"], at=1)
+        ranker.observe(["api"], at=2)
+        top = ranker.ranking(1)[0]
+        self.assertEqual((top["node"], top["events"], top["earliness"]), ("db", 1, 1.0))
+        self.assertEqual(ranker.ranking()[1]["events"], 2)
+
+
+class RootCauseEngineTests(SimpleTestCase):
+    def test_merge_absorbs_retired_incidents(self):
+        engine = RootCauseEngine(DependencyGraph())
+        engine.observe(1, "api", "prod", "db-1", at=0)
+        engine.observe(2, "web", "prod", "db-1", at=1)
+        engine.observe(2, "web", "prod", "", at=2)
+        engine.merge(1, [2])
+        ranking = {r["node"]: r for r in engine.ranking(1)}
+        self.assertEqual(set(ranking), {"resource:db-1", "service:prod/api", "service:prod/web"})
+        self.assertEqual(ranking["resource:db-1"]["events"], 2)
+        self.assertEqual(ranking["service:prod/web"]["events"], 2)
+        self.assertEqual(engine.ranking(1, 1)[0]["node"], "resource:db-1")
+        self.assertEqual(engine.ranking(2), [])
+
+    def test_forget_drops_the_ranking(self):
+        engine = RootCauseEngine(DependencyGraph())
+        engine.observe(1, "api", "prod", "db-1", at=0)
+        engine.forget(1)
+        self.assertEqual(engine.ranking(1), [])
+
+
+class DependencyGraphTests(SimpleTestCase):
+    def test_learned_edges_expire_when_idle(self):
+        graph = DependencyGraph(window_seconds=60)
+        graph.add_edge("api", "db", at=0)
+        graph.add_edge("web", "db", at=0)
+        graph.add_edge("api", "db", at=50)
+        graph.add_edge("batch", "queue", at=100)
+        self.assertEqual(graph.dependents["db"], {"api"})
+        self.assertNotIn("web", graph.depends_on)
+        self.assertEqual(graph.centrality("db"), 1.0)
+        graph.add_edge("batch", "queue", at=200)
+        self.assertEqual(len(graph), 2)
+
+    def test_pinned_edges_are_kept(self):
+        graph = DependencyGraph(window_seconds=60)
+        graph.add_edge("api", "db")
+        graph.add_edge("api", "db", at=0)
+        graph.add_edge("web", "db", at=0)
+        graph.add_edge("batch", "queue", at=100)
+        self.assertEqual(graph.dependents["db"], {"api"})
+
+    def test_max_dependents_shrinks_after_expiry(self):
+        graph = DependencyGraph(window_seconds=60)
+        graph.add_edges([("api", "db"), ("web", "db")], at=0)
+        graph.add_edge("api", "cache")
+        self.assertEqual(graph.centrality("cache"), 0.5)
+        graph.add_edge("batch", "queue", at=100)
+        self.assertEqual(graph.centrality("cache"), 1.0)
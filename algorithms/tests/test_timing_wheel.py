@@ -0,0 +1,64 @@
+import random
+
+from django.test import SimpleTestCase
+
+from algorithms.timing_wheel import TimingWheel
+
+
+class TimingWheelTests(SimpleTestCase):
+    def test_fires_at_due_tick_in_order(self):
+        wheel = TimingWheel(1.0, start=0)
+        wheel.schedule("b", 5, "B")
+        wheel.schedule("a", 3, "A")
+        self.assertEqual(wheel.advance(2), [])
+        self.assertEqual(wheel.advance(4), [("a", "A")])
+        self.assertEqual(wheel.advance(5), [("b", "B")])
+        self.assertEqual(len(wheel), 0)
+
+    def test_past_deadline_fires_on_next_advance(self):
+        wheel = TimingWheel(1.0, start=100)
+        wheel.schedule("late", 10)
+        self.assertEqual(wheel.advance(100), [("late", None)])
+
+    def test_cancel_and_reschedule(self):
+        wheel = TimingWheel(1.0, start=0)
+        wheel.schedule("x", 10, 1)
+        wheel.schedule("x", 20, 2)
+        self.assertEqual(wheel.pending("x"), (20.0, 2))
+        self.assertEqual(wheel.advance(15), [])
+        self.assertTrue(wheel.cancel("x"))
+        self.assertFalse(wheel.cancel("x"))
+        self.assertEqual(wheel.advance(30), [])
+
+    def test_cascades_through_levels(self):
+        wheel = TimingWheel(1.0, start=0, levels=4)
+        due = {"l0": 10, "l1": 70, "l2": 5000, "l3": 300000}
+        for key, at in due.items():
+            wheel.schedule(key, at)
+        fired = {}
+        for now in range(0, 300000 + 7, 7):
+            for key, _ in wheel.advance(now):
+                fired[key] = now
+        self.assertEqual({k: due[k] <= t < due[k] + 7 for k, t in fired.items()}, {k: True for k in due})
+
+    def test_beyond_span_is_parked_not_fired_early(self):
+        wheel = TimingWheel(1.0, start=0, levels=2)  # spans 4096 ticks
+        wheel.schedule("far", 10000)
+        self.assertEqual(wheel.advance(9999), [])
+        self.assertEqual(wheel.advance(10000), [("far", None)])
+
+    def test_matches_sorted_reference(self):
+        rng = random.Random(7)
+        wheel = TimingWheel(0.5, start=0, levels=3)
+        due = {i: rng.uniform(0, 50000) for i in range(2000)}
+        for key, at in due.items():
+            wheel.schedule(key, at)
+        now, fired = 0.0, []
+        while len(wheel):
+            previous, now = now, now + rng.uniform(0, 400)
+            for key, _ in wheel.advance(now):
+                # due within the tick reached, and not already due at the previous advance
+                self.assertLessEqual(due[key] // 0.5, now // 0.5)
+                self.assertGreater(due[key] // 0.5, previous // 0.5)
+                fired.append(key)
+        self.assertEqual(sorted(fired), sorted(due))
@@ -0,0 +1,106 @@
+"""
+Hierarchical timing wheel (Varghese & Lauck, as in the classic Linux timer
+wheel).
+
+Time advances in ticks. Level 0 has one slot per tick for the next 64
+ticks, level 1 one slot per 64 ticks for the next 64**2, and so on. A timer
+lands in the lowest level whose span covers its delay; when a lower wheel
+wraps around, the matching slot of the level above is cascaded down and its
+timers re-filed. Slots are dicts keyed by timer key, so scheduling and
+cancelling are O(1) whatever the number of pending timers, and each timer is
+moved at most once per level. Delays beyond the top level's span are parked
+in its farthest slot and re-filed from their real deadline on each pass.
+"""
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+_BITS = 6
+_SIZE = 1 << _BITS
+_MASK = _SIZE - 1
+
+
+class _Timer:
+    __slots__ = ("key", "tick", "payload", "slot")
+
+    def __init__(self, key: Hashable, tick: int, payload: Any):
+        self.key = key
+        self.tick = tick
+        self.payload = payload
+        self.slot: Optional[Dict[Hashable, "_Timer"]] = None
+
+
+class TimingWheel:
+    def __init__(self, tick_seconds: float = 1.0, start: float = 0.0, levels: int = 4):
+        self.tick_seconds = tick_seconds
+        self.levels = levels
+        self.current = int(start // tick_seconds)
+        self._wheels: List[List[Dict[Hashable, _Timer]]] = [[{} for _ in range(_SIZE)] for _ in range(levels)]
+        self._timers: Dict[Hashable, _Timer] = {}
+        self._span = _SIZE ** levels
+
+    def schedule(self, key: Hashable, at: float, payload: Any = None) -> None:
+        """Fire ``key`` with ``payload`` once time ``at`` is reached; replaces a pending timer with that key."""
+        self.cancel(key)
+        timer = _Timer(key, int(at // self.tick_seconds), payload)
+        self._timers[key] = timer
+        self._file(timer)
+
+    def cancel(self, key: Hashable) -> bool:
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        del timer.slot[key]
+        return True
+
+    def pending(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """(due time, payload) of a pending timer, or None."""
+        timer = self._timers.get(key)
+        return (timer.tick * self.tick_seconds, timer.payload) if timer is not None else None
+
+    def _file(self, timer: _Timer) -> None:
+        tick = max(timer.tick, self.current)
+        delta = tick - self.current
+        if delta >= self._span:
+            tick = self.current + self._span - 1
+            delta = self._span - 1
+        level = 0
+        while delta >= _SIZE ** (level + 1):
+            level += 1
+        slot = self._wheels[level][(tick >> (_BITS * level)) & _MASK]
+        slot[timer.key] = timer
+        timer.slot = slot
+
+    def _cascade(self, level: int) -> int:
+        index = (self.current >> (_BITS * level)) & _MASK
+        slot = self._wheels[level][index]
+        self._wheels[level][index] = {}
+        for timer in slot.values():
+            self._file(timer)
+        return index
+
+    def advance(self, now: float) -> List[Tuple[Hashable, Any]]:
+        """Move time forward to ``now``; returns (key, payload) of every timer that came due, in order."""
+        target = int(now // self.tick_seconds)
+        fired: List[Tuple[Hashable, Any]] = []
+        while self.current <= target:
+            if not self._timers:
+                self.current = target + 1
+                break
+            index = self.current & _MASK
+            if index == 0:
+                level = 1
+                while level < self.levels and self._cascade(level) == 0:
+                    level += 1
+            slot = self._wheels[0][index]
+            if slot:
+                self._wheels[0][index] = {}
+                for timer in slot.values():
+                    if timer.tick > self.current:  # parked beyond the top level's span
+                        self._file(timer)
+                        continue
+                    del self._timers[timer.key]
+                    fired.append((timer.key, timer.payload))
+            self.current += 1
+        return fired
+
+    def __len__(self) -> int:
+        return len(self._timers)
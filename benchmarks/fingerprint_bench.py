@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Fingerprint microbenchmark: hashes per second for each scheme, on all
+distinct inputs (every call misses the memo) and on a stream that repeats a
+smaller set of label sets. Touches no database.
+
+    python benchmarks/fingerprint_bench.py --n 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alert_engine.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from core import fingerprint  # noqa: E402
+from core.utils import canonical_json  # noqa: E402
+
+
+def make_alerts(n: int, distinct: int):
+    alerts = []
+    for i in range(n):
+        k = i % distinct
+        labels = {
+            "alertname": f"alert_{k % 50}",
+            "instance": f"server{k:05d}:9100",
+            "job": "node",
+            "severity": "warning",
+            "team": "sre",
+            "env": "prod",
+        }
+        alerts.append(("prometheus", labels, "node_cpu_seconds_total", f"High CPU {k % 50}"))
+    return alerts
+
+
+def bench(label: str, alerts, scheme: str, with_json: bool = False) -> None:
+    fingerprint.reset_policies()
+    started = time.perf_counter()
+    for source, labels, metric, title in alerts:
+        fingerprint.compute(
+            source=source, labels=labels, metric=metric, title=title, scheme=scheme,
+            labels_json=canonical_json(labels) if with_json else None,
+        )
+    elapsed = time.perf_counter() - started
+    print(f"{label:<36} {len(alerts) / elapsed:>12,.0f} hashes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=100000, help="Alerts hashed per run")
+    parser.add_argument("--distinct", type=int, default=1000, help="Distinct label sets among them")
+    args = parser.parse_args()
+
+    unique = make_alerts(args.n, args.n)
+    repeated = make_alerts(args.n, args.distinct)
+    for scheme in ("v1", "v2"):
+        bench(f"{scheme} all distinct", unique, scheme)
+        bench(f"{scheme} {args.distinct} distinct", repeated, scheme)
+    bench(f"v1 {args.distinct} distinct + canonical_json", repeated, "v1", with_json=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Label storage benchmark: bytes per event and label index size with labels
+inline on every event row versus interned into shared label sets.
+
+Builds both layouts in throwaway SQLite databases with --events events drawn
+from --distinct label sets, and reads table and index sizes from SQLite's
+dbstat table. The inline layout's index is a (key, value, event) posting per
+label of every event, which is what indexing labels without interning costs;
+the interned layout posts each distinct set once (alert_label_entry).
+
+    python benchmarks/labelset_bench.py --events 200000 --distinct 2000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils import canonical_json, sha256_hexdigest  # noqa: E402
+
+_EVENT_COLUMNS = "id INTEGER PRIMARY KEY, fingerprint VARCHAR(128), title VARCHAR(255), created_at DATETIME"
+
+
+def make_label_sets(n: int, rng: random.Random):
+    return [
+        {
+            "alertname": f"alert_{rng.randrange(300)}",
+            "instance": f"server{i:05d}:9100",
+            "job": rng.choice(["node", "mysql", "redis", "kafka"]),
+            "severity": rng.choice(["critical", "warning", "info"]),
+            "team": rng.choice(["sre", "dba", "platform"]),
+            "env": rng.choice(["prod", "staging"]),
+            "region": rng.choice(["eu-west-1", "us-east-1", "ap-south-1"]),
+        }
+        for i in range(n)
+    ]
+
+
+def sizes(db: sqlite3.Connection):
+    db.commit()
+    return dict(db.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+
+
+def event_rows(events):
+    for i, (fingerprint, ref) in enumerate(events, 1):
+        yield i, fingerprint, "High CPU usage", "2024-01-01 00:00:00", ref
+
+
+def inline(label_sets, choices):
+    db = sqlite3.connect(":memory:")
+    db.execute(f"CREATE TABLE alert_event ({_EVENT_COLUMNS}, labels TEXT)")
+    db.execute("CREATE TABLE label_posting (event_id INTEGER, key VARCHAR(128), value VARCHAR(255))")
+    db.execute("CREATE INDEX label_posting_idx ON label_posting (key, value, event_id)")
+    encoded = [canonical_json(labels) for labels in label_sets]
+    events = [(sha256_hexdigest(encoded[k]), encoded[k]) for k in choices]
+    db.executemany("INSERT INTO alert_event VALUES (?, ?, ?, ?, ?)", event_rows(events))
+    db.executemany("INSERT INTO label_posting VALUES (?, ?, ?)", (
+        (i, key, value) for i, k in enumerate(choices, 1) for key, value in label_sets[k].items()
+    ))
+    return sizes(db)
+
+
+def interned(label_sets, choices):
+    db = sqlite3.connect(":memory:")
+    db.execute(f"CREATE TABLE alert_event ({_EVENT_COLUMNS}, label_set_id INTEGER)")
+    db.execute("CREATE TABLE alert_label_set (id INTEGER PRIMARY KEY, hash VARCHAR(64) UNIQUE, labels TEXT)")
+    db.execute("CREATE TABLE alert_label_entry (id INTEGER PRIMARY KEY, label_set_id INTEGER, "
+               "key VARCHAR(128), value VARCHAR(255))")
+    db.execute("CREATE INDEX alert_label_entry_idx ON alert_label_entry (key, value, label_set_id)")
+    encoded = [canonical_json(labels) for labels in label_sets]
+    db.executemany("INSERT INTO alert_label_set VALUES (?, ?, ?)", (
+        (k + 1, sha256_hexdigest(text), text) for k, text in enumerate(encoded)
+    ))
+    db.executemany("INSERT INTO alert_label_entry (label_set_id, key, value) VALUES (?, ?, ?)", (
+        (k + 1, key, value) for k, labels in enumerate(label_sets) for key, value in labels.items()
+    ))
+    events = [(sha256_hexdigest(encoded[k]), k + 1) for k in choices]
+    db.executemany("INSERT INTO alert_event VALUES (?, ?, ?, ?, ?)", event_rows(events))
+    return sizes(db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--distinct", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    label_sets = make_label_sets(args.distinct, rng)
+    choices = [rng.randrange(args.distinct) for _ in range(args.events)]
+
+    before = inline(label_sets, choices)
+    after = interned(label_sets, choices)
+    n = args.events
+    rows = [
+        ("event table", before["alert_event"], after["alert_event"]),
+        ("label sets", 0, after["alert_label_set"] + after.get("sqlite_autoindex_alert_label_set_1", 0)),
+        ("label postings", before["label_posting"], after["alert_label_entry"]),
+        ("label index", before["label_posting_idx"], after["alert_label_entry_idx"]),
+    ]
+    print(f"{n:,} events, {args.distinct:,} distinct label sets")
+    print(f"{'':16} {'inline':>12} {'interned':>12}")
+    for name, inline_bytes, interned_bytes in rows:
+        print(f"{name:16} {inline_bytes / n:>9.1f} B/e {interned_bytes / n:>9.1f} B/e")
+    total_before = sum(r[1] for r in rows)
+    total_after = sum(r[2] for r in rows)
+    print(f"{'total':16} {total_before / n:>9.1f} B/e {total_after / n:>9.1f} B/e  "
+          f"({(1 - total_after / total_before) * 100:.0f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
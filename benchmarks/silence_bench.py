@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Silence check benchmark: per-event lookups against --silences silences
+(maintenance windows on instances and services, a few regex-only ones and
+some not yet started or already over), through SilenceIndex and through a
+linear scan of every silence. Touches no database.
+
+    python benchmarks/silence_bench.py --silences 10000 --events 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alert_engine.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from core.matchers import Matcher  # noqa: E402
+from rules.silences import SilenceIndex  # noqa: E402
+
+
+def make_silences(n: int, now: float, rng: random.Random):
+    silences = []
+    for i in range(n):
+        kind = rng.random()
+        if kind < 0.6:
+            matchers = [Matcher("instance", "=", f"server{rng.randrange(50000):05d}:9100")]
+        elif kind < 0.9:
+            matchers = [
+                Matcher("service", "=", f"svc{rng.randrange(2000)}"),
+                Matcher("severity", "!=", "critical"),
+            ]
+        elif kind < 0.99:
+            matchers = [
+                Matcher("alertname", "=", f"alert_{rng.randrange(300)}"),
+                Matcher("instance", "=~", f"server{rng.randrange(500):03d}.*"),
+            ]
+        else:
+            matchers = [Matcher("instance", "=~", f"server{rng.randrange(100):02d}9.*")]
+        starts = now + rng.uniform(-7200, 3600)
+        silences.append((i + 1, matchers, starts, starts + rng.uniform(600, 14400)))
+    return silences
+
+
+def make_events(n: int, rng: random.Random):
+    return [
+        {
+            "alertname": f"alert_{rng.randrange(300)}",
+            "instance": f"server{rng.randrange(50000):05d}:9100",
+            "service": f"svc{rng.randrange(2000)}",
+            "severity": rng.choice(["critical", "warning", "info"]),
+            "job": "node",
+            "source": "prometheus",
+        }
+        for _ in range(n)
+    ]
+
+
+def linear(silences, labels, now):
+    for sid, matchers, starts, ends in silences:
+        if starts <= now < ends and all(m.matches(labels) for m in matchers):
+            return sid
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--silences", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = time.time()
+    silences = make_silences(args.silences, now, rng)
+    events = make_events(args.events, rng)
+
+    index = SilenceIndex()
+    started = time.perf_counter()
+    index.load(silences)
+    print(f"load {args.silences:,} silences: {(time.perf_counter() - started) * 1000:.1f} ms, "
+          f"{len(index.active_ids(now)):,} active")
+
+    started = time.perf_counter()
+    hits = sum(index.match(labels, now) is not None for labels in events)
+    elapsed = time.perf_counter() - started
+    print(f"index:  {elapsed / len(events) * 1e6:>9.2f} us/event  ({hits:,} silenced)")
+
+    sample = events[: max(len(events) // 100, 100)]
+    started = time.perf_counter()
+    linear_hits = sum(linear(silences, labels, now) is not None for labels in sample)
+    elapsed = time.perf_counter() - started
+    print(f"linear: {elapsed / len(sample) * 1e6:>9.2f} us/event  (on {len(sample):,} events)")
+    index_hits = sum(index.match(labels, now) is not None for labels in sample)
+    assert index_hits == linear_hits, (index_hits, linear_hits)
+
+
+if __name__ == "__main__":
+    main()
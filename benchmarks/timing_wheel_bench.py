@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Timing wheel benchmark: schedule --timers escalation-like timers (minutes to
+days out), cancel a share of them as groups get acknowledged, then advance
+the clock second by second until all have fired. Touches no database.
+
+    python benchmarks/timing_wheel_bench.py --timers 1000000 --cancel 0.5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.timing_wheel import TimingWheel  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--timers", type=int, default=1000000)
+    parser.add_argument("--cancel", type=float, default=0.5, help="Share of timers cancelled before they fire")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = 1_700_000_000.0
+    delays = [rng.choice((300, 900, 1800, 3600, 14400)) + rng.uniform(0, 86400) for _ in range(args.timers)]
+    wheel = TimingWheel(1.0, start=start)
+
+    started = time.perf_counter()
+    for key, delay in enumerate(delays):
+        wheel.schedule(key, start + delay)
+    elapsed = time.perf_counter() - started
+    print(f"schedule {args.timers:,}: {elapsed / args.timers * 1e6:.2f} us/timer")
+
+    cancelled = rng.sample(range(args.timers), int(args.timers * args.cancel))
+    started = time.perf_counter()
+    for key in cancelled:
+        wheel.cancel(key)
+    elapsed = time.perf_counter() - started
+    print(f"cancel {len(cancelled):,}: {elapsed / max(len(cancelled), 1) * 1e6:.2f} us/timer")
+
+    horizon = start + max(delays) + 1
+    now, fired = start, 0
+    started = time.perf_counter()
+    while now < horizon:
+        now += 1
+        fired += len(wheel.advance(now))
+    elapsed = time.perf_counter() - started
+    ticks = int(horizon - start)
+    print(f"advance {ticks:,} ticks: {elapsed:.2f} s, {fired:,} fired, {elapsed / ticks * 1e6:.2f} us/tick")
+    assert fired == args.timers - len(cancelled) and not len(wheel)
+
+
+if __name__ == "__main__":
+    main()
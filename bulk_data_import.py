@@ -18,7 +18,10 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alert_engine.settings')
 django.setup()
 
-from alerts.models import AlertEvent, AlertGroup, AlertStatus, Severity
+from django.utils import timezone
+
+from alerts import rollups
+from alerts.models import AlertGroup, AlertStatus, Severity
 from rules.models import Rule
 from knowledge.models import KBArticle
 from alerts.services import ingest_standard_alert
@@ -266,38 +269,39 @@ class BulkDataGenerator:
         self.log("数据导入统计")
         self.log("="*60)
         
-        # 统计数据库记录
-        event_count = AlertEvent.objects.count()
+        # 事件维度统计读取 rollup 表，避免全表 COUNT。rollup 统计的是接收的事件，
+        # 包括风暴期间合并未入库的事件和已被清理的事件，与 alert_event 行数不同
+        event_count = rollups.query()[0]["count"]
         group_count = AlertGroup.objects.count()
         
-        self.log(f"告警事件总数: {event_count:,}")
+        self.log(f"已接收告警事件数（rollup）: {event_count:,}")
         self.log(f"告警分组总数: {group_count:,}")
         
         # 严重级别分布
         self.log("\n严重级别分布:")
+        severity_counts = dict(rollups.totals_by("severity"))
         for severity in Severity.choices:
-            count = AlertEvent.objects.filter(severity=severity[0]).count()
+            count = severity_counts.get(severity[0], 0)
             percentage = (count / event_count * 100) if event_count > 0 else 0
             self.log(f"  {severity[1]:10s}: {count:8,} ({percentage:5.2f}%)")
         
         # 状态分布
         self.log("\n状态分布:")
+        status_counts = dict(rollups.totals_by("status"))
         for status in AlertStatus.choices:
-            count = AlertEvent.objects.filter(status=status[0]).count()
+            count = status_counts.get(status[0], 0)
             percentage = (count / event_count * 100) if event_count > 0 else 0
             self.log(f"  {status[1]:10s}: {count:8,} ({percentage:5.2f}%)")
         
         # 数据源分布
         self.log("\n数据源分布:")
-        from django.db.models import Count
-        source_stats = AlertEvent.objects.values('source').annotate(count=Count('id')).order_by('-count')[:10]
-        for stat in source_stats:
-            percentage = (stat['count'] / event_count * 100) if event_count > 0 else 0
-            self.log(f"  {stat['source']:15s}: {stat['count']:8,} ({percentage:5.2f}%)")
+        for source, count in rollups.totals_by("source")[:10]:
+            percentage = (count / event_count * 100) if event_count > 0 else 0
+            self.log(f"  {source:15s}: {count:8,} ({percentage:5.2f}%)")
         
-        # 时间分布
+        # 时间分布（按入库时间）
         self.log("\n时间分布:")
-        now = datetime.now()
+        now = timezone.now()
         ranges = [
             ("最近1小时", timedelta(hours=1)),
             ("最近24小时", timedelta(days=1)),
@@ -306,7 +310,7 @@ class BulkDataGenerator:
         ]
         
         for label, delta in ranges:
-            count = AlertEvent.objects.filter(occurred_at__gte=now - delta).count()
+            count = rollups.query(since=now - delta)[0]["count"]
             percentage = (count / event_count * 100) if event_count > 0 else 0
             self.log(f"  {label:10s}: {count:8,} ({percentage:5.2f}%)")
         
@@ -0,0 +1,174 @@
+"""
+Fingerprint computation: per-source policies, versioned hash schemes and a
+memo of recent results.
+
+By default every label and the title go into the fingerprint, so a volatile
+label (an index suffix, a pod hash, a timestamp) makes every event its own
+group. ``settings.FINGERPRINT_POLICIES`` maps a source (or ``"*"`` for any
+source without its own entry) to a policy such as::
+
+    {
+        "prometheus": {
+            "include_labels": ["alertname", "namespace", "service"],
+            "exclude_labels": ["pod"],
+            "normalize": {"alertname": [["_\\\\d+$", ""]], "*": [["[0-9a-f]{8,}", "<id>"]]},
+            "title": "{alertname} in {namespace}",
+            "title_normalize": [["#\\\\d+", "#N"]]
+        }
+    }
+
+``include_labels`` keeps only those keys, ``exclude_labels`` drops keys,
+``normalize`` rewrites values of one key (or every key with ``"*"``) with
+``re.sub`` rules applied in order, and ``title`` replaces the title with a
+template over the normalized labels plus ``title``, ``metric`` and
+``source`` (missing keys render empty). ``title_normalize`` then rewrites
+the title. Only the fingerprint is affected; events keep their labels.
+
+``settings.FINGERPRINT_SCHEME`` picks how the selected fields are hashed:
+
+* ``v1`` (default): SHA-256 over the canonical JSON of source, metric, title
+  and labels, as 64 hex digits. Every fingerprint stored so far is v1.
+* ``v2``: BLAKE2b-128 over a separator-joined encoding that skips JSON,
+  written as ``v2:`` plus 32 hex digits, so it never collides with v1.
+
+Groups keep the fingerprint they were created with; after switching schemes
+run ``regroup_events`` to move history onto the new fingerprints.
+"""
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Pattern, Tuple
+
+from django.conf import settings
+
+from .lru import LRUCache
+from .metrics import register_cache
+from .utils import canonical_json, sha256_hexdigest
+
+_memo = register_cache("fingerprints", LRUCache(settings.FINGERPRINT_CACHE_SIZE))
+
+
+class _Blank(dict):
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def _rules(items) -> List[Tuple[Pattern, str]]:
+    return [(re.compile(pattern), replacement) for pattern, replacement in items or []]
+
+
+class FingerprintPolicy:
+    __slots__ = ("include", "exclude", "normalize", "title", "title_normalize")
+
+    def __init__(self, config: Mapping[str, Any]):
+        include = config.get("include_labels")
+        self.include = frozenset(include) if include is not None else None
+        self.exclude = frozenset(config.get("exclude_labels") or ())
+        self.normalize = {key: _rules(rules) for key, rules in (config.get("normalize") or {}).items()}
+        self.title: Optional[str] = config.get("title")
+        self.title_normalize = _rules(config.get("title_normalize"))
+
+    def labels(self, labels: Mapping[str, Any]) -> Dict[str, Any]:
+        result = {}
+        every = self.normalize.get("*", ())
+        for key, value in labels.items():
+            if (self.include is not None and key not in self.include) or key in self.exclude:
+                continue
+            rules = [*self.normalize.get(key, ()), *every]
+            if rules and isinstance(value, str):
+                for pattern, replacement in rules:
+                    value = pattern.sub(replacement, value)
+            result[key] = value
+        return result
+
+    def apply_title(self, title: str, labels: Mapping[str, Any], metric: str, source: str) -> str:
+        if self.title is not None:
+            title = self.title.format_map(_Blank(labels, title=title, metric=metric, source=source))
+        for pattern, replacement in self.title_normalize:
+            title = pattern.sub(replacement, title)
+        return title
+
+
+@lru_cache(maxsize=None)
+def policy_for(source: str) -> Optional[FingerprintPolicy]:
+    """The compiled policy for ``source``, or None to fingerprint everything."""
+    policies = getattr(settings, "FINGERPRINT_POLICIES", None) or {}
+    config = policies.get(source, policies.get("*"))
+    return FingerprintPolicy(config) if config else None
+
+
+def reset_policies() -> None:
+    """Forget compiled policies and memoized results, e.g. after changing settings."""
+    policy_for.cache_clear()
+    _memo.clear()
+
+
+def _v1(source: str, labels: Mapping[str, Any], metric: str, title: str, labels_json: Optional[str]) -> str:
+    if labels_json is None:
+        labels_json = canonical_json(labels)
+    payload = '{"labels":%s,"metric":%s,"source":%s,"title":%s}' % (
+        labels_json,
+        json.dumps(metric, ensure_ascii=False),
+        json.dumps(source, ensure_ascii=False),
+        json.dumps(title, ensure_ascii=False),
+    )
+    return sha256_hexdigest(payload)
+
+
+def _field(value: Any) -> str:
+    # Plain strings go in as-is; anything else (or a string containing a
+    # separator) is JSON behind a \x1e marker, which plain strings cannot hold.
+    if isinstance(value, str) and "\x1e" not in value and "\x1f" not in value:
+        return value
+    return "\x1e" + json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+def _v2(source: str, labels: Mapping[str, Any], metric: str, title: str, labels_json: Optional[str]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_field(source).encode("utf-8"))
+    for value in (metric, title):
+        h.update(b"\x1f" + _field(value).encode("utf-8"))
+    for key in sorted(labels):
+        h.update(b"\x1f" + _field(key).encode("utf-8"))
+        h.update(b"\x1f" + _field(labels[key]).encode("utf-8"))
+    return "v2:" + h.hexdigest()
+
+
+SCHEMES: Dict[str, Callable[..., str]] = {"v1": _v1, "v2": _v2}
+
+
+def scheme_of(fingerprint: str) -> str:
+    return "v2" if fingerprint.startswith("v2:") else "v1"
+
+
+def compute(*, source: str, labels: Mapping[str, Any], metric: Optional[str] = None, title: Optional[str] = None,
+            labels_json: Optional[str] = None, scheme: Optional[str] = None) -> str:
+    """
+    Fingerprint of an alert under ``scheme`` (default settings.FINGERPRINT_SCHEME),
+    after the source's policy. Results are memoized on the canonical JSON of
+    the labels, so 1, 1.0 and True stay distinct; ``labels_json``, when the
+    caller already holds ``canonical_json(labels)``, saves serializing them.
+    """
+    scheme = scheme or settings.FINGERPRINT_SCHEME
+    hasher = SCHEMES.get(scheme)
+    if hasher is None:
+        raise ValueError(f"Unknown fingerprint scheme: {scheme}")
+    labels = labels or {}
+    metric = metric or ""
+    title = title or ""
+    if labels_json is None:
+        labels_json = canonical_json(labels)
+    key = (scheme, source, metric, title, labels_json)
+    cached = _memo.get(key)
+    if cached is not None:
+        return cached
+
+    policy = policy_for(source)
+    if policy is not None:
+        labels = policy.labels(labels)
+        title = policy.apply_title(title, labels, metric, source)
+        labels_json = None
+    fingerprint = hasher(source, labels, metric, title, labels_json)
+    _memo.put(key, fingerprint)
+    return fingerprint
@@ -0,0 +1,86 @@
+"""
+Prometheus/Alertmanager style label matchers: ``=``, ``!=``, ``=~``, ``!~``.
+
+As in Prometheus, a missing label behaves like an empty value and regexes are
+fully anchored.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Union
+
+EQ = "="
+NEQ = "!="
+RE = "=~"
+NRE = "!~"
+OPS = (EQ, NEQ, RE, NRE)
+
+_MATCHER_RE = re.compile(r'^\s*([A-Za-z_][\w.\-]*)\s*(=~|!~|!=|=)\s*(?:"(.*)"|(.*?))\s*$')
+
+
+class Matcher:
+    __slots__ = ("name", "op", "value", "_regex")
+
+    def __init__(self, name: str, op: str, value: Any):
+        if op not in OPS:
+            raise ValueError(f"Unknown matcher operator: {op}")
+        self.name = name
+        self.op = op
+        self.value = "" if value is None else str(value)
+        try:
+            self._regex = re.compile(rf"(?:{self.value})\Z") if op in (RE, NRE) else None
+        except re.error as e:
+            raise ValueError(f"Invalid regex in matcher {name}{op}{self.value!r}: {e}")
+
+    @classmethod
+    def parse(cls, text: str) -> "Matcher":
+        """Parse ``name<op>value``, e.g. ``team=sre`` or ``instance=~"server0.*"``."""
+        m = _MATCHER_RE.match(text or "")
+        if not m:
+            raise ValueError(f"Invalid matcher: {text!r}")
+        value = m.group(3) if m.group(3) is not None else m.group(4)
+        return cls(m.group(1), m.group(2), value)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Matcher":
+        """Accept ``{"name", "op", "value"}`` or Alertmanager's ``{"name", "value", "isRegex", "isEqual"}``."""
+        op = data.get("op")
+        if op is None:
+            regex = bool(data.get("isRegex"))
+            equal = data.get("isEqual", True)
+            op = (RE if equal else NRE) if regex else (EQ if equal else NEQ)
+        return cls(data["name"], op, data.get("value", ""))
+
+    def matches_value(self, value: Any) -> bool:
+        value = "" if value is None else str(value)
+        if self.op == EQ:
+            return value == self.value
+        if self.op == NEQ:
+            return value != self.value
+        found = self._regex.match(value) is not None
+        return found if self.op == RE else not found
+
+    def matches(self, labels: Mapping[str, Any]) -> bool:
+        return self.matches_value(labels.get(self.name))
+
+    @property
+    def matches_empty(self) -> bool:
+        """Whether label sets *lacking* this label satisfy the matcher."""
+        return self.matches_value("")
+
+    def __repr__(self) -> str:
+        return f"{self.name}{self.op}{self.value!r}"
+
+
+def parse_matchers(items: Iterable[Union[str, Mapping[str, Any], Matcher]]) -> List[Matcher]:
+    result = []
+    for item in items or []:
+        if isinstance(item, Matcher):
+            result.append(item)
+        elif isinstance(item, str):
+            result.append(Matcher.parse(item))
+        else:
+            result.append(Matcher.from_dict(item))
+    return result
+
+
+def matches_all(matchers: Iterable[Matcher], labels: Dict[str, Any]) -> bool:
+    return all(m.matches(labels) for m in matchers)
@@ -0,0 +1,28 @@
+"""
+Registry of process-local caches, so their effectiveness can be reported
+without each feature growing its own endpoint.
+"""
+from typing import Any, Dict
+
+from .lru import LRUCache
+
+_caches: Dict[str, LRUCache] = {}
+
+
+def register_cache(name: str, cache: LRUCache) -> LRUCache:
+    _caches[name] = cache
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Size, hits, misses and hit rate of every registered cache in this process."""
+    return {
+        name: {
+            "size": len(cache),
+            "maxsize": cache.maxsize,
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": round(cache.hit_rate, 4),
+        }
+        for name, cache in sorted(_caches.items())
+    }
@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase, override_settings
+
+from core.fingerprint import compute, reset_policies
+
+
+class ComputeTests(SimpleTestCase):
+    def setUp(self):
+        reset_policies()
+        self.addCleanup(reset_policies)
+
+    def test_memo_keeps_equal_comparing_values_apart(self):
+        for scheme in ("v1", "v2"):
+            fingerprints = [compute(source="s", labels={"a": value}, scheme=scheme) for value in (1, True, 1.0)]
+            self.assertEqual(len(set(fingerprints)), 3, scheme)
+            again = [compute(source="s", labels={"a": value}, scheme=scheme) for value in (True, 1.0, 1)]
+            self.assertEqual(again, [fingerprints[1], fingerprints[2], fingerprints[0]])
+
+    def test_label_order_and_labels_json_do_not_matter(self):
+        a = compute(source="s", labels={"x": "1", "y": "2"}, title="t")
+        b = compute(source="s", labels={"y": "2", "x": "1"}, title="t", labels_json='{"x":"1","y":"2"}')
+        self.assertEqual(a, b)
+
+    def test_v2_digest_is_stable(self):
+        fingerprint = compute(source="s", labels={"a": "x", "b": [1, "\x1e"]}, metric="m", title="t", scheme="v2")
+        self.assertEqual(fingerprint, "v2:7b2b122e6be694bbaf7f299451a880f0")
+
+    def test_v2_separators_cannot_be_forged(self):
+        self.assertNotEqual(
+            compute(source="s", labels={"a": "b\x1fc"}, scheme="v2"),
+            compute(source="s", labels={"a": "b", "c": ""}, scheme="v2"),
+        )
+
+    @override_settings(FINGERPRINT_POLICIES={"*": {"exclude_labels": ["pod"]}})
+    def test_policy_drops_excluded_labels(self):
+        reset_policies()
+        self.assertEqual(compute(source="k8s", labels={"app": "api", "pod": "api-1"}),
+                         compute(source="k8s", labels={"app": "api", "pod": "api-2"}))
@@ -1,7 +1,9 @@
 import hashlib
 import json
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from django.db import transaction
 
 
 def utcnow() -> datetime:
@@ -16,19 +18,30 @@ def canonical_json(data: Dict[str, Any]) -> str:
     return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
+def claim_row(model, pk: int) -> bool:
+    """
+    Whether row ``pk`` of ``model`` still exists. Inside a transaction the row
+    is also locked (FOR NO KEY UPDATE on PostgreSQL) until commit, so a
+    concurrent delete of it waits and then sees the reference being written.
+    """
+    rows = model.objects.filter(pk=pk)
+    if transaction.get_connection().in_atomic_block:
+        rows = rows.select_for_update(no_key=True)
+    return rows.exists()
+
+
 def sha256_hexdigest(payload: str) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-from typing import Optional
-
 def compute_fingerprint(*, source: str, labels: Dict[str, Any], metric: Optional[str] = None,
-                        title: Optional[str] = None) -> str:
-    base = {
-        "source": source,
-        "metric": metric or "",
-        "title": title or "",
-        "labels": labels or {},
-    }
-    return sha256_hexdigest(canonical_json(base))
+                        title: Optional[str] = None, labels_json: Optional[str] = None) -> str:
+    """
+    Hash of source, metric, title and labels, after the source's fingerprint
+    policy, under the configured scheme (see core.fingerprint). ``labels_json``
+    lets callers that already hold ``canonical_json(labels)`` skip serializing
+    the labels again.
+    """
+    from .fingerprint import compute
 
+    return compute(source=source, labels=labels, metric=metric, title=title, labels_json=labels_json)
@@ -1,9 +1,20 @@
 from django.contrib import admin
-from .models import Rule
+from .models import InhibitRule, Rule, Silence
 
 
 @admin.register(Rule)
 class RuleAdmin(admin.ModelAdmin):
-    list_display = ("name", "enabled", "order")
+    list_display = ("name", "enabled", "order", "group_by")
     list_editable = ("enabled", "order")
 
+
+@admin.register(Silence)
+class SilenceAdmin(admin.ModelAdmin):
+    list_display = ("id", "matchers", "starts_at", "ends_at", "created_by", "comment")
+    search_fields = ("comment", "created_by")
+
+
+@admin.register(InhibitRule)
+class InhibitRuleAdmin(admin.ModelAdmin):
+    list_display = ("name", "enabled", "source_matchers", "target_matchers", "equal")
+    list_editable = ("enabled",)
@@ -5,3 +5,7 @@ class RulesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rules'
 
+    def ready(self) -> None:
+        # Reload the silence and inhibition indexes when their rows change
+        import rules.inhibitions  # noqa: F401
+        import rules.silences  # noqa: F401
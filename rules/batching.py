@@ -0,0 +1,216 @@
+"""
+Notification batching for rules with ``group_by``, after Alertmanager's
+group_wait, group_interval and repeat_interval.
+
+A matching firing event joins the batch of its rule and ``group_by`` label
+values, once its transaction commits, instead of running the rule's actions. A new batch is sent
+group_wait seconds after its first alert; after that it is checked every
+group_interval seconds and sent again if alerts joined or resolved since,
+or if repeat_interval has passed with alerts still firing. Each send runs
+the rule's actions once, rendered with every alert of the batch; resolved
+alerts are reported once and dropped, and an emptied batch is discarded.
+Batch timers live in a timing wheel (algorithms.timing_wheel) that a daemon
+thread advances, so notifications scale with batches rather than events.
+
+State is per process, like flapping and storm detection: with several
+ingest workers, a batch may be split across them. Before a batch is sent,
+its firing alerts are checked against their groups, so one resolved by
+another process (e.g. the stale-group sweep) is reported resolved too.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.template import Context, Template
+
+from actions.handlers import run_action
+from algorithms.timing_wheel import TimingWheel
+from alerts.models import SEVERITY_RANK, AlertEvent, AlertGroup, AlertStatus, Severity
+from .models import Rule
+from .silences import event_labels
+
+logger = logging.getLogger(__name__)
+
+ALL_LABELS = "..."
+_CHECK_CHUNK = 500
+
+BatchKey = Tuple[int, Tuple[Tuple[str, str], ...]]
+
+
+class _Batch:
+    __slots__ = ("rule_name", "group_labels", "actions", "interval", "repeat", "alerts", "changed", "last_sent")
+
+    def __init__(self, group_labels: Dict[str, str]):
+        self.group_labels = group_labels
+        self.alerts: Dict[str, Dict[str, Any]] = {}
+        self.changed = True
+        self.last_sent: Optional[float] = None
+
+    def configure(self, rule: Rule) -> None:
+        # Edits to the rule apply from the next alert on.
+        self.rule_name = rule.name
+        self.actions = list(rule.actions or [])
+        self.interval = max(rule.group_interval, 1)
+        self.repeat = max(rule.repeat_interval, rule.group_interval, 1)
+
+
+def group_key(group_by: List[str], labels: Mapping[str, str]) -> Tuple[Tuple[str, str], ...]:
+    if ALL_LABELS in group_by:
+        return tuple(sorted(labels.items()))
+    return tuple((name, labels.get(name, "")) for name in sorted(set(group_by)))
+
+
+class NotificationBatcher:
+    def __init__(self, tick_seconds: float = 1.0):
+        self.tick_seconds = tick_seconds
+        self._lock = threading.Lock()
+        self._wheel = TimingWheel(tick_seconds, start=time.monotonic())
+        self._batches: Dict[BatchKey, _Batch] = {}
+        self._by_alert: Dict[str, Set[BatchKey]] = defaultdict(set)
+        self._worker: Optional[threading.Thread] = None
+
+    def add(self, rule: Rule, event: AlertEvent, context: Dict[str, Any], now: Optional[float] = None) -> None:
+        """Put a firing event matched by ``rule`` into its batch; resolutions arrive through ``resolve``."""
+        if event.status == AlertStatus.RESOLVED:
+            return
+        now = time.monotonic() if now is None else now
+        labels = event_labels(event)
+        key = (rule.id, group_key(rule.group_by, labels))
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch(dict(key[1]))
+                self._wheel.schedule(key, now + rule.group_wait, key)
+            batch.configure(rule)
+            batch.alerts[event.fingerprint] = context
+            batch.changed = True
+            self._by_alert[event.fingerprint].add(key)
+        self._start_worker()
+
+    def resolve(self, fingerprint: str) -> None:
+        """Mark a group's alert resolved in every batch holding it."""
+        if fingerprint not in self._by_alert:
+            return
+        with self._lock:
+            self._resolve(fingerprint)
+
+    def _resolve(self, fingerprint: str) -> None:
+        for key in self._by_alert.get(fingerprint, ()):
+            batch = self._batches[key]
+            batch.alerts[fingerprint] = {**batch.alerts[fingerprint], "status": AlertStatus.RESOLVED}
+            batch.changed = True
+
+    def flush_due(self, now: Optional[float] = None) -> int:
+        """Send the batches whose timer came due; returns how many notifications went out."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            keys = [key for key, _ in self._wheel.advance(now)]
+            firing = {fp for key in keys for fp, a in self._batches[key].alerts.items()
+                      if a["status"] != AlertStatus.RESOLVED}
+        # Groups resolved by another process (e.g. the stale-group sweep) never reach ``resolve`` here.
+        resolved = _resolved_groups(firing)
+        with self._lock:
+            for fingerprint in resolved:
+                self._resolve(fingerprint)
+            due = [self._flush(key, now) for key in keys]
+        sent = 0
+        for notification in due:
+            if notification is not None:
+                _send(*notification)
+                sent += 1
+        return sent
+
+    def _flush(self, key: BatchKey, now: float):
+        batch = self._batches[key]
+        firing = [a for a in batch.alerts.values() if a["status"] != AlertStatus.RESOLVED]
+        resolved = [a for a in batch.alerts.values() if a["status"] == AlertStatus.RESOLVED]
+        repeat = firing and batch.last_sent is not None and now - batch.last_sent >= batch.repeat
+        notification = None
+        if batch.changed or repeat:
+            notification = (batch.rule_name, batch.group_labels, list(batch.actions), firing, resolved)
+            batch.changed = False
+            batch.last_sent = now
+            for fingerprint in [fp for fp, a in batch.alerts.items() if a["status"] == AlertStatus.RESOLVED]:
+                del batch.alerts[fingerprint]
+                keys = self._by_alert[fingerprint]
+                keys.discard(key)
+                if not keys:
+                    del self._by_alert[fingerprint]
+        if batch.alerts:
+            self._wheel.schedule(key, now + batch.interval, key)
+        else:
+            del self._batches[key]
+        return notification
+
+    def _start_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="rule-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.tick_seconds)
+            try:
+                close_old_connections()
+                self.flush_due()
+            except Exception:
+                logger.exception("Flushing rule notification batches failed")
+
+    def __len__(self) -> int:
+        return len(self._batches)
+
+
+def _resolved_groups(fingerprints: Set[str]) -> Set[str]:
+    resolved: Set[str] = set()
+    fingerprints = list(fingerprints)
+    for start in range(0, len(fingerprints), _CHECK_CHUNK):
+        resolved.update(AlertGroup.objects.filter(
+            fingerprint__in=fingerprints[start:start + _CHECK_CHUNK], status=AlertStatus.RESOLVED,
+        ).values_list("fingerprint", flat=True))
+    return resolved
+
+
+def _send(rule_name: str, group_labels: Dict[str, str], actions: List[Dict[str, Any]],
+          firing: List[Dict[str, Any]], resolved: List[Dict[str, Any]]) -> None:
+    alerts = firing + resolved
+    severity = max((a["severity"] for a in firing or resolved), key=lambda s: SEVERITY_RANK.get(s, 0),
+                   default=Severity.INFO)
+    scope = ", ".join(f"{k}={v}" for k, v in group_labels.items())
+    if firing:
+        title = f"[FIRING:{len(firing)}] {rule_name}"
+    else:
+        title = f"[RESOLVED:{len(resolved)}] {rule_name}"
+    if scope:
+        title = f"{title} ({scope})"
+    notice = AlertEvent(
+        source="alert_engine",
+        status=AlertStatus.FIRING if firing else AlertStatus.RESOLVED,
+        severity=severity,
+        title=title[:255],
+        description="\n".join(f"[{a['status']}] [{a['severity']}] {a['title']}" for a in alerts),
+        labels=group_labels,
+    )
+    context = {
+        "title": notice.title,
+        "description": notice.description,
+        "severity": severity,
+        "status": notice.status,
+        "rule": rule_name,
+        "group_labels": group_labels,
+        "alerts": alerts,
+        "firing": firing,
+        "resolved": resolved,
+    }
+    for action in actions:
+        rendered = {k: (Template(v).render(Context(context)) if isinstance(v, str) else v) for k, v in action.items()}
+        run_action(rendered, notice)
+
+
+batcher = NotificationBatcher(tick_seconds=settings.BATCH_TICK_SECONDS)
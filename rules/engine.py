@@ -1,10 +1,18 @@
 import operator
 import re
-from typing import Any, Dict
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional
 
+from django.db import transaction
+from django.db.models import QuerySet
 from django.template import Template, Context
 
+from alerts import labelsets
+from alerts.labelindex import filter_by_labels
 from alerts.models import AlertEvent
+from core.matchers import EQ, NEQ, RE, Matcher
+from . import batching
 from .models import Rule
 from actions.handlers import run_action
 from knowledge.services import suggest_articles
@@ -47,6 +55,7 @@ def _match(rule: Rule, event: AlertEvent) -> bool:
         "service": event.service,
         "metric": event.metric,
         "namespace": event.namespace,
+        "cluster_key": event.cluster_key,
     }
     for cond in rule.conditions or []:
         op = OPS.get(cond.get("op", "eq"))
@@ -60,10 +69,10 @@ def _match(rule: Rule, event: AlertEvent) -> bool:
     return True
 
 
-def evaluate_rules_on_event(event: AlertEvent) -> None:
+def evaluate_rules_on_event(event: AlertEvent, flapping: Optional[str] = None, suggest_kb: bool = True) -> None:
     for rule in Rule.objects.filter(enabled=True).order_by('order', 'id'):
         if _match(rule, event):
-            kb = suggest_articles(event)
+            kb = suggest_articles(event) if suggest_kb else []
             context = {
                 "title": event.title,
                 "description": event.description,
@@ -76,10 +85,99 @@ def evaluate_rules_on_event(event: AlertEvent) -> None:
                 "metric": event.metric,
                 "namespace": event.namespace,
                 "generator_url": event.generator_url,
+                "flapping": flapping,
                 "kb_articles": [{"title": a.title, "solution": a.solution} for a in kb],
             }
+            if rule.group_by is not None:
+                # Only committed events join a batch.
+                transaction.on_commit(partial(batching.batcher.add, rule, event, context))
+                continue
             for action in rule.actions or []:
                 # Render template-able fields
                 rendered = {k: (_render(v, context) if isinstance(v, str) else v) for k, v in action.items()}
                 run_action(rendered, event)
 
+
+# Event columns a condition may be pushed down to the database on.
+_COLUMN_PATHS = ("source", "status", "severity", "title", "resource", "service", "metric", "namespace")
+_ANY = r"[\s\S]*"
+
+
+def _label_matcher(name: str, op: str, value: Any) -> Optional[Matcher]:
+    """
+    A matcher selecting a superset of the events a ``labels.<name>`` condition
+    accepts, or None when the condition cannot be narrowed by the label index.
+    """
+    if op == "eq":
+        return Matcher(name, EQ, value)
+    if op == "neq":
+        # _match keeps a label present with any other value, "" included, and
+        # one missing unless value is None; only a non-empty string maps onto !=.
+        if not isinstance(value, str) or not value:
+            return None
+        return Matcher(name, NEQ, value)
+    if op == "contains":
+        return Matcher(name, RE, f"{_ANY}{re.escape(str(value or ''))}{_ANY}")
+    if op == "in" and isinstance(value, (list, tuple)):
+        return Matcher(name, RE, "|".join(re.escape("" if v is None else str(v)) for v in value))
+    if op == "regex":
+        # _match searches str(None) for a missing label; leave that case, and
+        # a pattern that does not compile, to it.
+        try:
+            if re.search(str(value), "None"):
+                return None
+        except re.error:
+            return None
+        return Matcher(name, RE, f"{_ANY}(?:{value}){_ANY}")
+    return None
+
+
+def candidate_events(rule: Rule) -> QuerySet:
+    """Events the rule could match, narrowed by column filters and the label index."""
+    queryset = AlertEvent.objects.all()
+    matchers: List[Matcher] = []
+    for cond in rule.conditions or []:
+        op, path, value = cond.get("op", "eq"), cond.get("path") or "", cond.get("value")
+        if path in _COLUMN_PATHS:
+            if op == "eq":
+                queryset = queryset.filter(**{path: value})
+            elif op == "in" and isinstance(value, (list, tuple)):
+                queryset = queryset.filter(**{f"{path}__in": value})
+        elif path.startswith("labels.") and path.count(".") == 1:
+            try:
+                matcher = _label_matcher(path[len("labels."):], op, value)
+            except ValueError:
+                matcher = None
+            if matcher is not None:
+                matchers.append(matcher)
+    return filter_by_labels(queryset, matchers) if matchers else queryset
+
+
+def backtest_rule(
+    rule: Rule,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = 1000,
+) -> Iterator[AlertEvent]:
+    """
+    Yield stored events the rule matches, oldest first, without running its
+    actions. Candidates come from ``candidate_events`` and are confirmed with
+    the same ``_match`` used at ingest time.
+    """
+    queryset = candidate_events(rule).order_by("id")
+    if since:
+        queryset = queryset.filter(created_at__gte=since)
+    if until:
+        queryset = queryset.filter(created_at__lt=until)
+    chunk: List[AlertEvent] = []
+    for event in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(event)
+        if len(chunk) >= chunk_size:
+            yield from _confirmed(rule, chunk)
+            chunk = []
+    yield from _confirmed(rule, chunk)
+
+
+def _confirmed(rule: Rule, events: List[AlertEvent]) -> Iterator[AlertEvent]:
+    labelsets.warm(e.label_set_id for e in events)
+    return (e for e in events if _match(rule, e))
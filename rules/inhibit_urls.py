@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import InhibitRuleDetailView, InhibitRuleListCreateView
+
+urlpatterns = [
+    path('', InhibitRuleListCreateView.as_view(), name='inhibit-rule-list-create'),
+    path('<int:pk>/', InhibitRuleDetailView.as_view(), name='inhibit-rule-detail'),
+]
@@ -0,0 +1,189 @@
+"""
+Inhibition of dependent alerts.
+
+For every enabled InhibitRule, ``InhibitionIndex`` maps the tuple of
+``equal`` label values to the ids of firing groups whose latest event
+matched the rule's source matchers. An incoming event is inhibited when it
+matches a rule's target matchers and its own tuple is present, so the check
+is one dict lookup per rule. Group status transitions keep it current:
+alerts.services feeds every committed event through ``track``, which files
+a firing group under each rule it is a source for and drops it once the
+group resolves.
+
+Like incident correlation, the firing side is per process; it is rebuilt
+from the firing groups in the database when the rules change or the process
+starts. Groups resolved by another process (e.g. the stale-group sweep)
+never reach ``track`` here, so at the same INHIBIT_RELOAD_SECONDS interval
+as the rule check, the filed source groups are looked up and resolved ones
+are dropped: a source resolved elsewhere stops inhibiting within that
+interval, and checking an event stays free of queries.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from alerts import labelsets
+from alerts.models import AlertEvent, AlertGroup, AlertStatus
+from core.matchers import Matcher, parse_matchers
+from .models import InhibitRule
+from .silences import event_labels
+
+ACTIVE_STATUSES = (AlertStatus.FIRING, AlertStatus.ACKED)
+_LOAD_CHUNK = 1000
+
+
+class _Rule:
+    __slots__ = ("id", "source", "target", "equal")
+
+    def __init__(self, rule_id: int, source: Sequence[Matcher], target: Sequence[Matcher], equal: Sequence[str]):
+        self.id = rule_id
+        self.source = source
+        self.target = target
+        self.equal = tuple(equal)
+
+    def key(self, labels: Mapping[str, str]) -> Tuple[str, ...]:
+        # Labels missing on both sides count as equal, as in Alertmanager.
+        return tuple(labels.get(name, "") for name in self.equal)
+
+
+class InhibitionIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.load([], [])
+
+    def load(self, rules: Iterable[_Rule], firing: Iterable[Tuple[int, Mapping[str, str]]]) -> None:
+        """Replace the rules, and the firing sources with (group id, labels) pairs."""
+        firing = list(firing)
+        with self._lock:
+            self._rules: List[_Rule] = list(rules)
+            self._sources: Dict[int, Dict[Tuple[str, ...], Set[int]]] = {r.id: defaultdict(set) for r in self._rules}
+            self._by_group: Dict[int, List[Tuple[int, Tuple[str, ...]]]] = {}
+            for group_id, labels in firing:
+                self._fire(group_id, labels)
+
+    def _fire(self, group_id: int, labels: Mapping[str, str]) -> None:
+        self._resolve(group_id)
+        filed = []
+        for rule in self._rules:
+            if all(m.matches(labels) for m in rule.source):
+                key = rule.key(labels)
+                self._sources[rule.id][key].add(group_id)
+                filed.append((rule.id, key))
+        if filed:
+            self._by_group[group_id] = filed
+
+    def _resolve(self, group_id: int) -> None:
+        for rule_id, key in self._by_group.pop(group_id, ()):
+            groups = self._sources[rule_id][key]
+            groups.discard(group_id)
+            if not groups:
+                del self._sources[rule_id][key]
+
+    def update(self, group_id: int, labels: Mapping[str, str], active: bool) -> None:
+        """Re-file a group after an event: under its latest labels while active, nowhere once resolved."""
+        with self._lock:
+            if active:
+                self._fire(group_id, labels)
+            else:
+                self._resolve(group_id)
+
+    def inhibited_by(self, labels: Mapping[str, str], group_id: Optional[int] = None) -> Optional[int]:
+        """Id of a rule inhibiting an event with ``labels``; a group never inhibits itself."""
+        with self._lock:
+            for rule in self._rules:
+                sources = self._sources[rule.id].get(rule.key(labels), ())
+                if len(sources) > (group_id in sources) and all(m.matches(labels) for m in rule.target):
+                    return rule.id
+        return None
+
+    def snapshot(self) -> Dict[int, object]:
+        """The groups currently filed as sources, each with a token of its filing, for ``drop``."""
+        with self._lock:
+            return dict(self._by_group)
+
+    def drop(self, filed: Mapping[int, object]) -> None:
+        """Un-file groups resolved outside ``update``, unless re-filed since the snapshot."""
+        with self._lock:
+            for group_id, token in filed.items():
+                if self._by_group.get(group_id) is token:
+                    self._resolve(group_id)
+
+    @property
+    def rule_count(self) -> int:
+        return len(self._rules)
+
+
+index = InhibitionIndex()
+_stamp: Dict[str, Any] = {"value": None, "checked": float("-inf")}
+
+
+def _refresh() -> None:
+    checked = time.monotonic()
+    if _stamp["value"] is not None and checked - _stamp["checked"] < settings.INHIBIT_RELOAD_SECONDS:
+        return
+    _stamp["checked"] = checked
+    stamp = InhibitRule.objects.aggregate(n=Count("id"), changed=Max("updated_at"))
+    if stamp == _stamp["value"]:
+        _drop_resolved()
+        return
+    rules = []
+    for rule in InhibitRule.objects.filter(enabled=True):
+        try:
+            rules.append(_Rule(rule.id, parse_matchers(rule.source_matchers),
+                               parse_matchers(rule.target_matchers), [str(k) for k in rule.equal or []]))
+        except (ValueError, KeyError, TypeError):
+            continue  # rejected by the API; skip rows written around it
+    index.load(rules, _firing_groups() if rules else [])
+    _stamp["value"] = stamp
+
+
+def _firing_groups() -> Iterable[Tuple[int, Dict[str, str]]]:
+    """(group id, labels of its latest event) for every active group."""
+    latest = AlertGroup.objects.filter(status__in=ACTIVE_STATUSES, latest_event_id__isnull=False)
+    rows = list(latest.values_list("id", "latest_event_id"))
+    for start in range(0, len(rows), _LOAD_CHUNK):
+        chunk = dict((event_id, group_id) for group_id, event_id in rows[start:start + _LOAD_CHUNK])
+        events = list(AlertEvent.objects.filter(id__in=chunk).defer("description", "annotations", "generator_url"))
+        labelsets.warm(e.label_set_id for e in events)
+        for event in events:
+            yield chunk[event.id], event_labels(event)
+
+
+def _drop_resolved() -> None:
+    # Sources resolved (or deleted) by another process, e.g. the stale-group sweep, are only noticed here.
+    filed = index.snapshot()
+    ids = list(filed)
+    for start in range(0, len(ids), _LOAD_CHUNK):
+        chunk = ids[start:start + _LOAD_CHUNK]
+        active = set(AlertGroup.objects.filter(id__in=chunk, status__in=ACTIVE_STATUSES).values_list("id", flat=True))
+        index.drop({group_id: filed[group_id] for group_id in chunk if group_id not in active})
+
+
+def invalidate() -> None:
+    _stamp["value"] = None
+
+
+def inhibited_by(event) -> Optional[int]:
+    """Id of an inhibit rule suppressing the event right now, or None."""
+    _refresh()
+    if not index.rule_count:
+        return None
+    return index.inhibited_by(event_labels(event), event.group_id)
+
+
+def track(event, group_status: str) -> None:
+    """Follow a committed event's group status transition."""
+    if _stamp["value"] is None or not index.rule_count:
+        return  # the next load reads the committed state
+    index.update(event.group_id, event_labels(event), group_status in ACTIVE_STATUSES)
+
+
+@receiver([post_save, post_delete], sender=InhibitRule)
+def _rule_changed(sender, **kwargs) -> None:
+    invalidate()
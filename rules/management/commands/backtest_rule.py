@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from rules.engine import backtest_rule
+from rules.models import Rule
+
+
+class Command(BaseCommand):
+    help = "Report which stored events a rule would have matched, without running its actions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("rule", type=int, help="Rule id")
+        parser.add_argument("--since", help="ISO datetime; only events created at or after it")
+        parser.add_argument("--until", help="ISO datetime; only events created before it")
+        parser.add_argument("--show", type=int, default=20, help="Print at most this many matches")
+
+    def handle(self, *args, **options):
+        try:
+            rule = Rule.objects.get(pk=options["rule"])
+        except Rule.DoesNotExist:
+            raise CommandError(f"Rule {options['rule']} does not exist")
+        bounds = {}
+        for name in ("since", "until"):
+            if options[name]:
+                bounds[name] = parse_datetime(options[name])
+                if bounds[name] is None:
+                    raise CommandError(f"--{name} must be an ISO datetime")
+
+        matched = 0
+        for event in backtest_rule(rule, **bounds):
+            matched += 1
+            if matched <= options["show"]:
+                self.stdout.write(f"{event.id}\t{event.created_at.isoformat()}\t{event.severity}\t{event.title}")
+        self.stdout.write(self.style.SUCCESS(f"{rule}: {matched} matching event(s)"))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:35
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rules', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Silence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matchers', models.JSONField(default=list)),
+                ('starts_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ends_at', models.DateTimeField()),
+                ('created_by', models.CharField(blank=True, default='', max_length=128)),
+                ('comment', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'silence',
+                'ordering': ['-starts_at', '-id'],
+                'indexes': [models.Index(fields=['ends_at'], name='silence_ends_at_59754b_idx')],
+            },
+        ),
+    ]
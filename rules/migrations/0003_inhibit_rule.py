@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rules', '0002_silence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InhibitRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128)),
+                ('enabled', models.BooleanField(default=True)),
+                ('source_matchers', models.JSONField(default=list)),
+                ('target_matchers', models.JSONField(default=list)),
+                ('equal', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'inhibit_rule',
+                'ordering': ['id'],
+            },
+        ),
+    ]
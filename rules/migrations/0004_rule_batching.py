@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rules', '0003_inhibit_rule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rule',
+            name='group_by',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rule',
+            name='group_interval',
+            field=models.PositiveIntegerField(default=300, help_text='Seconds between sends of a changed batch'),
+        ),
+        migrations.AddField(
+            model_name='rule',
+            name='group_wait',
+            field=models.PositiveIntegerField(default=30, help_text='Seconds before a new batch is first sent'),
+        ),
+        migrations.AddField(
+            model_name='rule',
+            name='repeat_interval',
+            field=models.PositiveIntegerField(default=14400, help_text='Seconds before an unchanged batch is re-sent'),
+        ),
+    ]
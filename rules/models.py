@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class Rule(models.Model):
@@ -11,6 +12,13 @@ class Rule(models.Model):
     # e.g. [{"type": "email", "to": ["oncall@example.com"], "subject": "{{ title }}"}]
     actions = models.JSONField(default=list, blank=True)
     order = models.PositiveIntegerField(default=0)
+    # Notification batching (see rules.batching): null runs the actions for every
+    # matching event; a list of label names (["..."] for all labels) batches the
+    # matches per label values and runs them once per flush.
+    group_by = models.JSONField(null=True, blank=True)
+    group_wait = models.PositiveIntegerField(default=30, help_text="Seconds before a new batch is first sent")
+    group_interval = models.PositiveIntegerField(default=300, help_text="Seconds between sends of a changed batch")
+    repeat_interval = models.PositiveIntegerField(default=14400, help_text="Seconds before an unchanged batch is re-sent")
 
     class Meta:
         db_table = "rule"
@@ -19,3 +27,50 @@ class Rule(models.Model):
     def __str__(self) -> str:
         return f"Rule<{self.name}>"
 
+
+class Silence(models.Model):
+    """
+    Alertmanager-style silence: events whose labels satisfy every matcher
+    between starts_at and ends_at skip rule evaluation. Matchers are strings
+    such as ``instance=~"db-.*"`` or ``{"name", "op", "value"}`` dicts (see
+    core.matchers); event fields like ``service`` count as labels too.
+    """
+    matchers = models.JSONField(default=list)
+    starts_at = models.DateTimeField(default=timezone.now)
+    ends_at = models.DateTimeField()
+    created_by = models.CharField(max_length=128, blank=True, default="")
+    comment = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "silence"
+        ordering = ["-starts_at", "-id"]
+        indexes = [
+            models.Index(fields=["ends_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Silence<{self.id}> until {self.ends_at:%Y-%m-%d %H:%M}"
+
+
+class InhibitRule(models.Model):
+    """
+    Alertmanager-style inhibition: while a group whose latest event matches
+    source_matchers is firing, events matching target_matchers that carry the
+    same values for every label in ``equal`` skip rule evaluation.
+    """
+    name = models.CharField(max_length=128)
+    enabled = models.BooleanField(default=True)
+    source_matchers = models.JSONField(default=list)
+    target_matchers = models.JSONField(default=list)
+    # Label (or event field) names, e.g. ["resource"]
+    equal = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "inhibit_rule"
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"InhibitRule<{self.name}>"
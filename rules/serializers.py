@@ -0,0 +1,57 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from core.matchers import parse_matchers
+from .models import InhibitRule, Silence
+
+
+def _validated_matchers(value, allow_match_all: bool = False):
+    if not isinstance(value, list) or not value:
+        raise serializers.ValidationError("Expected a non-empty list of matchers.")
+    try:
+        matchers = parse_matchers(value)
+    except (ValueError, KeyError, TypeError) as e:
+        raise serializers.ValidationError(str(e))
+    # As in Alertmanager, a silence matching every event is refused.
+    if not allow_match_all and all(m.matches_empty for m in matchers):
+        raise serializers.ValidationError("At least one matcher must not match an empty value.")
+    return value
+
+
+class SilenceSerializer(serializers.ModelSerializer):
+    active = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Silence
+        fields = ('id', 'matchers', 'starts_at', 'ends_at', 'created_by', 'comment', 'active',
+                  'created_at', 'updated_at')
+
+    def get_active(self, obj: Silence) -> bool:
+        return obj.starts_at <= timezone.now() < obj.ends_at
+
+    def validate_matchers(self, value):
+        return _validated_matchers(value)
+
+    def validate(self, attrs):
+        starts_at = attrs.get('starts_at', getattr(self.instance, 'starts_at', None) or timezone.now())
+        ends_at = attrs.get('ends_at', getattr(self.instance, 'ends_at', None))
+        if ends_at is not None and ends_at <= starts_at:
+            raise serializers.ValidationError({'ends_at': "Must be after starts_at."})
+        return attrs
+
+
+class InhibitRuleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InhibitRule
+        fields = ('id', 'name', 'enabled', 'source_matchers', 'target_matchers', 'equal', 'updated_at')
+
+    def validate_source_matchers(self, value):
+        return _validated_matchers(value)
+
+    def validate_target_matchers(self, value):
+        return _validated_matchers(value, allow_match_all=True)
+
+    def validate_equal(self, value):
+        if not isinstance(value, list) or not all(isinstance(v, str) and v for v in value):
+            raise serializers.ValidationError("Expected a list of label names.")
+        return value
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import SilenceDetailView, SilenceListCreateView
+
+urlpatterns = [
+    path('', SilenceListCreateView.as_view(), name='silence-list-create'),
+    path('<int:pk>/', SilenceDetailView.as_view(), name='silence-detail'),
+]
@@ -0,0 +1,166 @@
+"""
+Silence evaluation for incoming events.
+
+``SilenceIndex`` keeps the loaded silences in memory. Each silence is filed
+under one of its equality matchers (the least shared one), so an event only
+tests silences anchored on one of its own ``name=value`` pairs, plus the few
+that have no usable equality matcher. Time ranges are handled as a sweep
+line: silences wait in a heap ordered by start, enter the label index when
+they start and leave it through a second heap ordered by end, so each check
+only does work when a boundary has passed.
+
+The process-wide ``index`` reloads when a Silence is saved or deleted here,
+and otherwise when the table's (count, latest update) stamp changes, checked
+at most every SILENCE_RELOAD_SECONDS, which covers edits from other processes.
+"""
+import heapq
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.matchers import EQ, Matcher, parse_matchers
+from .models import Silence
+
+# Event fields a silence can match on besides the labels (labels win on a clash).
+EVENT_FIELDS = ("source", "severity", "service", "namespace", "resource", "metric")
+
+
+class _Entry:
+    __slots__ = ("id", "starts", "ends", "matchers", "anchor")
+
+    def __init__(self, silence_id: int, matchers: Sequence[Matcher], starts: float, ends: float):
+        self.id = silence_id
+        self.matchers = matchers
+        self.starts = starts
+        self.ends = ends
+        self.anchor: Optional[Tuple[str, str]] = None
+
+
+class SilenceIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[int, _Entry] = {}
+        self.load([])
+
+    def load(self, silences: Iterable[Tuple[int, Sequence[Matcher], float, float]]) -> None:
+        """Replace the contents with (id, matchers, starts, ends) tuples; times in epoch seconds."""
+        entries = {sid: _Entry(sid, matchers, starts, ends) for sid, matchers, starts, ends in silences}
+        shared = Counter(
+            (m.name, m.value) for e in entries.values() for m in e.matchers if m.op == EQ and m.value
+        )
+        for entry in entries.values():
+            anchors = [(m.name, m.value) for m in entry.matchers if m.op == EQ and m.value]
+            entry.anchor = min(anchors, key=shared.__getitem__) if anchors else None
+        with self._lock:
+            self._entries = entries
+            self._reset(float("-inf"))
+
+    def _reset(self, clock: float) -> None:
+        self._by_pair: Dict[Tuple[str, str], Dict[int, _Entry]] = defaultdict(dict)
+        self._unanchored: Dict[int, _Entry] = {}
+        self._pending = [(e.starts, e.id) for e in self._entries.values()]
+        heapq.heapify(self._pending)
+        self._expiring: List[Tuple[float, int]] = []
+        self._clock = clock
+
+    def _advance(self, now: float) -> None:
+        if now < self._clock:  # the clock went back: sweep again from the start
+            self._reset(float("-inf"))
+        self._clock = now
+        while self._pending and self._pending[0][0] <= now:
+            _, sid = heapq.heappop(self._pending)
+            entry = self._entries[sid]
+            if entry.ends > now:
+                bucket = self._by_pair[entry.anchor] if entry.anchor else self._unanchored
+                bucket[sid] = entry
+                heapq.heappush(self._expiring, (entry.ends, sid))
+        while self._expiring and self._expiring[0][0] <= now:
+            _, sid = heapq.heappop(self._expiring)
+            entry = self._entries[sid]
+            if entry.anchor:
+                bucket = self._by_pair[entry.anchor]
+                bucket.pop(sid, None)
+                if not bucket:
+                    del self._by_pair[entry.anchor]
+            else:
+                self._unanchored.pop(sid, None)
+
+    def match(self, labels: Mapping[str, str], now: float) -> Optional[int]:
+        """Id of an active silence covering ``labels`` (string values), or None."""
+        with self._lock:
+            self._advance(now)
+            by_pair = self._by_pair
+            for pair in labels.items():
+                bucket = by_pair.get(pair)
+                if bucket:
+                    for entry in bucket.values():
+                        if all(m.matches(labels) for m in entry.matchers):
+                            return entry.id
+            for entry in self._unanchored.values():
+                if all(m.matches(labels) for m in entry.matchers):
+                    return entry.id
+        return None
+
+    def active_ids(self, now: float) -> Set[int]:
+        with self._lock:
+            self._advance(now)
+            ids = set(self._unanchored)
+            for bucket in self._by_pair.values():
+                ids.update(bucket)
+            return ids
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+index = SilenceIndex()
+_stamp: Dict[str, Any] = {"value": None, "checked": float("-inf")}
+
+
+def _refresh() -> None:
+    checked = time.monotonic()
+    if _stamp["value"] is not None and checked - _stamp["checked"] < settings.SILENCE_RELOAD_SECONDS:
+        return
+    _stamp["checked"] = checked
+    stamp = Silence.objects.aggregate(n=Count("id"), changed=Max("updated_at"))
+    if stamp == _stamp["value"]:
+        return
+    loaded = []
+    for silence in Silence.objects.filter(ends_at__gt=timezone.now()).only("id", "matchers", "starts_at", "ends_at"):
+        try:
+            matchers = parse_matchers(silence.matchers)
+        except (ValueError, KeyError, TypeError):
+            continue  # rejected by the API; skip rows written around it
+        loaded.append((silence.id, matchers, silence.starts_at.timestamp(), silence.ends_at.timestamp()))
+    index.load(loaded)
+    _stamp["value"] = stamp
+
+
+def invalidate() -> None:
+    _stamp["value"] = None
+
+
+def event_labels(event) -> Dict[str, str]:
+    labels = {field: value for field in EVENT_FIELDS if (value := getattr(event, field, ""))}
+    labels.update((str(k), "" if v is None else str(v)) for k, v in event.labels.items())
+    return labels
+
+
+def silenced_by(event) -> Optional[int]:
+    """Id of a silence covering the event right now, or None."""
+    _refresh()
+    if not len(index):
+        return None
+    return index.match(event_labels(event), time.time())
+
+
+@receiver([post_save, post_delete], sender=Silence)
+def _silence_changed(sender, **kwargs) -> None:
+    invalidate()
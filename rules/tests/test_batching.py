@@ -0,0 +1,109 @@
+import time
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+
+from alerts.models import AlertEvent, AlertGroup, AlertStatus
+from rules.batching import NotificationBatcher
+from rules.engine import evaluate_rules_on_event
+from rules.models import Rule
+
+
+def firing(fingerprint, instance):
+    return AlertEvent(fingerprint=fingerprint, status=AlertStatus.FIRING, severity="warning",
+                      title=f"down {instance}", labels={"alertname": "HostDown", "instance": instance})
+
+
+def context(event):
+    return {"title": event.title, "severity": event.severity, "status": event.status}
+
+
+class ResolvedElsewhereTests(TestCase):
+    def test_group_resolved_by_another_process_is_reported_resolved(self):
+        rule = Rule.objects.create(name="hosts", group_by=["alertname"], group_wait=10, group_interval=60)
+        AlertGroup.objects.create(fingerprint="a", status=AlertStatus.RESOLVED)
+        AlertGroup.objects.create(fingerprint="b", status=AlertStatus.FIRING)
+        batcher = NotificationBatcher()
+        start = time.monotonic()
+        for event in (firing("a", "h1"), firing("b", "h2")):
+            batcher.add(rule, event, context(event), now=start)
+        with mock.patch("rules.batching._send") as send:
+            self.assertEqual(batcher.flush_due(now=start + 10), 1)
+        _, _, _, firing_alerts, resolved_alerts = send.call_args.args
+        self.assertEqual([a["title"] for a in firing_alerts], ["down h2"])
+        self.assertEqual([a["title"] for a in resolved_alerts], ["down h1"])
+
+
+class BatchingTests(TestCase):
+    def setUp(self):
+        self.rule = Rule.objects.create(name="hosts", group_by=["alertname"], group_wait=10,
+                                        group_interval=60, repeat_interval=600)
+        self.batcher = NotificationBatcher()
+        self.start = time.monotonic()
+        patcher = mock.patch("rules.batching._send")
+        self.send = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def add(self, fingerprint, instance, at, alertname="HostDown"):
+        event = firing(fingerprint, instance)
+        event.labels = {**event.labels, "alertname": alertname}
+        self.batcher.add(self.rule, event, context(event), now=self.start + at)
+
+    def flush(self, at):
+        self.send.reset_mock()
+        self.batcher.flush_due(now=self.start + at)
+        return [(call.args[3], call.args[4]) for call in self.send.call_args_list]
+
+    def titles(self, alerts):
+        return sorted(a["title"] for a in alerts)
+
+    def test_group_wait_collects_alerts_into_one_notification(self):
+        self.add("a", "h1", 0)
+        self.add("b", "h2", 5)
+        self.add("c", "h3", 5, alertname="DiskFull")
+        self.assertEqual(self.flush(9), [])
+        sent = self.flush(10)
+        self.assertEqual(sorted(self.titles(f) for f, _ in sent), [["down h1", "down h2"]])
+        self.assertEqual(len(self.flush(15)), 1)  # DiskFull has its own batch and wait
+
+    def test_group_interval_sends_only_changes(self):
+        self.add("a", "h1", 0)
+        self.flush(10)
+        self.assertEqual(self.flush(70), [])  # nothing new
+        self.add("b", "h2", 80)
+        [(firing_alerts, _)] = self.flush(130)
+        self.assertEqual(self.titles(firing_alerts), ["down h1", "down h2"])
+
+    def test_repeat_interval_resends_unchanged_batch(self):
+        self.add("a", "h1", 0)
+        self.flush(10)
+        for at in range(70, 610, 60):
+            self.assertEqual(self.flush(at), [])
+        self.assertEqual(len(self.flush(610)), 1)
+
+    def test_resolved_alerts_are_reported_once_and_empty_batches_dropped(self):
+        self.add("a", "h1", 0)
+        self.add("b", "h2", 0)
+        self.flush(10)
+        self.batcher.resolve("a")
+        [(firing_alerts, resolved)] = self.flush(70)
+        self.assertEqual((self.titles(firing_alerts), self.titles(resolved)), (["down h2"], ["down h1"]))
+        self.batcher.resolve("b")
+        [(firing_alerts, resolved)] = self.flush(130)
+        self.assertEqual((firing_alerts, self.titles(resolved)), ([], ["down h2"]))
+        self.assertEqual(len(self.batcher), 0)
+
+
+class EngineBatchingTests(TestCase):
+    def test_rolled_back_event_does_not_join_a_batch(self):
+        Rule.objects.create(name="all", group_by=["..."])
+        event = firing("a", "h1")
+        with mock.patch("rules.batching.batcher") as batcher:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                evaluate_rules_on_event(event, suggest_kb=False)
+                raise RuntimeError
+            batcher.add.assert_not_called()
+            with self.captureOnCommitCallbacks(execute=True):
+                evaluate_rules_on_event(event, suggest_kb=False)
+            batcher.add.assert_called_once()
@@ -0,0 +1,52 @@
+from django.test import TestCase
+
+from alerts import labelsets
+from alerts.models import AlertEvent
+from rules.engine import _label_matcher, _match, candidate_events
+from rules.models import Rule
+
+
+class LabelMatcherTests(TestCase):
+    def test_invalid_regex_is_left_to_match(self):
+        self.assertIsNone(_label_matcher("instance", "regex", "db-("))
+
+    def test_candidate_events_skips_an_invalid_regex(self):
+        AlertEvent.objects.create(source="test", title="a", status="firing", severity="info")
+        rule = Rule(name="bad", conditions=[
+            {"path": "labels.instance", "op": "regex", "value": "db-("},
+            {"path": "source", "op": "eq", "value": "test"},
+        ])
+        self.assertEqual(candidate_events(rule).count(), 1)
+
+
+class CandidateEventsTests(TestCase):
+    """candidate_events must return every event _match accepts."""
+
+    def setUp(self):
+        labelsets.reset()
+        self.addCleanup(labelsets.reset)
+        for name, labels in {
+            "sre": {"team": "sre"},
+            "dba": {"team": "dba"},
+            "empty": {"team": ""},
+            "missing": {},
+        }.items():
+            AlertEvent.objects.create(source="test", title=name, labels=labels)
+
+    def candidates(self, op, value):
+        rule = Rule(name="r", conditions=[{"path": "labels.team", "op": op, "value": value}])
+        selected = set(candidate_events(rule).values_list("title", flat=True))
+        matched = {e.title for e in AlertEvent.objects.all() if _match(rule, e)}
+        self.assertLessEqual(matched, selected)
+        return selected
+
+    def test_pushdown_is_a_superset_of_match(self):
+        self.assertEqual(self.candidates("eq", "sre"), {"sre"})
+        self.assertEqual(self.candidates("neq", "sre"), {"dba", "empty", "missing"})
+        self.assertEqual(self.candidates("in", ["sre", "dba"]), {"sre", "dba"})
+        self.assertEqual(self.candidates("contains", "b"), {"dba"})
+        self.assertEqual(self.candidates("regex", "^s"), {"sre"})
+
+    def test_neq_none_keeps_empty_values(self):
+        self.assertEqual(self.candidates("neq", None), {"sre", "dba", "empty", "missing"})
+        self.assertEqual(self.candidates("neq", ""), {"sre", "dba", "empty", "missing"})
@@ -0,0 +1,73 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from alerts.models import AlertGroup, AlertStatus
+from core.matchers import parse_matchers
+from rules import inhibitions
+from rules.inhibitions import InhibitionIndex, _Rule
+from rules.models import InhibitRule
+
+HOST_DOWN = {"alertname": "HostDown", "dc": "eu", "instance": "h1"}
+
+
+def rule(rule_id=1, equal=("dc", "instance")):
+    return _Rule(rule_id, parse_matchers(["alertname=HostDown"]), parse_matchers(["alertname=HighCPU"]), equal)
+
+
+class InhibitionIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = InhibitionIndex()
+        self.index.load([rule()], [(10, HOST_DOWN)])
+
+    def test_all_equal_labels_must_agree(self):
+        self.assertEqual(self.index.inhibited_by({"alertname": "HighCPU", "dc": "eu", "instance": "h1"}), 1)
+        self.assertIsNone(self.index.inhibited_by({"alertname": "HighCPU", "dc": "us", "instance": "h1"}))
+        self.assertIsNone(self.index.inhibited_by({"alertname": "HighCPU", "instance": "h1"}))
+        self.assertIsNone(self.index.inhibited_by({"alertname": "DiskFull", "dc": "eu", "instance": "h1"}))
+
+    def test_label_missing_on_both_sides_is_equal(self):
+        self.index.load([rule()], [(10, {"alertname": "HostDown", "instance": "h1"})])
+        self.assertEqual(self.index.inhibited_by({"alertname": "HighCPU", "instance": "h1"}), 1)
+
+    def test_group_never_inhibits_itself(self):
+        self.index.load([_Rule(1, parse_matchers(["dc=eu"]), parse_matchers(["dc=eu"]), ["dc"])], [(10, HOST_DOWN)])
+        self.assertIsNone(self.index.inhibited_by(HOST_DOWN, group_id=10))
+        self.assertEqual(self.index.inhibited_by(HOST_DOWN, group_id=11), 1)
+        self.index.update(11, HOST_DOWN, active=True)
+        self.assertEqual(self.index.inhibited_by(HOST_DOWN, group_id=10), 1)
+
+    def test_resolve_unfiles_the_source(self):
+        cpu = {"alertname": "HighCPU", "dc": "eu", "instance": "h1"}
+        self.index.update(10, HOST_DOWN, active=False)
+        self.assertIsNone(self.index.inhibited_by(cpu))
+        self.index.update(10, HOST_DOWN, active=True)
+        self.index.update(10, {**HOST_DOWN, "instance": "h2"}, active=True)  # re-filed under its latest labels
+        self.assertIsNone(self.index.inhibited_by(cpu))
+        self.assertEqual(self.index.inhibited_by({**cpu, "instance": "h2"}), 1)
+
+    def test_drop_skips_groups_filed_again_since_the_snapshot(self):
+        filed = self.index.snapshot()
+        self.index.update(10, HOST_DOWN, active=True)
+        self.index.drop(filed)
+        self.assertEqual(self.index.inhibited_by({"alertname": "HighCPU", "dc": "eu", "instance": "h1"}), 1)
+        self.index.drop(self.index.snapshot())
+        self.assertIsNone(self.index.inhibited_by({"alertname": "HighCPU", "dc": "eu", "instance": "h1"}))
+
+
+class ResolvedElsewhereTests(TestCase):
+    def test_periodic_check_unfiles_sources_resolved_in_the_database(self):
+        inhibitions.invalidate()
+        self.addCleanup(inhibitions.invalidate)
+        InhibitRule.objects.create(name="host down", source_matchers=["alertname=HostDown"],
+                                   target_matchers=["alertname=HighCPU"], equal=["instance"])
+        group = AlertGroup.objects.create(fingerprint="down", status=AlertStatus.FIRING)
+        inhibitions._refresh()
+        inhibitions.index.update(group.id, HOST_DOWN, active=True)
+        cpu = {"alertname": "HighCPU", "instance": "h1"}
+        self.assertEqual(inhibitions.index.inhibited_by(cpu), inhibitions.index._rules[0].id)
+
+        AlertGroup.objects.filter(pk=group.pk).update(status=AlertStatus.RESOLVED)
+        inhibitions._refresh()  # within INHIBIT_RELOAD_SECONDS: nothing checked
+        self.assertIsNotNone(inhibitions.index.inhibited_by(cpu))
+        with override_settings(INHIBIT_RELOAD_SECONDS=0), self.assertNumQueries(2):
+            inhibitions._refresh()
+        self.assertIsNone(inhibitions.index.inhibited_by(cpu))
@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase
+
+from core.matchers import parse_matchers
+from rules.silences import SilenceIndex
+
+
+def silence(sid, starts, ends, *matchers):
+    return sid, parse_matchers(matchers), starts, ends
+
+
+class SilenceIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = SilenceIndex()
+        self.index.load([
+            silence(1, 10, 20, "team=sre", "instance=db-1"),
+            silence(2, 15, 30, "team=sre"),
+            silence(3, 0, 100, 'instance=~"web-.*"'),
+        ])
+
+    def test_silences_cover_only_their_time_range(self):
+        labels = {"team": "sre", "instance": "db-1"}
+        self.assertIsNone(self.index.match(labels, now=5))
+        self.assertEqual(self.index.match(labels, now=10), 1)
+        self.assertEqual(self.index.match(labels, now=20), 2)
+        self.assertIsNone(self.index.match(labels, now=30))
+
+    def test_all_matchers_must_hold(self):
+        self.assertIsNone(self.index.match({"team": "dba", "instance": "db-1"}, now=12))
+        self.assertEqual(self.index.match({"team": "dba", "instance": "web-3"}, now=12), 3)
+
+    def test_active_ids_follow_the_sweep(self):
+        self.assertEqual(self.index.active_ids(now=12), {1, 3})
+        self.assertEqual(self.index.active_ids(now=25), {2, 3})
+        self.assertEqual(self.index.active_ids(now=200), set())
+
+    def test_clock_going_back_sweeps_again(self):
+        self.assertEqual(self.index.active_ids(now=25), {2, 3})
+        self.assertEqual(self.index.active_ids(now=12), {1, 3})
+
+    def test_load_replaces_the_contents(self):
+        self.index.active_ids(now=12)
+        self.index.load([silence(4, 0, 50, "team=dba")])
+        self.assertEqual(self.index.active_ids(now=12), {4})
+        self.assertEqual(len(self.index), 1)
@@ -0,0 +1,36 @@
+from django.utils import timezone
+from rest_framework import generics
+
+from .models import InhibitRule, Silence
+from .serializers import InhibitRuleSerializer, SilenceSerializer
+
+
+class SilenceListCreateView(generics.ListCreateAPIView):
+    """Silences, newest first; ``?active=1`` keeps those in effect now, ``?active=0`` the rest."""
+    serializer_class = SilenceSerializer
+
+    def get_queryset(self):
+        queryset = Silence.objects.all()
+        active = self.request.query_params.get('active')
+        now = timezone.now()
+        if active in ('1', 'true'):
+            queryset = queryset.filter(starts_at__lte=now, ends_at__gt=now)
+        elif active in ('0', 'false'):
+            queryset = queryset.exclude(starts_at__lte=now, ends_at__gt=now)
+        return queryset
+
+
+class SilenceDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """One silence; expire it early by setting ``ends_at``, or delete it."""
+    queryset = Silence.objects.all()
+    serializer_class = SilenceSerializer
+
+
+class InhibitRuleListCreateView(generics.ListCreateAPIView):
+    queryset = InhibitRule.objects.all()
+    serializer_class = InhibitRuleSerializer
+
+
+class InhibitRuleDetailView(generics.RetrieveUpdateDestroyAPIView):
+    queryset = InhibitRule.objects.all()
+    serializer_class = InhibitRuleSerializer
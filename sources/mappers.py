@@ -70,7 +70,8 @@ def map_zabbix(payload: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
         "title": title or "Zabbix Alert",
         "description": description,
         "labels": labels,
-        "annotations": {"raw": payload},
+        "annotations": {},
+        "raw": payload,
         "starts_at": payload.get("event_time") or payload.get("datetime"),
         "resource": host,
         "service": _str(payload, "trigger_name") or _str(payload, "item_name"),
@@ -103,7 +104,8 @@ def map_grafana(payload: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
         "title": rule_name or "Grafana Alert",
         "description": message,
         "labels": labels,
-        "annotations": {"raw": payload},
+        "annotations": {},
+        "raw": payload,
         "resource": labels.get("instance", ""),
         "service": labels.get("job", ""),
         "namespace": labels.get("namespace", ""),
@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import EscalationPolicy, EscalationTimer
+
+
+@admin.register(EscalationPolicy)
+class EscalationPolicyAdmin(admin.ModelAdmin):
+    list_display = ("name", "enabled", "order", "matchers", "steps")
+    list_editable = ("enabled", "order")
+
+
+@admin.register(EscalationTimer)
+class EscalationTimerAdmin(admin.ModelAdmin):
+    list_display = ("group", "policy", "step", "due_at")
+    raw_id_fields = ("group",)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class WorkflowsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'workflows'
+
+    def ready(self) -> None:
+        # Reload escalation policies when their rows change
+        import workflows.escalation  # noqa: F401
@@ -0,0 +1,221 @@
+"""
+Escalation of groups that keep firing unacknowledged.
+
+When a group starts firing, alerts.services calls ``start``: the first
+enabled EscalationPolicy matching the event gets a timer for its first step,
+stored as the group's single EscalationTimer row (policy, step, due time).
+Acknowledging or resolving the group calls ``stop``, which deletes that row
+by primary key.
+
+The timers themselves run in the ``run_escalations`` command. ``Scheduler``
+loads the rows once into a hierarchical timing wheel (see
+algorithms.timing_wheel), then only picks up rows written since its last
+poll, so neither a restart nor steady state scans the open groups. Each poll
+reaches back ESCALATION_POLL_OVERLAP_SECONDS before the newest ``updated_at``
+it has seen, so rows committed late or stamped by a host whose clock lags
+are still read; rows already in the wheel unchanged are skipped. A due
+timer is checked against its row before it fires: a row deleted or moved
+meanwhile is skipped without the wheel having to be told. After a step runs
+the row moves on to the next step, or is deleted after the last one.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.template import Context, Template
+from django.utils import timezone
+
+from actions.handlers import run_action
+from algorithms.timing_wheel import TimingWheel
+from alerts.models import AlertEvent, AlertGroup, AlertStatus
+from core.matchers import Matcher, parse_matchers
+from rules.silences import event_labels
+from .models import EscalationPolicy, EscalationTimer, Ticket
+
+logger = logging.getLogger(__name__)
+
+_FIRE_CHUNK = 500
+
+
+class _Policy(NamedTuple):
+    id: int
+    matchers: Sequence[Matcher]
+    delays: Sequence[float]
+
+
+def step_delays(steps: Any) -> List[float]:
+    """Seconds from the start of firing to each step; ValueError unless steps are well formed and in order."""
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("Expected a non-empty list of steps.")
+    delays = []
+    for step in steps:
+        if not isinstance(step, dict) or not isinstance(step.get("actions", []), list):
+            raise ValueError("Each step is an object with after_minutes and a list of actions.")
+        minutes = step.get("after_minutes")
+        if isinstance(minutes, bool) or not isinstance(minutes, (int, float)) or minutes < 0:
+            raise ValueError("after_minutes must be a non-negative number.")
+        if delays and minutes * 60 < delays[-1]:
+            raise ValueError("Steps must be ordered by after_minutes.")
+        delays.append(minutes * 60.0)
+    return delays
+
+
+_policies: List[_Policy] = []
+_stamp: Dict[str, Any] = {"value": None, "checked": float("-inf")}
+
+
+def _refresh() -> None:
+    checked = time.monotonic()
+    if _stamp["value"] is not None and checked - _stamp["checked"] < settings.ESCALATION_RELOAD_SECONDS:
+        return
+    _stamp["checked"] = checked
+    stamp = EscalationPolicy.objects.aggregate(n=Count("id"), changed=Max("updated_at"))
+    if stamp == _stamp["value"]:
+        return
+    loaded = []
+    for policy in EscalationPolicy.objects.filter(enabled=True):
+        try:
+            loaded.append(_Policy(policy.id, parse_matchers(policy.matchers or []), step_delays(policy.steps)))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Skipping malformed escalation policy %s", policy.id)
+    _policies[:] = loaded
+    _stamp["value"] = stamp
+
+
+def invalidate() -> None:
+    _stamp["value"] = None
+
+
+def policy_for(event: AlertEvent) -> Optional[_Policy]:
+    _refresh()
+    if not _policies:
+        return None
+    labels = event_labels(event)
+    for policy in _policies:
+        if all(m.matches(labels) for m in policy.matchers):
+            return policy
+    return None
+
+
+def start(event: AlertEvent, group: AlertGroup) -> None:
+    """Arm the first step of the matching policy for a group that just started firing."""
+    policy = policy_for(event)
+    if policy is None:
+        return
+    EscalationTimer.objects.update_or_create(
+        group_id=group.id,
+        defaults={"policy_id": policy.id, "step": 0, "due_at": timezone.now() + timedelta(seconds=policy.delays[0])},
+    )
+
+
+def stop(group_id: int) -> None:
+    """Cancel a group's pending escalation (acknowledged or resolved)."""
+    EscalationTimer.objects.filter(group_id=group_id).delete()
+
+
+class Scheduler:
+    def __init__(self, tick_seconds: Optional[float] = None):
+        self.wheel = TimingWheel(tick_seconds or settings.ESCALATION_TICK_SECONDS, start=time.time())
+        self._seen: Optional[datetime] = None
+
+    def _schedule(self, rows) -> int:
+        n = 0
+        for group_id, step, due_at, updated_at in rows:
+            if self._seen is None or updated_at > self._seen:
+                self._seen = updated_at
+            pending = self.wheel.pending(group_id)
+            if pending is not None and pending[1] == (step, due_at):
+                continue
+            self.wheel.schedule(group_id, due_at.timestamp(), (step, due_at))
+            n += 1
+        return n
+
+    def load(self) -> int:
+        """Schedule every persisted timer; returns how many."""
+        rows = EscalationTimer.objects.values_list("group_id", "step", "due_at", "updated_at")
+        return self._schedule(rows.iterator(chunk_size=10000))
+
+    def poll(self) -> int:
+        """Schedule timers written since the last load or poll, less the overlap; returns how many were new."""
+        rows = EscalationTimer.objects.values_list("group_id", "step", "due_at", "updated_at")
+        if self._seen is not None:
+            rows = rows.filter(updated_at__gte=self._seen - timedelta(seconds=settings.ESCALATION_POLL_OVERLAP_SECONDS))
+        return self._schedule(rows.iterator())
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Run the steps that came due by ``now``; returns how many ran."""
+        fired = self.wheel.advance(time.time() if now is None else now)
+        ran = 0
+        for start in range(0, len(fired), _FIRE_CHUNK):
+            chunk = dict(fired[start:start + _FIRE_CHUNK])
+            timers = EscalationTimer.objects.filter(group_id__in=chunk).select_related("policy", "group")
+            for timer in timers:
+                if (timer.step, timer.due_at) != chunk[timer.group_id]:
+                    continue  # moved since it was scheduled; the new row arrives through poll
+                if timer.group.status != AlertStatus.FIRING:
+                    EscalationTimer.objects.filter(pk=timer.pk, step=timer.step).delete()
+                    continue
+                if self._escalate(timer):
+                    ran += 1
+        return ran
+
+    def _escalate(self, timer: EscalationTimer) -> bool:
+        policy, group = timer.policy, timer.group
+        current = EscalationTimer.objects.filter(pk=timer.pk, step=timer.step)
+        try:
+            delays = step_delays(policy.steps)
+        except ValueError:
+            delays = []
+        if not policy.enabled or timer.step >= len(delays):
+            current.delete()
+            return False
+        started = timer.due_at - timedelta(seconds=delays[timer.step])
+        following = timer.step + 1
+        if following < len(delays):
+            due_at = started + timedelta(seconds=delays[following])
+            claimed = current.update(step=following, due_at=due_at, updated_at=timezone.now())
+            if claimed:
+                self.wheel.schedule(group.id, due_at.timestamp(), (following, due_at))
+        else:
+            claimed, _ = current.delete()
+        if not claimed:
+            return False  # acknowledged or resolved in the meantime
+        self._notify(policy, timer.step, group, started)
+        return True
+
+    def _notify(self, policy: EscalationPolicy, step: int, group: AlertGroup, started: datetime) -> None:
+        event = AlertEvent.objects.filter(id=group.latest_event_id).first() if group.latest_event_id else None
+        if event is None:
+            event = AlertEvent(title=group.last_title, severity=group.max_severity, status=group.status)
+        assignees = Ticket.objects.filter(group=group).exclude(status=AlertStatus.RESOLVED).exclude(assignee="")
+        context = {
+            "title": event.title,
+            "description": event.description,
+            "severity": event.severity,
+            "status": group.status,
+            "labels": event.labels if event.id else {},
+            "resource": event.resource,
+            "service": event.service,
+            "namespace": event.namespace,
+            "generator_url": event.generator_url,
+            "group": group.fingerprint,
+            "count": group.count,
+            "policy": policy.name,
+            "step": step + 1,
+            "firing_minutes": int((timezone.now() - started).total_seconds() // 60),
+            "assignees": sorted(set(assignees.values_list("assignee", flat=True))),
+        }
+        logger.warning("Escalating group %s: policy %s step %d", group.fingerprint[:8], policy.name, step + 1)
+        for action in policy.steps[step].get("actions") or []:
+            rendered = {k: (Template(v).render(Context(context)) if isinstance(v, str) else v) for k, v in action.items()}
+            run_action(rendered, event)
+
+
+@receiver([post_save, post_delete], sender=EscalationPolicy)
+def _policy_changed(sender, **kwargs) -> None:
+    invalidate()
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from workflows.escalation import Scheduler
+
+
+class Command(BaseCommand):
+    help = "Run escalation steps for groups that keep firing unacknowledged"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run the steps due now and exit (for cron)")
+        parser.add_argument("--poll", type=float, default=settings.ESCALATION_POLL_SECONDS,
+                            help="Seconds between checks for newly armed timers")
+
+    def handle(self, *args, **options):
+        scheduler = Scheduler()
+        started = time.monotonic()
+        loaded = scheduler.load()
+        self.stdout.write(f"Loaded {loaded:,} escalation timers in {time.monotonic() - started:.2f}s")
+        if options["once"]:
+            self.stdout.write(f"Ran {scheduler.run_due():,} escalation steps")
+            return
+        polled = time.monotonic()
+        tick = scheduler.wheel.tick_seconds
+        while True:
+            if time.monotonic() - polled >= options["poll"]:
+                scheduler.poll()
+                polled = time.monotonic()
+            ran = scheduler.run_due()
+            if ran:
+                self.stdout.write(f"Ran {ran:,} escalation steps")
+            time.sleep(tick)
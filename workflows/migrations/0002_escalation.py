@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0018_group_flapping'),
+        ('workflows', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EscalationPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128)),
+                ('enabled', models.BooleanField(default=True)),
+                ('matchers', models.JSONField(blank=True, default=list)),
+                ('steps', models.JSONField(default=list)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'escalation_policy',
+                'ordering': ['order', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EscalationTimer',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='alerts.alertgroup')),
+                ('step', models.PositiveSmallIntegerField(default=0)),
+                ('due_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('policy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='workflows.escalationpolicy')),
+            ],
+            options={
+                'db_table': 'escalation_timer',
+            },
+        ),
+    ]
@@ -17,3 +17,40 @@ class Ticket(models.Model):
     def __str__(self) -> str:
         return f"Ticket<{self.id}> {self.title}"
 
+
+class EscalationPolicy(models.Model):
+    """
+    Escalation for groups that keep firing unacknowledged. ``steps`` run in
+    order, each ``after_minutes`` from when the group started firing, e.g.
+    [{"after_minutes": 10, "actions": [{"type": "email", "to": ["tier2@example.com"]}]}].
+    The first enabled policy (by order) whose matchers the firing event
+    satisfies applies; no matchers means every group.
+    """
+    name = models.CharField(max_length=128)
+    enabled = models.BooleanField(default=True)
+    matchers = models.JSONField(default=list, blank=True)
+    steps = models.JSONField(default=list)
+    order = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'escalation_policy'
+        ordering = ['order', 'id']
+
+    def __str__(self) -> str:
+        return f"EscalationPolicy<{self.name}>"
+
+
+class EscalationTimer(models.Model):
+    """The pending escalation step of a firing group; at most one row per group."""
+    group = models.OneToOneField(AlertGroup, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    policy = models.ForeignKey(EscalationPolicy, on_delete=models.CASCADE, related_name='+')
+    step = models.PositiveSmallIntegerField(default=0)
+    due_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        db_table = 'escalation_timer'
+
+    def __str__(self) -> str:
+        return f"EscalationTimer<{self.group_id}> step {self.step} at {self.due_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,45 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from alerts.models import AlertGroup, AlertStatus
+from workflows.escalation import Scheduler
+from workflows.models import EscalationPolicy, EscalationTimer
+
+STEPS = [{"after_minutes": 0, "actions": [{"type": "email"}]}, {"after_minutes": 10, "actions": [{"type": "email"}]}]
+
+
+class SchedulerTests(TestCase):
+    def setUp(self):
+        self.policy = EscalationPolicy.objects.create(name="oncall", steps=STEPS)
+        self.groups = [AlertGroup.objects.create(fingerprint=f"g{i}", status=AlertStatus.FIRING) for i in range(3)]
+
+    def arm(self, group, due_at=None):
+        return EscalationTimer.objects.create(group=group, policy=self.policy, due_at=due_at or timezone.now())
+
+    @override_settings(ESCALATION_POLL_OVERLAP_SECONDS=60)
+    def test_poll_reads_rows_committed_late_or_stamped_by_a_lagging_clock(self):
+        scheduler = Scheduler()
+        self.arm(self.groups[0])
+        self.assertEqual(scheduler.load(), 1)
+        late = self.arm(self.groups[1])
+        EscalationTimer.objects.filter(pk=late.pk).update(updated_at=scheduler._seen - timedelta(seconds=30))
+        self.assertEqual(scheduler.poll(), 1)
+        self.assertIsNotNone(scheduler.wheel.pending(self.groups[1].id))
+        self.assertEqual(scheduler.poll(), 0)  # unchanged rows are not scheduled again
+
+    def test_run_due_steps_and_skips_acknowledged_groups(self):
+        now = timezone.now()
+        for group in self.groups[:2]:
+            self.arm(group, now)
+        AlertGroup.objects.filter(pk=self.groups[1].id).update(status=AlertStatus.ACKED)
+        scheduler = Scheduler()
+        scheduler.load()
+        with mock.patch("workflows.escalation.run_action") as run_action:
+            self.assertEqual(scheduler.run_due(now.timestamp() + 1), 1)
+        run_action.assert_called_once()
+        timer = EscalationTimer.objects.get()
+        self.assertEqual((timer.group_id, timer.step), (self.groups[0].id, 1))
+        self.assertEqual(scheduler.wheel.pending(timer.group_id)[1], (1, timer.due_at))